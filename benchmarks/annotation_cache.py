@@ -0,0 +1,71 @@
+"""
+Compares endpoint scanning with and without the `format_type_annotation` memo.
+
+    python benchmarks/annotation_cache.py --sizes 1000,5000
+
+Client packages are built from synthetic specs (cached like `suite.py`).
+Each scan runs in-process with one job so the difference is the
+formatter's own; the import-based scan is measured once its modules are
+already imported, leaving signature inspection and formatting.
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+BENCH_DIR = Path(__file__).resolve().parent
+sys.path.insert(0, str(BENCH_DIR.parent))
+sys.path.insert(0, str(BENCH_DIR))
+
+import sdk_autogen  # noqa: E402
+from specs import synthesize_spec  # noqa: E402
+from suite import generate_client_package  # noqa: E402
+
+
+def best_of(repeat: int, func) -> float:
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - started)
+    return min(timings)
+
+
+def main() -> None:
+    p = argparse.ArgumentParser(description="Benchmark the annotation memo.")
+    p.add_argument("--sizes", default="1000,5000", help="operation counts to synthesise")
+    p.add_argument("--depth", type=int, default=4, help="nesting depth of synthetic models")
+    p.add_argument("--repeat", type=int, default=5, help="scans per case (best is kept)")
+    p.add_argument("--workdir", default=str(BENCH_DIR / ".work"), help="cache for generated packages")
+    args = p.parse_args()
+
+    memoized = sdk_autogen.format_type_annotation
+    for size in (int(size) for size in args.sizes.split(",")):
+        package, project = generate_client_package(
+            synthesize_spec(size, depth=args.depth), Path(args.workdir)
+        )
+        sys.path.insert(0, str(project))
+        sdk_autogen.scan_package(package)  # import every endpoint module up front
+        print(f"{size} operations ({package}):")
+        for static in (False, True):
+            def scan() -> None:
+                sdk_autogen.scan_package(package, static=static, jobs=1)
+
+            cached = best_of(args.repeat, scan)
+            stats = str(sdk_autogen.annotation_cache_stats)
+            # The uncached formatter recurses through the module global too.
+            sdk_autogen.format_type_annotation = sdk_autogen._format_type_annotation
+            try:
+                uncached = best_of(args.repeat, scan)
+            finally:
+                sdk_autogen.format_type_annotation = memoized
+            print(
+                f"  {'static' if static else 'import':<6} uncached {uncached:7.3f}s  "
+                f"memoized {cached:7.3f}s  ({uncached / cached:4.2f}x)  [{stats}]"
+            )
+        sys.path.remove(str(project))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""
+Compares many small async POSTs sent one by one and through `auto_batch`.
+
+    python benchmarks/auto_batch.py --requests 5000 --concurrency 200
+    python benchmarks/auto_batch.py --windows 0.001,0.005 --max-size 50
+
+`src/example_server.py` is started under uvicorn and an SDK is generated
+from its spec. `create_greeting_async` is then called `--requests` times,
+`--concurrency` at a time, without batching and with
+`AutoBatch(["create_greeting"], window, max_size)` for each window. Each
+case reports calls/s, p50/p99 latency per call, and the number of bulk
+requests the calls went out in.
+"""
+
+import argparse
+import asyncio
+import importlib
+import json
+import subprocess
+import sys
+from pathlib import Path
+from typing import Any, Dict
+
+BENCH_DIR = Path(__file__).resolve().parent
+REPO_ROOT = BENCH_DIR.parent
+sys.path.insert(0, str(REPO_ROOT))
+sys.path.insert(0, str(BENCH_DIR))
+
+from sdk_autogen import render_wrapper  # noqa: E402
+from specs import downgrade_to_30  # noqa: E402
+from suite import free_port, generate_client_package, measure_async, wait_for  # noqa: E402
+
+
+def main() -> None:
+    p = argparse.ArgumentParser(description="Benchmark auto-batching of small POSTs.")
+    p.add_argument("--requests", type=int, default=5000, help="calls per case")
+    p.add_argument("--concurrency", type=int, default=200, help="calls in flight at once")
+    p.add_argument("--windows", default="0.002", help="comma-separated batch windows in seconds")
+    p.add_argument("--max-size", type=int, default=100, help="largest batch")
+    p.add_argument("--workdir", default=str(BENCH_DIR / ".work"), help="cache for generated packages")
+    args = p.parse_args()
+
+    port = free_port()
+    server = subprocess.Popen(
+        [sys.executable, str(REPO_ROOT / "src" / "example_server.py"), "--port", str(port)],
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    try:
+        base_url = f"http://127.0.0.1:{port}"
+        spec = downgrade_to_30(json.loads(wait_for(f"{base_url}/openapi.json")))
+        package, project = generate_client_package(spec, Path(args.workdir))
+        sys.path.insert(0, str(project))
+        sdk_path = project / "bench_batch_sdk.py"
+        sdk_path.write_text(render_wrapper(package, "BenchClient", features=["auto_batch"]))
+        sdk = importlib.import_module("bench_batch_sdk")
+        body = sdk.GreetingRequest(greeting_type="hi", include_timestamp=False)
+
+        cases: Dict[str, Any] = {"unbatched": None}
+        for window in args.windows.split(","):
+            config = sdk.AutoBatch(["create_greeting"], window=float(window), max_size=args.max_size)
+            cases[f"window {float(window) * 1000:g} ms"] = config
+
+        print(f"{args.requests} create_greeting_async calls, concurrency {args.concurrency}")
+        for label, config in cases.items():
+            client = sdk.BenchClient(base_url, share_pool=False, auto_batch=config)
+
+            async def call() -> None:
+                await client.create_greeting_async(user_name="bench", json_body=body)
+
+            async def run() -> Dict[str, Any]:
+                await call()  # warm up the connection pool
+                result: Dict[str, Any] = await measure_async(call, args.requests, args.concurrency)
+                result["batches"] = client.batch_stats
+                await client.aclose()
+                return result
+
+            result = asyncio.run(run())
+            stats = result["batches"]
+            batches = f"  {stats['batches']} batches of up to {stats['largest']}" if stats else ""
+            print(
+                f"  {label:<16} {result['requests_per_second']:9.1f} calls/s  "
+                f"p50 {result['p50_ms']:7.2f} ms  p99 {result['p99_ms']:7.2f} ms{batches}"
+            )
+    finally:
+        server.terminate()
+        server.wait()
+
+
+if __name__ == "__main__":
+    main()
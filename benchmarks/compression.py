@@ -0,0 +1,108 @@
+"""
+Compares bytes on the wire and latency with each compression encoding.
+
+    python benchmarks/compression.py --requests 200 --items 1000
+    python benchmarks/compression.py --bandwidth-mbps 10,100
+
+`src/example_server.py` is started under uvicorn and an SDK is generated
+from its spec. Two calls are measured with no compression and with
+`Compression(encoding, accept=(encoding,))` for gzip, br and zstd (the
+last two only when their module is installed): downloading `--items`
+greetings with `list_greetings` and uploading as many with
+`import_greetings`. Each case reports the raw and wire bytes per call, the
+p50 latency over loopback, and that latency plus the wire bytes' transfer
+time at each `--bandwidth-mbps`, which is where compression pays off.
+"""
+
+import argparse
+import importlib
+import json
+import subprocess
+import sys
+from pathlib import Path
+from typing import Any, Callable, Dict, List
+
+BENCH_DIR = Path(__file__).resolve().parent
+REPO_ROOT = BENCH_DIR.parent
+sys.path.insert(0, str(REPO_ROOT))
+sys.path.insert(0, str(BENCH_DIR))
+
+from sdk_autogen import render_wrapper  # noqa: E402
+from specs import downgrade_to_30  # noqa: E402
+from suite import free_port, generate_client_package, measure_sync, wait_for  # noqa: E402
+
+
+def main() -> None:
+    p = argparse.ArgumentParser(description="Benchmark request/response compression.")
+    p.add_argument("--requests", type=int, default=200, help="calls per case")
+    p.add_argument("--items", type=int, default=1000, help="greetings per download and upload")
+    p.add_argument("--bandwidth-mbps", default="10,100", help="comma-separated link speeds to estimate")
+    p.add_argument("--workdir", default=str(BENCH_DIR / ".work"), help="cache for generated packages")
+    args = p.parse_args()
+    bandwidths = [float(mbps) for mbps in args.bandwidth_mbps.split(",")]
+
+    port = free_port()
+    server = subprocess.Popen(
+        [sys.executable, str(REPO_ROOT / "src" / "example_server.py"), "--port", str(port)],
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    try:
+        base_url = f"http://127.0.0.1:{port}"
+        spec = downgrade_to_30(json.loads(wait_for(f"{base_url}/openapi.json")))
+        package, project = generate_client_package(spec, Path(args.workdir))
+        sys.path.insert(0, str(project))
+        sdk_path = project / "bench_compression_sdk.py"
+        sdk_path.write_text(
+            render_wrapper(package, "BenchClient", features=["compression", "raw_methods"])
+        )
+        sdk = importlib.import_module("bench_compression_sdk")
+        greetings = [
+            sdk.GreetingResponse(message=f"Hello #{i}!", user_name=f"user{i}", timestamp="", personalized=False)
+            for i in range(args.items)
+        ]
+
+        cases: Dict[str, Any] = {"identity": sdk.Compression(request_encoding=None, accept=())}
+        for encoding in sdk.COMPRESSION_ENCODINGS[::-1]:
+            if sdk._codec(encoding) is not None:
+                cases[encoding] = sdk.Compression(encoding, min_size=0, accept=(encoding,))
+
+        with sdk.BenchClient(base_url, share_pool=False, compression=cases["identity"]) as client:
+            download = client.list_greetings_raw(limit=args.items, count=args.items).content
+        upload = json.dumps([greeting.to_dict() for greeting in greetings]).encode()
+        raw_bytes = {"download": len(download), "upload": len(upload)}
+        wire_field = {"download": "response_wire_bytes", "upload": "request_wire_bytes"}
+
+        workloads: Dict[str, Callable[[Any], None]] = {
+            "download": lambda client: client.list_greetings(limit=args.items, count=args.items),
+            "upload": lambda client: client.import_greetings(json_body=greetings),
+        }
+        speeds = "  ".join(f"@{mbps:g} Mbit/s" for mbps in bandwidths)
+        print(f"{args.requests} calls per case, {args.items} greetings per call; estimated {speeds}")
+        for workload, call in workloads.items():
+            print(workload)
+            for label, config in cases.items():
+                client = sdk.BenchClient(base_url, share_pool=False, compression=config)
+                call(client)  # warm up the connection pool and the codec import
+                before = client.compression_stats
+                result = measure_sync(lambda: call(client), args.requests)
+                after = client.compression_stats
+                client.close()
+                size = raw_bytes[workload]
+                field = wire_field[workload]
+                # Identity bodies are not counted by the compression layer.
+                wire_bytes = (after[field] - before[field]) / args.requests or size
+                estimates: List[str] = [
+                    f"{result['p50_ms'] + wire_bytes * 8 / (mbps * 1000):9.2f} ms" for mbps in bandwidths
+                ]
+                print(
+                    f"  {label:<9} {size:9d} B raw {wire_bytes:9.0f} B wire ({wire_bytes / size:6.1%})  "
+                    f"p50 {result['p50_ms']:7.2f} ms  " + "  ".join(estimates)
+                )
+    finally:
+        server.terminate()
+        server.wait()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""
+Compares parsed and `*_fast` calls on a large list response.
+
+    python benchmarks/fast_json.py --items 1000 --depth 3
+
+A synthetic package whose first operation returns an array of nested
+models is generated and wrapped with `fast_json=True`; its httpx clients
+are pointed at a `MockTransport` serving one pre-encoded payload. Each
+case decodes the response and reads one field of every item, so lazy
+views pay for what a typical consumer touches.
+"""
+
+import argparse
+import importlib.util
+import json
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import httpx
+
+BENCH_DIR = Path(__file__).resolve().parent
+sys.path.insert(0, str(BENCH_DIR.parent))
+sys.path.insert(0, str(BENCH_DIR))
+
+from sdk_autogen import render_wrapper  # noqa: E402
+from specs import sample_payload, synthesize_spec  # noqa: E402
+from suite import generate_client_package  # noqa: E402
+
+
+def main() -> None:
+    p = argparse.ArgumentParser(description="Benchmark parsed vs. fast JSON responses.")
+    p.add_argument("--items", type=int, default=1000, help="items in the list response")
+    p.add_argument("--width", type=int, default=2, help="items per nested array")
+    p.add_argument("--depth", type=int, default=3, help="model nesting depth")
+    p.add_argument("--seconds", type=float, default=2.0, help="time per case")
+    p.add_argument("--workdir", default=str(BENCH_DIR / ".work"), help="cache for generated packages")
+    args = p.parse_args()
+
+    spec = synthesize_spec(2, depth=args.depth)
+    item = {"$ref": "#/components/schemas/Chain0Level0"}
+    operation = spec["paths"]["/group0/op0/{item_id}"]["get"]
+    operation["responses"]["200"]["content"]["application/json"]["schema"] = {
+        "type": "array",
+        "items": item,
+    }
+    package, project = generate_client_package(spec, Path(args.workdir))
+    sys.path.insert(0, str(project))
+    body = json.dumps(
+        [sample_payload(spec, item, args.width) for _ in range(args.items)]
+    ).encode()
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(200, content=body, headers={"content-type": "application/json"})
+
+    with tempfile.TemporaryDirectory() as tmp:
+        sdk_path = Path(tmp) / "bench_fast_sdk.py"
+        sdk_path.write_text(
+            render_wrapper(package, "BenchClient", spec=spec, fast_json=True, features=["raw_methods"])
+        )
+        module_spec = importlib.util.spec_from_file_location("bench_fast_sdk", sdk_path)
+        sdk = importlib.util.module_from_spec(module_spec)
+        module_spec.loader.exec_module(sdk)
+
+        client = sdk.BenchClient("http://bench", share_pool=False)
+        client._raw.set_httpx_client(
+            httpx.Client(base_url="http://bench", transport=httpx.MockTransport(handler))
+        )
+        namespace = client.group0
+
+        print(
+            f"payload: {len(body) / 1024:.0f} KiB, {args.items} items  "
+            f"(width {args.width}, depth {args.depth}, backend {sdk.JSON_BACKEND})"
+        )
+        cases = [
+            ("parsed", lambda: [m.field_0 for m in namespace.get_op0(item_id="x")]),
+            ("raw+json", lambda: [m["field_0"] for m in namespace.get_op0_raw(item_id="x").json()]),
+            ("fast", lambda: [m.field_0 for m in namespace.get_op0_fast(item_id="x")]),
+        ]
+        rates = {}
+        for label, call in cases:
+            calls, started = 0, time.perf_counter()
+            while time.perf_counter() - started < args.seconds:
+                call()
+                calls += 1
+            rates[label] = calls / (time.perf_counter() - started)
+            print(
+                f"  {label:<9} {rates[label]:9.1f} calls/s  "
+                f"({rates[label] / rates['parsed']:5.2f}x parsed)"
+            )
+
+
+if __name__ == "__main__":
+    main()
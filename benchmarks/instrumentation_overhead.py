@@ -0,0 +1,97 @@
+"""
+Measures what the instrumentation layer costs per SDK call.
+
+Renders a plain and an instrumented wrapper for an installed
+openapi-python-client package, swaps every endpoint module for a no-op so
+only wrapper overhead is timed, and compares one parameter-less operation:
+
+    python benchmarks/instrumentation_overhead.py --package my_api_client
+"""
+
+import argparse
+import importlib.util
+import inspect
+import sys
+import tempfile
+import timeit
+from pathlib import Path
+from types import ModuleType, SimpleNamespace
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from sdk_autogen import render_wrapper, scan_package  # noqa: E402
+
+NOOP_ENDPOINT = SimpleNamespace(sync=lambda **kwargs: None)
+
+
+def load_wrapper(source: str, name: str, workdir: Path) -> ModuleType:
+    path = workdir / f"{name}.py"
+    path.write_text(source)
+    spec = importlib.util.spec_from_file_location(name, path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    for alias in [n for n in vars(module) if n.startswith("_ep_")]:
+        setattr(module, alias, NOOP_ENDPOINT)
+    return module
+
+
+def pick_operation(client: object) -> str:
+    for name in sorted(dir(type(client))):
+        method = getattr(client, name)
+        if name.startswith("_") or name.endswith("_async") or not callable(method):
+            continue
+        params = inspect.signature(method).parameters.values()
+        if "return _ep_" in inspect.getsource(method) and all(
+            p.default is not inspect.Parameter.empty for p in params
+        ):
+            return name
+    raise SystemExit("no parameter-less operation on the client to benchmark")
+
+
+def per_call_ns(func, number: int, repeat: int) -> float:
+    return min(timeit.repeat(func, number=number, repeat=repeat)) / number * 1e9
+
+
+def main() -> None:
+    p = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    p.add_argument("--package", required=True, help="generated client package")
+    p.add_argument("--number", type=int, default=200_000, help="calls per round")
+    p.add_argument("--repeat", type=int, default=5, help="rounds (best is kept)")
+    args = p.parse_args()
+
+    scan = scan_package(args.package)
+    with tempfile.TemporaryDirectory() as tmp:
+        workdir = Path(tmp)
+        plain = load_wrapper(
+            render_wrapper(args.package, "BenchClient", scan=scan), "bench_plain", workdir
+        )
+        instrumented = load_wrapper(
+            render_wrapper(args.package, "BenchClient", scan=scan, instrument=True),
+            "bench_instrumented",
+            workdir,
+        )
+        plain_client = plain.BenchClient("http://localhost")
+        operation = pick_operation(plain_client)
+        quiet = instrumented.BenchClient("http://localhost", share_pool=False)
+        metrics = instrumented.BenchClient("http://localhost", share_pool=False, metrics=True)
+        hooked = instrumented.BenchClient("http://localhost", share_pool=False)
+        hooked.add_hook(pre=lambda info: None, post=lambda info: None)
+
+        cases = [
+            ("plain", plain_client),
+            ("instrumented, no hooks", quiet),
+            ("instrumented, metrics=True", metrics),
+            ("instrumented, pre+post hooks", hooked),
+        ]
+        print(f"operation: {operation}  ({args.number} calls x {args.repeat} rounds)")
+        baseline = None
+        for label, client in cases:
+            cost = per_call_ns(getattr(client, operation), args.number, args.repeat)
+            baseline = cost if baseline is None else baseline
+            print(f"  {label:<30} {cost:8.1f} ns/call  ({cost - baseline:+7.1f} ns)")
+        for _, client in cases:
+            client.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,136 @@
+"""
+Measures the generated client against the spec-driven mock server.
+
+    python benchmarks/mock_server.py --requests 2000 --concurrency 20
+    python benchmarks/mock_server.py --error-rate 0.1 --latency-ms 5 --jitter-ms 5
+
+A synthetic spec (see `specs.py`) is generated and wrapped, and
+`sdk_autogen.py mock` serves it on a local port, so every number comes from
+real HTTP over loopback with no other service. The same call is made
+sequentially, concurrently, and concurrently with a `RetryPolicy`. Each case
+reports requests/s, p50/p99 latency, the share of calls that returned 200
+and how many requests the mock saw (so retries show up as extra requests).
+"""
+
+import argparse
+import asyncio
+import importlib.util
+import json
+import subprocess
+import sys
+import tempfile
+import urllib.request
+from pathlib import Path
+from typing import Any, Dict
+
+BENCH_DIR = Path(__file__).resolve().parent
+REPO_ROOT = BENCH_DIR.parent
+sys.path.insert(0, str(REPO_ROOT))
+sys.path.insert(0, str(BENCH_DIR))
+
+from sdk_autogen import MOCK_STATS_PATH, render_wrapper  # noqa: E402
+from specs import synthesize_spec  # noqa: E402
+from suite import free_port, generate_client_package, measure_async, measure_sync, wait_for  # noqa: E402
+
+
+def mock_requests(base_url: str) -> int:
+    with urllib.request.urlopen(base_url + MOCK_STATS_PATH) as response:
+        return sum(counts["requests"] for counts in json.load(response).values())
+
+
+def main() -> None:
+    p = argparse.ArgumentParser(description="Benchmark the generated client against the mock server.")
+    p.add_argument("--requests", type=int, default=2000, help="calls per case")
+    p.add_argument("--concurrency", type=int, default=20, help="concurrent calls in the async cases")
+    p.add_argument("--depth", type=int, default=4, help="model nesting depth of the response")
+    p.add_argument("--array-items", type=int, default=3, help="items per array in responses")
+    p.add_argument("--latency-ms", type=float, default=0.0, help="mock delay before every response")
+    p.add_argument("--jitter-ms", type=float, default=0.0, help="extra mock delay, up to this much")
+    p.add_argument("--error-rate", type=float, default=0.05, help="share of injected 503 responses")
+    p.add_argument("--seed", type=int, default=0, help="mock seed for delays and injected errors")
+    p.add_argument("--workdir", default=str(BENCH_DIR / ".work"), help="cache for generated packages")
+    args = p.parse_args()
+
+    spec = synthesize_spec(2, depth=args.depth)
+    package, project = generate_client_package(spec, Path(args.workdir))
+    sys.path.insert(0, str(project))
+
+    with tempfile.TemporaryDirectory() as tmp:
+        spec_path = Path(tmp) / "openapi.json"
+        spec_path.write_text(json.dumps(spec))
+        sdk_path = Path(tmp) / "bench_mock_sdk.py"
+        sdk_path.write_text(render_wrapper(package, "BenchClient", features=["resilience"]))
+        module_spec = importlib.util.spec_from_file_location("bench_mock_sdk", sdk_path)
+        sdk = importlib.util.module_from_spec(module_spec)
+        module_spec.loader.exec_module(sdk)
+
+        port = free_port()
+        base_url = f"http://127.0.0.1:{port}"
+        server = subprocess.Popen(
+            [
+                sys.executable, str(REPO_ROOT / "sdk_autogen.py"), "mock", str(spec_path),
+                "--port", str(port),
+                "--latency-ms", str(args.latency_ms),
+                "--jitter-ms", str(args.jitter_ms),
+                "--error-rate", str(args.error_rate),
+                "--error-status", "503",
+                "--retry-after", "0",
+                "--array-items", str(args.array_items),
+                "--seed", str(args.seed),
+            ],
+            stdout=subprocess.DEVNULL,
+        )
+        try:
+            wait_for(base_url + MOCK_STATS_PATH)
+            plain = sdk.BenchClient(base_url, share_pool=False)
+            retrying = sdk.BenchClient(
+                base_url,
+                share_pool=False,
+                retry=sdk.RetryPolicy(max_attempts=5, backoff_base=0.001, statuses=(503,)),
+            )
+            results: Dict[str, Any] = {}
+
+            def case(label: str, client: Any, concurrent: bool) -> None:
+                statuses = []
+                before = mock_requests(base_url)
+                if concurrent:
+
+                    async def call() -> None:
+                        response = await client.group0.get_op0_detailed_async(item_id="x")
+                        statuses.append(response.status_code)
+
+                    async def run() -> Dict[str, float]:
+                        result = await measure_async(call, args.requests, args.concurrency)
+                        await client.aclose()
+                        return result
+
+                    result = asyncio.run(run())
+                else:
+
+                    def call() -> None:
+                        statuses.append(client.group0.get_op0_detailed(item_id="x").status_code)
+
+                    result = measure_sync(call, args.requests)
+                result["ok"] = sum(status == 200 for status in statuses) / len(statuses)
+                result["mock_requests"] = mock_requests(base_url) - before
+                results[label] = result
+                print(
+                    f"  {label:<12} {result['requests_per_second']:9.1f} req/s  "
+                    f"p50 {result['p50_ms']:7.2f} ms  p99 {result['p99_ms']:7.2f} ms  "
+                    f"ok {result['ok']:6.1%}  mock saw {result['mock_requests']} requests"
+                )
+
+            print(
+                f"{args.requests} calls per case, depth {args.depth}, {args.array_items} items per array, "
+                f"{args.error_rate:.0%} errors, {args.latency_ms:g}+{args.jitter_ms:g} ms latency"
+            )
+            case("sync", plain, concurrent=False)
+            case("async", plain, concurrent=True)
+            case("async+retry", retrying, concurrent=True)
+        finally:
+            server.terminate()
+            server.wait()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""
+Compares parsed, `*_detailed` and `*_raw` calls on a large nested response.
+
+    python benchmarks/raw_throughput.py --width 10 --depth 4
+
+A small synthetic package (see `specs.py`) is generated and wrapped, and
+its httpx clients are pointed at a `MockTransport` serving one
+pre-encoded payload, so the numbers are client CPU only: model parsing for
+the first two, none for raw.
+"""
+
+import argparse
+import asyncio
+import importlib.util
+import json
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import httpx
+
+BENCH_DIR = Path(__file__).resolve().parent
+sys.path.insert(0, str(BENCH_DIR.parent))
+sys.path.insert(0, str(BENCH_DIR))
+
+from sdk_autogen import render_wrapper  # noqa: E402
+from specs import sample_payload, synthesize_spec  # noqa: E402
+from suite import generate_client_package  # noqa: E402
+
+
+def main() -> None:
+    p = argparse.ArgumentParser(description="Benchmark parsed vs. raw responses.")
+    p.add_argument("--width", type=int, default=10, help="items per array in the payload")
+    p.add_argument("--depth", type=int, default=4, help="model nesting depth")
+    p.add_argument("--seconds", type=float, default=2.0, help="time per case")
+    p.add_argument("--workdir", default=str(BENCH_DIR / ".work"), help="cache for generated packages")
+    args = p.parse_args()
+
+    spec = synthesize_spec(2, depth=args.depth)
+    package, project = generate_client_package(spec, Path(args.workdir))
+    sys.path.insert(0, str(project))
+    body = json.dumps(
+        sample_payload(spec, {"$ref": "#/components/schemas/Chain0Level0"}, args.width)
+    ).encode()
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(200, content=body, headers={"content-type": "application/json"})
+
+    async def async_handler(request: httpx.Request) -> httpx.Response:
+        return handler(request)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        sdk_path = Path(tmp) / "bench_raw_sdk.py"
+        sdk_path.write_text(render_wrapper(package, "BenchClient", features=["raw_methods"]))
+        module_spec = importlib.util.spec_from_file_location("bench_raw_sdk", sdk_path)
+        sdk = importlib.util.module_from_spec(module_spec)
+        module_spec.loader.exec_module(sdk)
+
+        client = sdk.BenchClient("http://bench", share_pool=False)
+        client._raw.set_httpx_client(
+            httpx.Client(base_url="http://bench", transport=httpx.MockTransport(handler))
+        )
+        client._raw.set_async_httpx_client(
+            httpx.AsyncClient(base_url="http://bench", transport=httpx.MockTransport(async_handler))
+        )
+        namespace = client.group0
+
+        print(f"payload: {len(body) / 1024:.0f} KiB  (width {args.width}, depth {args.depth})")
+        cases = [
+            ("parsed", lambda: namespace.get_op0(item_id="x")),
+            ("detailed", lambda: namespace.get_op0_detailed(item_id="x")),
+            ("raw", lambda: namespace.get_op0_raw(item_id="x")),
+        ]
+        for label, call in cases:
+            calls, started = 0, time.perf_counter()
+            while time.perf_counter() - started < args.seconds:
+                call()
+                calls += 1
+            rate = calls / (time.perf_counter() - started)
+            print(f"  sync  {label:<9} {rate:9.1f} calls/s")
+
+        async def run_async(method):
+            calls, started = 0, time.perf_counter()
+            while time.perf_counter() - started < args.seconds:
+                await method(item_id="x")
+                calls += 1
+            return calls / (time.perf_counter() - started)
+
+        for label, suffix in (("parsed", ""), ("detailed", "_detailed"), ("raw", "_raw")):
+            rate = asyncio.run(run_async(getattr(namespace, f"get_op0{suffix}_async")))
+            print(f"  async {label:<9} {rate:9.1f} calls/s")
+
+
+if __name__ == "__main__":
+    main()
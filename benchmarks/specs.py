@@ -0,0 +1,149 @@
+"""Synthetic OpenAPI 3.0 specs for the generation benchmarks."""
+
+from typing import Any, Dict, List
+
+SCALAR_PROPERTIES: List[Dict[str, Any]] = [
+    {"type": "string"},
+    {"type": "integer"},
+    {"type": "number", "nullable": True},
+    {"type": "boolean"},
+    {"type": "string", "format": "date-time"},
+    {"type": "string", "format": "uuid"},
+    {"type": "array", "items": {"type": "string"}},
+]
+
+
+def _model(name: str, child: str, index: int) -> Dict[str, Any]:
+    properties = {
+        f"field_{i}": SCALAR_PROPERTIES[(index + i) % len(SCALAR_PROPERTIES)]
+        for i in range(4)
+    }
+    properties["status"] = {"$ref": "#/components/schemas/Status"}
+    required = ["field_0", "status"]
+    if child:
+        properties["child"] = {"$ref": f"#/components/schemas/{child}"}
+        properties["children"] = {
+            "type": "array",
+            "items": {"$ref": f"#/components/schemas/{child}"},
+        }
+        required.append("child")
+    return {"type": "object", "title": name, "properties": properties, "required": required}
+
+
+def synthesize_spec(
+    operations: int, depth: int = 4, ops_per_tag: int = 50, ops_per_chain: int = 10
+) -> Dict[str, Any]:
+    """
+    Builds a spec with `operations` operations spread over tags.
+
+    Request and response bodies are chains of `depth` nested models; every
+    `ops_per_chain` operations share one chain so the model count grows
+    with the spec without exploding.
+    """
+    schemas: Dict[str, Any] = {
+        "Status": {"type": "string", "enum": ["active", "pending", "archived"]},
+    }
+    chains = max(1, operations // ops_per_chain)
+    for chain in range(chains):
+        for level in reversed(range(depth)):
+            child = f"Chain{chain}Level{level + 1}" if level + 1 < depth else ""
+            name = f"Chain{chain}Level{level}"
+            schemas[name] = _model(name, child, chain + level)
+
+    paths: Dict[str, Any] = {}
+    for op in range(operations):
+        tag = f"group{op // ops_per_tag}"
+        root = {"$ref": f"#/components/schemas/Chain{op % chains}Level0"}
+        json_content = {"application/json": {"schema": root}}
+        responses = {"200": {"description": "OK", "content": json_content}}
+        item_param = {
+            "name": "item_id",
+            "in": "path",
+            "required": True,
+            "schema": {"type": "string"},
+        }
+        if op % 2:
+            paths[f"/{tag}/op{op}"] = {
+                "post": {
+                    "operationId": f"create_op{op}",
+                    "tags": [tag],
+                    "requestBody": {"required": True, "content": json_content},
+                    "responses": responses,
+                }
+            }
+        else:
+            paths[f"/{tag}/op{op}/{{item_id}}"] = {
+                "get": {
+                    "operationId": f"get_op{op}",
+                    "tags": [tag],
+                    "parameters": [
+                        item_param,
+                        {"name": "limit", "in": "query", "schema": {"type": "integer", "default": 10}},
+                        {"name": "status", "in": "query", "schema": {"$ref": "#/components/schemas/Status"}},
+                    ],
+                    "responses": responses,
+                }
+            }
+    return {
+        "openapi": "3.0.3",
+        "info": {"title": f"Bench {operations} API", "version": "1.0.0"},
+        "paths": paths,
+        "components": {"schemas": schemas},
+    }
+
+
+def downgrade_to_30(node: Any) -> Any:
+    """
+    Rewrites the OpenAPI 3.1 bits FastAPI emits into 3.0 form.
+
+    openapi-python-client 0.15 only reads 3.0 documents; the 3.1 constructs
+    the example server produces are `anyOf: [X, {"type": "null"}]` and
+    `contentMediaType` on file fields.
+    """
+    if isinstance(node, list):
+        return [downgrade_to_30(item) for item in node]
+    if not isinstance(node, dict):
+        return node
+    node = {key: downgrade_to_30(value) for key, value in node.items()}
+    if str(node.get("openapi", "")).startswith("3.1"):
+        node["openapi"] = "3.0.3"
+    if node.get("type") == "string" and "contentMediaType" in node:
+        node.pop("contentMediaType")  # an uploaded file
+        node.setdefault("format", "binary")
+    variants = node.get("anyOf")
+    if isinstance(variants, list) and {"type": "null"} in variants:
+        rest = [variant for variant in variants if variant != {"type": "null"}]
+        node.pop("anyOf")
+        if len(rest) == 1:
+            node.update(rest[0])
+        else:
+            node["anyOf"] = rest
+        node["nullable"] = True
+    return node
+
+
+def sample_payload(spec: Dict[str, Any], schema: Dict[str, Any], width: int) -> Any:
+    """A JSON value matching `schema`, with `width` items in every array."""
+    if "$ref" in schema:
+        name = schema["$ref"].rsplit("/", 1)[-1]
+        return sample_payload(spec, spec["components"]["schemas"][name], width)
+    if "enum" in schema:
+        return schema["enum"][0]
+    kind = schema.get("type")
+    if kind == "object":
+        return {
+            name: sample_payload(spec, prop, width)
+            for name, prop in schema.get("properties", {}).items()
+        }
+    if kind == "array":
+        return [sample_payload(spec, schema["items"], width) for _ in range(width)]
+    if kind == "integer":
+        return 42
+    if kind == "number":
+        return 4.2
+    if kind == "boolean":
+        return True
+    return {
+        "date-time": "2024-01-01T00:00:00+00:00",
+        "uuid": "00000000-0000-4000-8000-000000000000",
+    }.get(schema.get("format", ""), "text")
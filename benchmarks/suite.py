@@ -0,0 +1,308 @@
+"""
+Benchmark suite: generation time/memory and generated-client throughput.
+
+    python benchmarks/suite.py --sizes 100,1000,10000 --output bench.json
+    python benchmarks/suite.py --skip-generation --requests 5000 --baseline old.json
+
+Generation: synthetic specs (see `specs.py`) are turned into client
+packages with openapi-python-client once per size (cached in --workdir),
+then `render_wrapper` is timed in a fresh process per run so peak RSS is
+the renderer's own.
+
+Client: `src/example_server.py` is started under uvicorn, an SDK is
+generated from its spec, and sync (sequential) and async (concurrent)
+`health_check` calls are measured for requests/s and p50/p99 latency.
+"""
+
+import argparse
+import asyncio
+import hashlib
+import importlib
+import json
+import os
+import platform
+import resource
+import socket
+import subprocess
+import sys
+import time
+import urllib.request
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+BENCH_DIR = Path(__file__).resolve().parent
+REPO_ROOT = BENCH_DIR.parent
+sys.path.insert(0, str(REPO_ROOT))
+sys.path.insert(0, str(BENCH_DIR))
+
+from specs import downgrade_to_30, synthesize_spec  # noqa: E402
+
+
+def percentile(samples: List[float], q: float) -> float:
+    ordered = sorted(samples)
+    return ordered[int(round(q * (len(ordered) - 1)))]
+
+
+def generate_client_package(spec: Dict[str, Any], workdir: Path) -> Tuple[str, Path]:
+    """
+    Runs openapi-python-client for `spec` unless an identical run is cached.
+
+    Returns the package name and the directory to put on `sys.path`.
+    """
+    text = json.dumps(spec, sort_keys=True)
+    digest = hashlib.sha256(text.encode()).hexdigest()[:16]
+    target = workdir / digest
+    marker = target / "package.txt"
+    if marker.is_file():
+        package = marker.read_text()
+        return package, target / package.replace("_", "-")
+    target.mkdir(parents=True, exist_ok=True)
+    (target / "openapi.json").write_text(text)
+    subprocess.run(
+        [sys.executable, "-m", "openapi_python_client", "generate", "--path", "openapi.json"],
+        cwd=target,
+        check=True,
+        stdout=subprocess.DEVNULL,
+    )
+    project = next(p for p in target.iterdir() if p.is_dir() and p.name.endswith("-client"))
+    package = project.name.replace("-", "_")
+    marker.write_text(package)
+    return package, project
+
+
+def render_child(package: str, static: bool) -> None:
+    """Child-process entry point: renders once and prints its own timings."""
+    from sdk_autogen import render_wrapper
+
+    started = time.perf_counter()
+    code = render_wrapper(package, "BenchClient", static=static)
+    elapsed = time.perf_counter() - started
+    print(
+        json.dumps(
+            {
+                "seconds": elapsed,
+                "peak_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+                "output_bytes": len(code),
+            }
+        )
+    )
+
+
+def bench_generation(sizes: List[int], depth: int, repeat: int, workdir: Path) -> List[Dict[str, Any]]:
+    results = []
+    for size in sizes:
+        print(f"[generation] {size} operations: preparing client package...", flush=True)
+        spec = synthesize_spec(size, depth=depth)
+        package, project = generate_client_package(spec, workdir)
+        env = dict(os.environ, PYTHONPATH=os.pathsep.join([str(project), str(REPO_ROOT)]))
+        for static in (False, True):
+            runs = []
+            for _ in range(repeat):
+                out = subprocess.run(
+                    [sys.executable, __file__, "--render-child", package]
+                    + (["--static"] if static else []),
+                    env=env,
+                    check=True,
+                    capture_output=True,
+                    text=True,
+                ).stdout
+                runs.append(json.loads(out.strip().splitlines()[-1]))
+            best = min(runs, key=lambda run: run["seconds"])
+            result = {
+                "operations": size,
+                "models": len(spec["components"]["schemas"]),
+                "depth": depth,
+                "mode": "static" if static else "import",
+                "seconds": best["seconds"],
+                "seconds_all": [run["seconds"] for run in runs],
+                "peak_rss_mb": max(run["peak_rss_mb"] for run in runs),
+                "output_bytes": best["output_bytes"],
+            }
+            print(
+                f"  {result['mode']:<6} {result['seconds']:8.3f}s  "
+                f"peak RSS {result['peak_rss_mb']:7.1f} MB",
+                flush=True,
+            )
+            results.append(result)
+    return results
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def wait_for(url: str, timeout: float = 30.0) -> bytes:
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            with urllib.request.urlopen(url, timeout=1) as response:
+                return response.read()
+        except OSError:
+            if time.monotonic() > deadline:
+                raise
+            time.sleep(0.1)
+
+
+def measure_sync(call: Any, requests: int) -> Dict[str, float]:
+    latencies = []
+    started = time.perf_counter()
+    for _ in range(requests):
+        t0 = time.perf_counter()
+        call()
+        latencies.append(time.perf_counter() - t0)
+    return summarize(latencies, time.perf_counter() - started)
+
+
+async def measure_async(call: Any, requests: int, concurrency: int) -> Dict[str, float]:
+    latencies: List[float] = []
+    remaining = iter(range(requests))
+
+    async def worker() -> None:
+        for _ in remaining:
+            t0 = time.perf_counter()
+            await call()
+            latencies.append(time.perf_counter() - t0)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return summarize(latencies, time.perf_counter() - started)
+
+
+def summarize(latencies: List[float], elapsed: float) -> Dict[str, float]:
+    return {
+        "requests": len(latencies),
+        "requests_per_second": len(latencies) / elapsed,
+        "p50_ms": percentile(latencies, 0.50) * 1000,
+        "p99_ms": percentile(latencies, 0.99) * 1000,
+    }
+
+
+def bench_client(requests: int, concurrency: int, workdir: Path) -> Dict[str, Any]:
+    from sdk_autogen import render_wrapper
+
+    port = free_port()
+    server = subprocess.Popen(
+        [sys.executable, str(REPO_ROOT / "src" / "example_server.py"), "--port", str(port)],
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    try:
+        base_url = f"http://127.0.0.1:{port}"
+        spec = downgrade_to_30(json.loads(wait_for(f"{base_url}/openapi.json")))
+        package, project = generate_client_package(spec, workdir)
+        sys.path.insert(0, str(project))
+        sdk_path = project / "bench_sdk.py"
+        sdk_path.write_text(render_wrapper(package, "BenchClient"))
+        sdk = importlib.import_module("bench_sdk")
+
+        with sdk.BenchClient(base_url) as client:
+            client.health_check()  # warm up the connection pool
+            print(f"[client] sync: {requests} sequential health_check calls", flush=True)
+            sync = measure_sync(client.health_check, requests)
+            print(
+                f"[client] async: {requests} health_check_async calls, concurrency {concurrency}",
+                flush=True,
+            )
+
+            async def run_async() -> Dict[str, float]:
+                await client.health_check_async()
+                result = await measure_async(client.health_check_async, requests, concurrency)
+                await client.aclose()
+                return result
+
+            async_result = asyncio.run(run_async())
+        async_result["concurrency"] = concurrency
+        for label, result in (("sync", sync), ("async", async_result)):
+            print(
+                f"  {label:<5} {result['requests_per_second']:9.1f} req/s  "
+                f"p50 {result['p50_ms']:6.2f} ms  p99 {result['p99_ms']:6.2f} ms"
+            )
+        return {"sync": sync, "async": async_result}
+    finally:
+        server.terminate()
+        server.wait()
+
+
+def git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=REPO_ROOT,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(current: Dict[str, Any], baseline: Dict[str, Any]) -> None:
+    """Prints current vs. baseline for every metric both result files have."""
+    print(f"\nvs. baseline {baseline['meta'].get('commit')}:")
+    old_runs = {(r["operations"], r["mode"]): r for r in baseline.get("generation", [])}
+    for run in current.get("generation", []):
+        old = old_runs.get((run["operations"], run["mode"]))
+        if old:
+            print(
+                f"  generation {run['operations']:>6} {run['mode']:<6} "
+                f"{run['seconds'] / old['seconds']:6.2f}x time  "
+                f"{run['peak_rss_mb'] / old['peak_rss_mb']:6.2f}x RSS"
+            )
+    for label in ("sync", "async"):
+        new = current.get("client", {}).get(label)
+        old = baseline.get("client", {}).get(label)
+        if new and old:
+            print(
+                f"  client {label:<5} {new['requests_per_second'] / old['requests_per_second']:6.2f}x req/s  "
+                f"{new['p99_ms'] / old['p99_ms']:6.2f}x p99"
+            )
+
+
+def main() -> None:
+    p = argparse.ArgumentParser(description="Benchmark SDK generation and the generated client.")
+    p.add_argument("--sizes", default="100,1000,10000", help="operation counts to synthesise")
+    p.add_argument("--depth", type=int, default=4, help="nesting depth of synthetic models")
+    p.add_argument("--repeat", type=int, default=3, help="render runs per size and mode (best kept)")
+    p.add_argument("--requests", type=int, default=2000, help="client calls per measurement")
+    p.add_argument("--concurrency", type=int, default=32, help="in-flight async calls")
+    p.add_argument("--workdir", default=str(BENCH_DIR / ".work"), help="cache for generated packages")
+    p.add_argument("--output", default="bench_results.json", help="JSON results file")
+    p.add_argument("--baseline", default=None, help="earlier results file to compare against")
+    p.add_argument("--skip-generation", action="store_true")
+    p.add_argument("--skip-client", action="store_true")
+    p.add_argument("--render-child", default=None, help=argparse.SUPPRESS)
+    p.add_argument("--static", action="store_true", help=argparse.SUPPRESS)
+    args = p.parse_args()
+
+    if args.render_child:
+        render_child(args.render_child, args.static)
+        return
+
+    workdir = Path(args.workdir)
+    workdir.mkdir(parents=True, exist_ok=True)
+    results: Dict[str, Any] = {
+        "meta": {
+            "commit": git_commit(),
+            "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpus": os.cpu_count(),
+        }
+    }
+    if not args.skip_generation:
+        sizes = [int(size) for size in args.sizes.split(",")]
+        results["generation"] = bench_generation(sizes, args.depth, args.repeat, workdir)
+    if not args.skip_client:
+        results["client"] = bench_client(args.requests, args.concurrency, workdir)
+
+    Path(args.output).write_text(json.dumps(results, indent=2) + "\n")
+    print(f"✅  Wrote '{args.output}'")
+    if args.baseline:
+        compare(results, json.loads(Path(args.baseline).read_text()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,149 @@
+"""
+Compares peak memory of multipart uploads through the model and `*_upload`.
+
+    python benchmarks/upload_memory.py --size-mib 512
+
+A package with one multipart operation is generated and wrapped. Every case
+runs in a fresh process that uploads the same file to a transport which
+reads the request body chunk by chunk without keeping it, and reports its
+peak RSS (Linux/macOS) and the time taken.
+"""
+
+import argparse
+import hashlib
+import importlib.util
+import io
+import os
+import resource
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import httpx
+
+BENCH_DIR = Path(__file__).resolve().parent
+sys.path.insert(0, str(BENCH_DIR.parent))
+sys.path.insert(0, str(BENCH_DIR))
+
+from sdk_autogen import render_wrapper  # noqa: E402
+from suite import generate_client_package  # noqa: E402
+
+UPLOAD_SPEC = {
+    "openapi": "3.0.3",
+    "info": {"title": "Upload API", "version": "1.0.0"},
+    "paths": {
+        "/upload": {
+            "post": {
+                "operationId": "upload",
+                "requestBody": {
+                    "required": True,
+                    "content": {
+                        "multipart/form-data": {
+                            "schema": {"$ref": "#/components/schemas/UploadBody"}
+                        }
+                    },
+                },
+                "responses": {"200": {"description": "OK"}},
+            }
+        }
+    },
+    "components": {
+        "schemas": {
+            "UploadBody": {
+                "type": "object",
+                "properties": {
+                    "name": {"type": "string"},
+                    "file": {"type": "string", "format": "binary"},
+                },
+                "required": ["name", "file"],
+            }
+        }
+    },
+}
+
+CASES = ("model-bytes", "model-file", "upload", "upload-mmap")
+
+
+class DrainTransport(httpx.BaseTransport):
+    """Reads request bodies as a server would; `MockTransport` buffers them first."""
+
+    received = 0
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        self.received = sum(len(chunk) for chunk in request.stream)
+        return httpx.Response(200)
+
+
+def peak_rss_mib() -> float:
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def run_case(case: str, sdk_path: Path, project: Path, data_path: Path) -> None:
+    """Child-process entry point: one upload, then prints peak RSS and seconds."""
+    sys.path.insert(0, str(project))
+    module_spec = importlib.util.spec_from_file_location("bench_upload_sdk", sdk_path)
+    sdk = importlib.util.module_from_spec(module_spec)
+    module_spec.loader.exec_module(sdk)
+    transport = DrainTransport()
+    client = sdk.BenchClient("http://bench", share_pool=False)
+    client._raw.set_httpx_client(httpx.Client(base_url="http://bench", transport=transport))
+    started = time.perf_counter()
+    if case.startswith("model"):
+        body_type = next(
+            value for name, value in vars(sdk).items() if name == "UploadBody"
+        )
+        with open(data_path, "rb") as file:
+            payload = io.BytesIO(file.read()) if case == "model-bytes" else file
+            client.upload_detailed(
+                multipart_data=body_type(name="x", file=sdk.File(payload=payload, file_name="data"))
+            )
+    else:
+        client.upload_upload(
+            files={"file": str(data_path)}, data={"name": "x"}, use_mmap=case == "upload-mmap"
+        )
+    print(f"{peak_rss_mib():.1f} {time.perf_counter() - started:.3f} {transport.received}")
+
+
+def main() -> None:
+    p = argparse.ArgumentParser(description="Benchmark multipart upload memory.")
+    p.add_argument("--size-mib", type=int, default=256, help="size of the uploaded file")
+    p.add_argument("--workdir", default=str(BENCH_DIR / ".work"), help="cache for generated packages")
+    p.add_argument("--case", choices=CASES, help=argparse.SUPPRESS)
+    p.add_argument("--sdk", help=argparse.SUPPRESS)
+    p.add_argument("--project", help=argparse.SUPPRESS)
+    p.add_argument("--data", help=argparse.SUPPRESS)
+    args = p.parse_args()
+    if args.case:
+        run_case(args.case, Path(args.sdk), Path(args.project), Path(args.data))
+        return
+
+    workdir = Path(args.workdir)
+    package, project = generate_client_package(UPLOAD_SPEC, workdir)
+    sys.path.insert(0, str(project))
+    sdk_path = workdir / "bench_upload_sdk.py"
+    sdk_path.write_text(render_wrapper(package, "BenchClient", spec=UPLOAD_SPEC))
+    data_path = workdir / f"upload-{args.size_mib}MiB.bin"
+    if not data_path.is_file() or data_path.stat().st_size != args.size_mib << 20:
+        block = hashlib.sha256(b"upload").digest() * (1 << 15)  # 1 MiB
+        with open(data_path, "wb") as file:
+            for _ in range(args.size_mib):
+                file.write(block)
+
+    print(f"upload of {args.size_mib} MiB")
+    for case in CASES:
+        output = subprocess.run(
+            [sys.executable, __file__, "--case", case, "--sdk", str(sdk_path),
+             "--project", str(project), "--data", str(data_path)],
+            check=True,
+            capture_output=True,
+            text=True,
+            env={**os.environ, "PYTHONDONTWRITEBYTECODE": "1"},
+        ).stdout.split()
+        peak, seconds, size = float(output[0]), float(output[1]), int(output[2])
+        print(f"  {case:<12} peak RSS {peak:8.1f} MiB  {seconds:6.2f}s  ({size} bytes sent)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""Shared fixtures: client packages generated from a synthetic spec and from the example server."""
+
+import importlib
+import json
+import socket
+import sys
+import threading
+import time
+from pathlib import Path
+from types import ModuleType
+from typing import Any, Dict, Iterator
+
+import pytest
+
+REPO_ROOT = Path(__file__).resolve().parent
+sys.path[:0] = [str(REPO_ROOT), str(REPO_ROOT / "benchmarks"), str(REPO_ROOT / "src")]
+
+from sdk_autogen import RUNTIME_FEATURES, generate_client_package, render_wrapper  # noqa: E402
+from specs import downgrade_to_30, synthesize_spec  # noqa: E402
+
+
+def _generate(spec: Dict[str, Any], work_dir: Path, package: str) -> str:
+    spec_path = work_dir / "openapi.json"
+    spec_path.write_text(json.dumps(spec))
+    generate_client_package(spec_path, work_dir, package, format_code=False)
+    sys.path.insert(0, str(work_dir))
+    importlib.invalidate_caches()
+    return package
+
+
+@pytest.fixture(scope="session")
+def synthetic_package(tmp_path_factory: pytest.TempPathFactory) -> str:
+    """A client package for 24 synthetic operations over two tags."""
+    return _generate(
+        synthesize_spec(24, depth=2, ops_per_tag=12),
+        tmp_path_factory.mktemp("synthetic"),
+        "synthetic_client",
+    )
+
+
+@pytest.fixture(scope="session")
+def example_sdk(tmp_path_factory: pytest.TempPathFactory) -> ModuleType:
+    """The wrapper module generated from `src/example_server.py`'s spec, with every runtime feature."""
+    import example_server
+
+    work_dir = tmp_path_factory.mktemp("example")
+    spec = downgrade_to_30(example_server.app.openapi())
+    package = _generate(spec, work_dir, "example_client")
+    (work_dir / "example_sdk.py").write_text(
+        render_wrapper(package, "ExampleClient", spec=spec, features=list(RUNTIME_FEATURES))
+    )
+    return importlib.import_module("example_sdk")
+
+
+@pytest.fixture(scope="session")
+def example_server_url() -> Iterator[str]:
+    """The example server running under uvicorn in a background thread."""
+    import uvicorn
+
+    import example_server
+
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+    server = uvicorn.Server(uvicorn.Config(example_server.app, host="127.0.0.1", port=port, log_level="warning"))
+    thread = threading.Thread(target=server.run, daemon=True)
+    thread.start()
+    deadline = time.monotonic() + 30
+    while not server.started:
+        if time.monotonic() > deadline:
+            raise RuntimeError("the example server did not start")
+        time.sleep(0.05)
+    yield f"http://127.0.0.1:{port}"
+    server.should_exit = True
+    thread.join(timeout=10)
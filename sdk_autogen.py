@@ -10,14 +10,63 @@ USAGE
 python generate_wrapper.py \
        --package <your_client_package_name> \
        --output  <your_sdk_file_name>.py
+
+Add `--static` to read signatures from the endpoint sources instead of
+importing every endpoint module (much faster on large APIs, same output).
 """
 
 import argparse
+import ast
+import asyncio
+import builtins
+import concurrent.futures
+import contextlib
+import hashlib
 import importlib
+import importlib.machinery
 import inspect
+import io
+import json
+import keyword
+import os
 import pkgutil
+import random
+import re
+import shutil
+import subprocess
+import sys
+import time
+import tracemalloc
+import urllib.request
 from pathlib import Path
-from typing import Any, Set, List, Dict, Tuple, Union, Optional, Type
+from types import ModuleType, new_class
+from typing import (
+    Any,
+    ForwardRef,
+    Set,
+    List,
+    Dict,
+    Tuple,
+    Union,
+    Optional,
+    Type,
+    Generic,
+    Iterator,
+    NamedTuple,
+    TypeVar,
+    Callable,
+    ContextManager,
+    Sequence,
+)
+
+
+def route_pattern(path: str) -> str:
+    """Regex matching concrete request paths for a URL template like "/a/{b}"."""
+    return "".join(
+        "[^/]+" if part.startswith("{") else re.escape(part)
+        for part in re.split(r"(\{[^}]*\})", path)
+        if part
+    )
 
 
 def get_pascal_case(name: str) -> str:
@@ -25,11 +74,296 @@ def get_pascal_case(name: str) -> str:
     return "".join(word.capitalize() for word in name.replace("-", "_").split("_"))
 
 
+class AnnotationCacheStats:
+    """Hit/miss counters of the `format_type_annotation` memo."""
+
+    def __init__(self) -> None:
+        self.hits = 0
+        self.misses = 0
+
+    def merge(self, other: "AnnotationCacheStats") -> None:
+        self.hits += other.hits
+        self.misses += other.misses
+
+    def __str__(self) -> str:
+        lookups = self.hits + self.misses
+        rate = 100.0 * self.hits / lookups if lookups else 0.0
+        return f"{self.hits} hits, {self.misses} misses ({rate:.1f}% hit rate)"
+
+
+# Per-run memo of format_type_annotation, reset by `scan_package`. Entries are
+# keyed by the annotation's identity, not equality: typing treats
+# Union[a, b] == Union[b, a], but they must render differently. The entry
+# keeps the object alive so its id can't be reused. Identity also works for
+# unhashable annotations, and typing's own cache makes equal annotations
+# built from the same arguments the same object.
+_annotation_cache: Dict[Tuple[int, str], Tuple[Any, str, Set[str]]] = {}
+annotation_cache_stats = AnnotationCacheStats()
+
+
+def reset_annotation_cache() -> None:
+    _annotation_cache.clear()
+    annotation_cache_stats.hits = annotation_cache_stats.misses = 0
+
+
+class ProfileSpan:
+    """One timed region of a generator run; `endpoint` names the module it was spent on."""
+
+    __slots__ = ("name", "endpoint", "parent", "depth", "start_ns", "end_ns", "memory_start", "memory_delta")
+
+    def __init__(
+        self,
+        name: str,
+        endpoint: Optional[str],
+        parent: Optional["ProfileSpan"],
+        start_ns: int,
+        memory_start: int,
+    ):
+        self.name = name
+        self.endpoint = endpoint
+        self.parent = parent
+        self.depth = parent.depth + 1 if parent is not None else 0
+        self.start_ns = start_ns
+        self.end_ns = start_ns
+        self.memory_start = memory_start
+        self.memory_delta = 0
+
+    @property
+    def seconds(self) -> float:
+        return (self.end_ns - self.start_ns) / 1e9
+
+
+class GeneratorProfile:
+    """
+    Nested stage and per-endpoint spans of a generator run (see `--profile`).
+
+    Each span records its wall time and, with `memory=True`, the change in
+    memory traced by `tracemalloc`. Tracing allocations makes imports several
+    times slower, so compare times from runs with the same setting.
+    `chrome_trace` is the Chrome trace event format, which chrome://tracing,
+    Perfetto and speedscope all open.
+    """
+
+    def __init__(self, memory: bool = True) -> None:
+        self.memory = memory
+        self.spans: List[ProfileSpan] = []
+        self._open: List[ProfileSpan] = []
+        self._started_tracing = False
+        self.origin_ns = time.perf_counter_ns()
+
+    def start(self) -> None:
+        if self.memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracing = True
+
+    def stop(self) -> None:
+        while self._open:
+            self.end(self._open[-1])
+        if self._started_tracing:
+            tracemalloc.stop()
+            self._started_tracing = False
+
+    def _traced(self) -> int:
+        return tracemalloc.get_traced_memory()[0] if self.memory and tracemalloc.is_tracing() else 0
+
+    def begin(self, name: str, endpoint: Optional[str] = None) -> ProfileSpan:
+        parent = self._open[-1] if self._open else None
+        span = ProfileSpan(name, endpoint, parent, time.perf_counter_ns(), self._traced())
+        self.spans.append(span)
+        self._open.append(span)
+        return span
+
+    def end(self, span: ProfileSpan) -> None:
+        span.end_ns = time.perf_counter_ns()
+        span.memory_delta = self._traced() - span.memory_start
+        # Spans left open inside `span` end with it.
+        while self._open and self._open.pop() is not span:
+            pass
+
+    @contextlib.contextmanager
+    def span(self, name: str, endpoint: Optional[str] = None) -> Iterator[None]:
+        span = self.begin(name, endpoint)
+        try:
+            yield
+        finally:
+            self.end(span)
+
+    def chrome_trace(self) -> Dict[str, Any]:
+        events: List[Dict[str, Any]] = [
+            {"name": "process_name", "ph": "M", "pid": 1, "tid": 1, "args": {"name": "sdk_autogen"}}
+        ]
+        for span in self.spans:
+            args: Dict[str, Any] = {"memory_delta_bytes": span.memory_delta}
+            if span.endpoint is not None:
+                args["endpoint"] = span.endpoint
+            events.append(
+                {
+                    "name": span.name if span.endpoint is None else f"{span.name} {span.endpoint}",
+                    "cat": "endpoint" if span.endpoint is not None else "stage",
+                    "ph": "X",
+                    "ts": (span.start_ns - self.origin_ns) / 1000,
+                    "dur": (span.end_ns - span.start_ns) / 1000,
+                    "pid": 1,
+                    "tid": 1,
+                    "args": args,
+                }
+            )
+            if self.memory:
+                events.append(
+                    {
+                        "name": "traced memory",
+                        "ph": "C",
+                        "ts": (span.end_ns - self.origin_ns) / 1000,
+                        "pid": 1,
+                        "tid": 1,
+                        "args": {"bytes": span.memory_start + span.memory_delta},
+                    }
+                )
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def write(self, path: Path) -> None:
+        path.write_text(json.dumps(self.chrome_trace()))
+
+    def endpoint_totals(self) -> Dict[str, Dict[str, float]]:
+        """Seconds per endpoint and span name, plus "total" and "memory" (bytes)."""
+        totals: Dict[str, Dict[str, float]] = {}
+        for span in self.spans:
+            if span.endpoint is None:
+                continue
+            entry = totals.setdefault(span.endpoint, {"total": 0.0, "memory": 0.0})
+            entry[span.name] = entry.get(span.name, 0.0) + span.seconds
+            # Nested endpoint spans are already part of their parent's time.
+            if span.parent is None or span.parent.endpoint != span.endpoint:
+                entry["total"] += span.seconds
+                entry["memory"] += span.memory_delta
+        return totals
+
+    def summary(self, top: int = 10) -> str:
+        """The stage tree with times and memory deltas, then the `top` slowest endpoints."""
+        stages: Dict[Tuple[str, ...], List[float]] = {}
+        path: List[str] = []
+        for span in self.spans:
+            if span.endpoint is not None:
+                continue
+            del path[span.depth:]
+            path.append(span.name)
+            entry = stages.setdefault(tuple(path), [0, 0.0, 0])
+            entry[0] += 1
+            entry[1] += span.seconds
+            entry[2] += span.memory_delta
+        def memory_column(size: float) -> str:
+            return f" {_format_bytes(int(size)):>11}" if self.memory else ""
+
+        lines = [f"{'stage':<40} {'calls':>6} {'time':>9}" + (f" {'memory':>11}" if self.memory else "")]
+        for key, (calls, seconds, memory) in stages.items():
+            label = "  " * (len(key) - 1) + key[-1]
+            lines.append(f"{label:<40} {calls:6d} {seconds:8.3f}s" + memory_column(memory))
+
+        totals = self.endpoint_totals()
+        if totals:
+            # Columns in the order the stages first ran.
+            names = list(dict.fromkeys(name for entry in totals.values() for name in entry))[2:]
+            slowest = sorted(totals.items(), key=lambda item: item[1]["total"], reverse=True)[:top]
+            width = max(len("endpoint"), *(len(endpoint) for endpoint, _ in slowest))
+            lines.append("")
+            lines.append(f"Slowest {len(slowest)} of {len(totals)} endpoints (ms):")
+            lines.append(
+                f"{'endpoint':<{width}} {'total':>8} "
+                + " ".join(f"{name:>12}" for name in names)
+                + (f" {'memory':>11}" if self.memory else "")
+            )
+            for endpoint, entry in slowest:
+                lines.append(
+                    f"{endpoint:<{width}} {entry['total'] * 1000:8.2f} "
+                    + " ".join(f"{entry.get(name, 0.0) * 1000:12.2f}" for name in names)
+                    + memory_column(entry["memory"])
+                )
+        return "\n".join(lines)
+
+
+def _format_bytes(size: int) -> str:
+    value, unit = abs(size) / 1024, "KiB"
+    if value >= 1024:
+        value, unit = value / 1024, "MiB"
+    return f"{'-' if size < 0 else '+'}{value:.1f} {unit}"
+
+
+class _ProfileSteps:
+    """Back-to-back spans in a loop body: each `next` ends the previous step."""
+
+    def __init__(self, profile: Optional[GeneratorProfile]) -> None:
+        self.profile = profile
+        self.current: Optional[ProfileSpan] = None
+
+    def next(self, name: str, endpoint: Optional[str] = None) -> None:
+        if self.profile is None:
+            return
+        self.close()
+        self.current = self.profile.begin(name, endpoint)
+
+    def close(self) -> None:
+        if self.current is not None:
+            self.profile.end(self.current)
+            self.current = None
+
+
+# The profile `--profile` records into; None (the default) makes spans no-ops.
+active_profile: Optional[GeneratorProfile] = None
+
+
+def profile_span(name: str, endpoint: Optional[str] = None) -> ContextManager[None]:
+    """A span in `active_profile`, or a no-op when nothing is being profiled."""
+    if active_profile is None:
+        return contextlib.nullcontext()
+    return active_profile.span(name, endpoint)
+
+
+@contextlib.contextmanager
+def profiling(
+    path: Optional[str], memory: bool = True, top: int = 10
+) -> Iterator[Optional[GeneratorProfile]]:
+    """
+    Records the block into a new `active_profile` and writes it to `path`.
+
+    Prints `GeneratorProfile.summary(top)` afterwards. Without a path the
+    block runs unprofiled.
+    """
+    global active_profile
+    if not path:
+        yield None
+        return
+    profile = active_profile = GeneratorProfile(memory)
+    profile.start()
+    try:
+        with profile.span("total"):
+            yield profile
+    finally:
+        profile.stop()
+        active_profile = None
+    profile.write(Path(path))
+    print(profile.summary(top))
+    print(f"✅  Wrote profile '{path}' (chrome://tracing, ui.perfetto.dev or speedscope.app)")
+
+
 def format_type_annotation(type_obj: Any, client_pkg_name: str) -> tuple[str, Set[str]]:
     """
     Formats a type annotation for the SDK and collects necessary imports.
     Now, it will not add individual model imports if a wildcard import is used.
+
+    Results are memoized for the run; the returned set must not be mutated.
     """
+    key = (id(type_obj), client_pkg_name)
+    entry = _annotation_cache.get(key)
+    if entry is not None and entry[0] is type_obj:
+        annotation_cache_stats.hits += 1
+        return entry[1], entry[2]
+    annotation_cache_stats.misses += 1
+    type_str, imports = _format_type_annotation(type_obj, client_pkg_name)
+    _annotation_cache[key] = (type_obj, type_str, imports)
+    return type_str, imports
+
+
+def _format_type_annotation(type_obj: Any, client_pkg_name: str) -> tuple[str, Set[str]]:
     imports: Set[str] = set()
 
     if type_obj is inspect.Signature.empty or type_obj is Any:
@@ -37,6 +371,9 @@ def format_type_annotation(type_obj: Any, client_pkg_name: str) -> tuple[str, Se
         return "Any", imports
     if type_obj is None or type_obj is type(None):
         return "None", imports
+    if isinstance(type_obj, ForwardRef):
+        # `List["Model"]` in a generated signature; models are in scope by name.
+        return type_obj.__forward_arg__, imports
 
     module_name = getattr(type_obj, "__module__", "")
     type_name = getattr(type_obj, "__qualname__", getattr(type_obj, "__name__", ""))
@@ -203,7 +540,10 @@ if __name__ == '__main__':
 
     async def test_method(target_obj: Any, method_name: str, method_callable: Callable[..., Any], prefix: str = ""):
         print(f"{{prefix}}  Attempting: {{method_name}}")
-        sig = inspect.signature(method_callable)
+        try:
+            sig = inspect.signature(method_callable, eval_str=True) # Lazy SDKs use string annotations
+        except (TypeError, NameError):
+            sig = inspect.signature(method_callable)
         is_async = inspect.iscoroutinefunction(method_callable)
         
         try:
@@ -273,7 +613,7 @@ if __name__ == '__main__':
 
     async def run_all_tests():
         for item_name in dir(client):
-            if item_name.startswith('_') or item_name in ['model_fields', 'model_config', 'base_url', '_raw']:
+            if item_name.startswith('_') or item_name in ['base_url', 'close', 'aclose']:
                 continue
             item_obj = getattr(client, item_name)
             if item_obj is None: continue
@@ -281,7 +621,7 @@ if __name__ == '__main__':
             if item_obj.__class__.__name__.startswith('_') and hasattr(item_obj, '_raw'):
                 print(f"\\n--- Testing Namespace: {{item_name}} ---")
                 for method_name in dir(item_obj):
-                    if method_name.startswith('_'): continue
+                    if method_name.startswith('_') or method_name in ('batch', 'batch_stream'): continue
                     method_callable = getattr(item_obj, method_name)
                     if callable(method_callable):
                         await test_method(item_obj, method_name, method_callable, prefix="  ")
@@ -294,10 +634,55 @@ if __name__ == '__main__':
 """
 
 
+class EndpointParam(NamedTuple):
+    """A keyword parameter of a generated SDK method (``default`` is source text)."""
+
+    name: str
+    annotation: str
+    default: Optional[str]
+
+
+class EndpointFunction(NamedTuple):
+    """The rendered-ready view of one function in an endpoint module (see `SCANNED_FUNCTIONS`)."""
+
+    func_type: str
+    params: List[EndpointParam]
+    return_annotation: str
+    imports: Set[str]
+    http_method: Optional[str] = None
+    path: Optional[str] = None
+
+
+# Endpoint module functions the scanners describe. `_get_kwargs` builds the
+# request without sending it; streaming methods send it themselves.
+SCANNED_FUNCTIONS: Dict[str, Type[ast.AST]] = {
+    "sync": ast.FunctionDef,
+    "asyncio": ast.AsyncFunctionDef,
+    "_get_kwargs": ast.FunctionDef,
+    "_build_response": ast.FunctionDef,
+    "sync_detailed": ast.FunctionDef,
+    "asyncio_detailed": ast.AsyncFunctionDef,
+}
+# Scanned functions only recorded as present, with no parameters: the
+# `*_upload` methods parse their responses with `_build_response`.
+PRESENCE_ONLY_FUNCTIONS = {"_build_response"}
+# Wrapper method name suffix for each endpoint function the SDK exposes as is.
+METHOD_SUFFIXES = {
+    "sync": "",
+    "asyncio": "_async",
+    "sync_detailed": "_detailed",
+    "asyncio_detailed": "_detailed_async",
+}
+
+# Below this many endpoint modules a process pool costs more than it saves.
+PARALLEL_SCAN_THRESHOLD = 32
+
+
 def collect_namespaces(pkg_name: str) -> Dict[str, List[str]]:
     api_pkg = f"{pkg_name}.api"
     try:
-        api_module = importlib.import_module(api_pkg)
+        with profile_span("import api package"):
+            api_module = importlib.import_module(api_pkg)
     except ImportError:
         print(
             f"Error: Could not import API package '{api_pkg}'. Ensure package is installed and accessible."
@@ -312,238 +697,5993 @@ def collect_namespaces(pkg_name: str) -> Dict[str, List[str]]:
 
     api_path = Path(api_module.__file__).parent
     mapping: Dict[str, List[str]] = {}
-    for mod_info in pkgutil.walk_packages([str(api_path)], prefix=f"{api_pkg}."):
-        if mod_info.ispkg:
-            continue
-        module_name = mod_info.name
-        namespace = module_name.split(".")[-2]
-        mapping.setdefault(namespace, []).append(module_name)
+    with profile_span("walk_packages"):
+        for mod_info in pkgutil.walk_packages([str(api_path)], prefix=f"{api_pkg}."):
+            if mod_info.ispkg:
+                continue
+            module_name = mod_info.name
+            namespace = module_name.split(".")[-2]
+            mapping.setdefault(namespace, []).append(module_name)
     return mapping
 
 
-def render_wrapper(pkg_name: str, sdk_class_name: str) -> str:
-    ns_map = collect_namespaces(pkg_name)
-    if not ns_map:
+def find_package_dir(pkg_name: str) -> Optional[Path]:
+    """Locates a package on ``sys.path`` without executing any of its modules."""
+    search_path: Optional[List[str]] = None
+    spec = None
+    for part in pkg_name.split("."):
+        spec = importlib.machinery.PathFinder.find_spec(part, search_path)
+        if spec is None or not spec.submodule_search_locations:
+            return None
+        search_path = list(spec.submodule_search_locations)
+    return Path(search_path[0]) if search_path else None
+
+
+def collect_namespaces_static(pkg_name: str) -> Dict[str, List[str]]:
+    """Same mapping as `collect_namespaces`, built by walking the source tree."""
+    pkg_dir = find_package_dir(pkg_name)
+    api_path = pkg_dir / "api" if pkg_dir else None
+    if api_path is None or not (api_path / "__init__.py").is_file():
         print(
-            f"Warning: No API namespaces found for package '{pkg_name}'. Generated SDK will be minimal."
+            f"Error: Could not locate API package '{pkg_name}.api'. Ensure package is installed and accessible."
         )
+        return {}
 
-    UNSET_type_actual: Type[Any]
-    try:
-        _client_types_module = importlib.import_module(f"{pkg_name}.types")
-        UNSET_object = getattr(_client_types_module, "UNSET")
-        UNSET_type_actual = type(UNSET_object)
-    except (ImportError, AttributeError):
+    mapping: Dict[str, List[str]] = {}
 
-        class _PlaceholderUnsetType:
-            pass
+    def walk(path: Path, prefix: str) -> None:
+        for mod_info in pkgutil.iter_modules([str(path)], prefix=prefix):
+            if mod_info.ispkg:
+                walk(path / mod_info.name.split(".")[-1], f"{mod_info.name}.")
+                continue
+            namespace = mod_info.name.split(".")[-2]
+            mapping.setdefault(namespace, []).append(mod_info.name)
 
-        UNSET_type_actual = _PlaceholderUnsetType
+    walk(api_path, f"{pkg_name}.api.")
+    return mapping
 
-    sdk_imports: Set[str] = {
-        "from typing import Any, List, Union, Optional, Dict, Tuple, Set, Sequence, Callable, TypeVar, Type",
-        "from pydantic import BaseModel, ConfigDict",
-        f"from {pkg_name}.client import Client as _GeneratedClient",
-        "from uuid import UUID",
-        "import datetime",
-        "import importlib",
-        "import inspect",
-        f"from {pkg_name}.models import *",  # Wildcard import for models
-    }
+
+def inspect_endpoint(
+    module_path: str, pkg_name: str, unset_type: Type[Any]
+) -> Optional[List[EndpointFunction]]:
+    """Imports an endpoint module and describes its `sync`/`asyncio` functions."""
     try:
-        importlib.import_module(f"{pkg_name}.types")
-        sdk_imports.add(f"from {pkg_name}.types import UNSET, Unset, File, Response")
-    except ImportError:
-        print(
-            f"Warning: Could not import from {pkg_name}.types. Built-in File, Unset, UNSET, Response might be missing."
-        )
+        with profile_span("import", module_path):
+            _mod = importlib.import_module(module_path)
+    except ImportError as e:
+        print(f"Warning: Could not import endpoint module {module_path}: {e}")
+        return None
 
-    endpoint_module_imports: Set[str] = set()
-    namespace_class_definitions: List[str] = []
-    client_fields: List[str] = []
-    client_inits: List[str] = []
-    top_level_method_definitions: List[str] = []
+    try:
+        with profile_span("route", module_path):
+            http_method, path = read_endpoint_route(ast.parse(inspect.getsource(_mod)))
+    except (OSError, TypeError, SyntaxError):
+        http_method, path = None, None
 
-    for ns_name, endpoint_module_paths in sorted(ns_map.items()):
-        is_default_namespace = ns_name == "default"
+    functions: List[EndpointFunction] = []
+    for func_type in SCANNED_FUNCTIONS:
+        if not hasattr(_mod, func_type):
+            continue
+        if func_type in PRESENCE_ONLY_FUNCTIONS:
+            functions.append(EndpointFunction(func_type, [], "None", set(), http_method, path))
+            continue
 
-        pascal_ns_name = get_pascal_case(ns_name)
-        ns_class_name = f"_{pascal_ns_name}Namespace"
+        with profile_span("signature", module_path):
+            sig = inspect.signature(getattr(_mod, func_type))
+        imports: Set[str] = set()
+        params: List[EndpointParam] = []
+        with profile_span("annotations", module_path):
+            for p_name, p_obj in sig.parameters.items():
+                if p_name == "client":
+                    continue
+                param_type_str, param_imports = format_type_annotation(
+                    p_obj.annotation, pkg_name
+                )
+                imports.update(param_imports)
+                default: Optional[str] = None
+                if p_obj.default is not inspect.Parameter.empty:
+                    if isinstance(p_obj.default, unset_type):
+                        default = "UNSET"
+                    else:
+                        default = repr(p_obj.default)
+                params.append(EndpointParam(p_name, param_type_str, default))
 
-        if not is_default_namespace:
-            client_fields.append(
-                f"    {ns_name}: Optional[{ns_class_name}] = None"
+            return_type_str, return_imports = format_type_annotation(
+                sig.return_annotation, pkg_name
             )
-            client_inits.append(
-                f"    self.{ns_name} = {ns_class_name}(self._raw)"
+        imports.update(return_imports)
+        functions.append(
+            EndpointFunction(
+                func_type, params, return_type_str, imports, http_method, path
             )
+        )
+    return functions
 
-            current_ns_class_code: List[str] = [
-                f"class {ns_class_name}:",
-                "    _raw: _GeneratedClient",
-                "",
-                "    def __init__(self, raw_client: _GeneratedClient):",
-                "        self._raw = raw_client",
-                "",
-            ]
-        else:
-            current_ns_class_code = top_level_method_definitions
 
-        for endpoint_module_path in sorted(endpoint_module_paths):
-            endpoint_name = endpoint_module_path.split(".")[-1]
-            endpoint_module_alias = f"_ep_{ns_name}_{endpoint_name}"
-            endpoint_module_imports.add(
-                f"import {endpoint_module_path} as {endpoint_module_alias}"
-            )
+class _StaticScanError(Exception):
+    """Raised when a construct can't be resolved without importing the module."""
 
-            try:
-                _mod = importlib.import_module(endpoint_module_path)
-            except ImportError as e:
-                print(
-                    f"Warning: Could not import endpoint module {endpoint_module_path}: {e}"
-                )
+
+# Node types allowed in annotations evaluated by the static scanner.
+_ANNOTATION_NODES = (
+    ast.Expression,
+    ast.Name,
+    ast.Attribute,
+    ast.Subscript,
+    ast.Tuple,
+    ast.List,
+    ast.Constant,
+    ast.Load,
+    ast.BinOp,
+    ast.BitOr,
+)
+
+_T = TypeVar("_T")
+
+
+class _StubBase(Generic[_T]):
+    """Stand-in for client-package classes; subscriptable like `Response[...]`."""
+
+
+def _url_template(node: ast.expr) -> Optional[str]:
+    """Turns the `"url"` expression of `_get_kwargs` back into "/a/{b}" form."""
+    if isinstance(node, ast.Constant) and isinstance(node.value, str):
+        return node.value
+    if (
+        isinstance(node, ast.Call)
+        and isinstance(node.func, ast.Attribute)
+        and node.func.attr == "format"
+    ):
+        return _url_template(node.func.value)
+    if isinstance(node, ast.JoinedStr):
+        parts: List[str] = []
+        for value in node.values:
+            if isinstance(value, ast.Constant):
+                parts.append(str(value.value))
+            elif isinstance(value, ast.FormattedValue) and isinstance(value.value, ast.Name):
+                parts.append(f"{{{value.value.id}}}")
+            else:
+                return None
+        return "".join(parts)
+    return None
+
+
+def read_endpoint_route(tree: ast.Module) -> Tuple[Optional[str], Optional[str]]:
+    """Reads the HTTP method and URL template from an endpoint's `_get_kwargs`."""
+    for node in tree.body:
+        if not (isinstance(node, ast.FunctionDef) and node.name == "_get_kwargs"):
+            continue
+        for child in ast.walk(node):
+            if not isinstance(child, ast.Dict):
                 continue
+            entries = {
+                key.value: value
+                for key, value in zip(child.keys, child.values)
+                if isinstance(key, ast.Constant)
+            }
+            method = entries.get("method")
+            if isinstance(method, ast.Constant) and isinstance(method.value, str):
+                url = entries.get("url")
+                return method.value.lower(), _url_template(url) if url else None
+    return None, None
 
-            for func_type in ["sync", "asyncio"]:
-                if not hasattr(_mod, func_type):
-                    continue
 
-                original_fn = getattr(_mod, func_type)
-                sig = inspect.signature(original_fn)
-                params_list_for_sig: List[str] = []
-                call_args_list: List[str] = ["client=self._raw"]
+def _resolve_relative(module_path: str, level: int, target: Optional[str]) -> str:
+    base = module_path.split(".")[:-level]
+    return ".".join(base + ([target] if target else []))
 
-                for p_name, p_obj in sig.parameters.items():
-                    if p_name == "client":
-                        continue
-                    param_type_str, param_imports_collected = format_type_annotation(
-                        p_obj.annotation, pkg_name
-                    )
-                    sdk_imports.update(param_imports_collected)
-                    param_sig_part = f"{p_name}: {param_type_str}"
-                    if p_obj.default is not inspect.Parameter.empty:
-                        if isinstance(p_obj.default, UNSET_type_actual):
-                            param_sig_part += " = UNSET"
-                        else:
-                            param_sig_part += f" = {p_obj.default!r}"
-                    params_list_for_sig.append(param_sig_part)
-                    call_args_list.append(f"{p_name}={p_name}")
 
-                params_str_for_sig = ", ".join(params_list_for_sig)
-                call_args_str = ", ".join(call_args_list)
-                return_type_str, return_imports_collected = format_type_annotation(
-                    sig.return_annotation, pkg_name
-                )
-                sdk_imports.update(return_imports_collected)
+# One stub per (module, name) so annotations built from them are shared
+# between endpoint modules, like the real classes, and memoize well.
+_stub_classes: Dict[Tuple[str, str], Type[Any]] = {}
 
-                method_signature_parts = ["self"]
-                if params_str_for_sig:
-                    method_signature_parts.append("*")
-                    method_signature_parts.append(params_str_for_sig)
-                method_signature = ", ".join(method_signature_parts)
 
-                method_name = endpoint_name
-                if func_type == "asyncio":
-                    method_name += "_async"
-                    current_ns_class_code.append(
-                        f"async def {method_name}({method_signature}) -> {return_type_str}:"
-                    )
-                    current_ns_class_code.append(
-                        f"    return await {endpoint_module_alias}.{func_type}({call_args_str})"
-                    )
+def _stub_class(name: str, module: str) -> Type[Any]:
+    stub = _stub_classes.get((module, name))
+    if stub is None:
+        # Generic itself, so annotations such as `Response[...]` resolve.
+        stub = _stub_classes[(module, name)] = new_class(
+            name,
+            (_StubBase[_T],),
+            exec_body=lambda body: body.update(__module__=module, __qualname__=name),
+        )
+    return stub
+
+
+def _module_source_path(pkg_dir: Path, pkg_name: str, module: str) -> Optional[Path]:
+    rel_parts = module.split(".")[len(pkg_name.split(".")) :]
+    candidate = pkg_dir.joinpath(*rel_parts)
+    for path in (candidate.with_suffix(".py"), candidate / "__init__.py"):
+        if path.is_file():
+            return path
+    return None
+
+
+def _enum_member_repr(
+    pkg_dir: Path, pkg_name: str, module: str, class_name: str, member: str
+) -> str:
+    """Rebuilds ``repr(Enum.MEMBER)`` by reading the enum's class body."""
+    source_path = _module_source_path(pkg_dir, pkg_name, module)
+    if source_path is None:
+        raise _StaticScanError(f"no source for {module}")
+    tree = ast.parse(source_path.read_text(encoding="utf-8"))
+    for node in tree.body:
+        if not (isinstance(node, ast.ClassDef) and node.name == class_name):
+            continue
+        base_names = {getattr(b, "id", getattr(b, "attr", None)) for b in node.bases}
+        if "Enum" not in base_names:
+            break
+        for stmt in node.body:
+            if (
+                isinstance(stmt, ast.Assign)
+                and len(stmt.targets) == 1
+                and isinstance(stmt.targets[0], ast.Name)
+                and stmt.targets[0].id == member
+            ):
+                return f"<{class_name}.{member}: {ast.literal_eval(stmt.value)!r}>"
+    raise _StaticScanError(f"cannot resolve {class_name}.{member}")
+
+
+def scan_endpoint_source(
+    source_path: str, module_path: str, pkg_name: str, pkg_dir: str
+) -> Optional[List[EndpointFunction]]:
+    """
+    Describes an endpoint module's `sync`/`asyncio` functions from its source.
+
+    Annotations are evaluated against real `typing`/stdlib objects and stub
+    classes carrying the client package's module paths, so `format_type_annotation`
+    sees exactly what `inspect.signature` would have given it. Returns None when
+    the module uses something that can only be answered by importing it.
+    """
+    tree = ast.parse(Path(source_path).read_text(encoding="utf-8"), source_path)
+    namespace: Dict[str, Any] = dict(vars(builtins))
+    stub_origins: Dict[str, str] = {}
+    try:
+        for node in tree.body:
+            if isinstance(node, ast.ImportFrom):
+                if node.level:
+                    source_module = _resolve_relative(module_path, node.level, node.module)
                 else:
-                    current_ns_class_code.append(
-                        f"def {method_name}({method_signature}) -> {return_type_str}:"
-                    )
-                    current_ns_class_code.append(
-                        f"    return {endpoint_module_alias}.{func_type}({call_args_str})"
-                    )
-                current_ns_class_code.append("")
+                    source_module = node.module or ""
+                for alias in node.names:
+                    local_name = alias.asname or alias.name
+                    if source_module.split(".")[0] in sys.stdlib_module_names:
+                        source = importlib.import_module(source_module)
+                        if hasattr(source, alias.name):
+                            namespace[local_name] = getattr(source, alias.name)
+                    elif source_module == pkg_name or source_module.startswith(
+                        f"{pkg_name}."
+                    ):
+                        namespace[local_name] = _stub_class(alias.name, source_module)
+                        stub_origins[local_name] = source_module
+            elif isinstance(node, ast.Import):
+                for alias in node.names:
+                    if alias.name.split(".")[0] in sys.stdlib_module_names:
+                        top = alias.name.split(".")[0]
+                        module = importlib.import_module(alias.name)
+                        namespace[alias.asname or top] = (
+                            module if alias.asname else sys.modules[top]
+                        )
 
-        if not is_default_namespace:
-            if current_ns_class_code and not current_ns_class_code[-1] == "":
-                current_ns_class_code.append("")
-            namespace_class_definitions.append("\n".join(current_ns_class_code))
+        http_method, path = read_endpoint_route(tree)
+        functions_by_type: Dict[str, ast.AST] = {}
+        for node in tree.body:
+            node_type = SCANNED_FUNCTIONS.get(getattr(node, "name", ""))
+            if node_type is not None and type(node) is node_type:
+                functions_by_type[node.name] = node  # type: ignore[attr-defined]
 
-    if top_level_method_definitions and top_level_method_definitions[-1] != "":
-        top_level_method_definitions.append("")
+        def evaluate(expr: Optional[ast.expr]) -> Any:
+            if expr is None:
+                return inspect.Signature.empty
+            wrapped = ast.Expression(expr)
+            if not all(isinstance(n, _ANNOTATION_NODES) for n in ast.walk(wrapped)):
+                raise _StaticScanError(ast.dump(expr))
+            try:
+                return eval(compile(wrapped, source_path, "eval"), namespace)
+            except Exception as e:
+                raise _StaticScanError(str(e)) from e
 
-    has_specific_typing_import = any(
-        imp.startswith("from typing import ") and "Any" not in imp
-        for imp in sdk_imports
-    )
-    is_any_explicitly_used_in_ns = any(
-        "-> Any" in line or ": Any" in line
-        for ns_class_def in namespace_class_definitions
-        for line in ns_class_def.splitlines()
-    )
-    is_any_explicitly_used_in_top = any(
-        "-> Any" in line or ": Any" in line for line in top_level_method_definitions
-    )
-    is_any_explicitly_used = (
-        is_any_explicitly_used_in_ns or is_any_explicitly_used_in_top
-    )
+        def render_default(expr: ast.expr) -> str:
+            if isinstance(expr, ast.Name) and expr.id == "UNSET":
+                return "UNSET"
+            if (
+                isinstance(expr, ast.Attribute)
+                and isinstance(expr.value, ast.Name)
+                and expr.value.id in stub_origins
+            ):
+                return _enum_member_repr(
+                    Path(pkg_dir),
+                    pkg_name,
+                    stub_origins[expr.value.id],
+                    expr.value.id,
+                    expr.attr,
+                )
+            try:
+                return repr(ast.literal_eval(expr))
+            except ValueError as e:
+                raise _StaticScanError(ast.dump(expr)) from e
 
-    if (
-        has_specific_typing_import
-        and "from typing import Any" in sdk_imports
-        and not is_any_explicitly_used
-    ):
-        sdk_imports.discard("from typing import Any")
+        functions: List[EndpointFunction] = []
+        for func_type in SCANNED_FUNCTIONS:
+            if func_type not in functions_by_type:
+                continue
+            if func_type in PRESENCE_ONLY_FUNCTIONS:
+                functions.append(EndpointFunction(func_type, [], "None", set(), http_method, path))
+                continue
+            fn_args = functions_by_type[func_type].args  # type: ignore[attr-defined]
+            if fn_args.vararg or fn_args.kwarg:
+                raise _StaticScanError("variadic parameters")
+            positional = fn_args.posonlyargs + fn_args.args
+            positional_defaults: List[Optional[ast.expr]] = [None] * (
+                len(positional) - len(fn_args.defaults)
+            ) + list(fn_args.defaults)
+            arg_defaults = list(zip(positional, positional_defaults)) + list(
+                zip(fn_args.kwonlyargs, fn_args.kw_defaults)
+            )
 
-    sorted_sdk_imports = sorted(
-        list(sdk_imports),
-        key=lambda x: (not x.startswith("from typing"), x.startswith("from "), x),
-    )
+            imports: Set[str] = set()
+            params: List[EndpointParam] = []
+            for arg, default_expr in arg_defaults:
+                if arg.arg == "client":
+                    continue
+                param_type_str, param_imports = format_type_annotation(
+                    evaluate(arg.annotation), pkg_name
+                )
+                imports.update(param_imports)
+                default = render_default(default_expr) if default_expr else None
+                params.append(EndpointParam(arg.arg, param_type_str, default))
 
-    code_parts = [
-        "\n".join(sorted_sdk_imports),
-        "\n",
-        "\n".join(sorted(list(endpoint_module_imports))),
-        "\n\n",
-        "\n\n".join(namespace_class_definitions),
-        "\n",
-        f"class {sdk_class_name}(BaseModel):",
-        "    model_config = ConfigDict(arbitrary_types_allowed=True)",
-        "",
-        "    base_url: str",
-    ]
-    code_parts.extend(client_fields)
-    code_parts.extend(
-        ["", "    def __init__(self, **data: Any):", "        super().__init__(**data)"]
-    )
-    code_parts.append(f"        self._raw = _GeneratedClient(base_url=self.base_url)")
-    code_parts.extend(client_inits)
+            return_type_str, return_imports = format_type_annotation(
+                evaluate(functions_by_type[func_type].returns), pkg_name  # type: ignore[attr-defined]
+            )
+            imports.update(return_imports)
+            functions.append(
+                EndpointFunction(
+                    func_type, params, return_type_str, imports, http_method, path
+                )
+            )
+        return functions
+    except (_StaticScanError, ImportError, SyntaxError, ValueError):
+        return None
 
-    if top_level_method_definitions:
-        # Ensure methods are indented correctly within the class
-        indented_top_level_methods = [""]  # Start with a newline for separation
-        for line in "\n".join(top_level_method_definitions).splitlines():
-            indented_top_level_methods.append(f"    {line}" if line.strip() else "")
-        code_parts.extend(indented_top_level_methods)
 
-    code_parts.extend(
-        [
-            "\n",
-            SDK_TEST_CODE_TEMPLATE.format(pkg_name=pkg_name, sdk_class=sdk_class_name),
-        ]
-    )
-    return "\n".join(code_parts)
+def _scan_endpoint_task(
+    task: Tuple[str, str, str, str]
+) -> Tuple[str, Optional[List[EndpointFunction]], AnnotationCacheStats]:
+    # Reports this task's memo lookups so the parent can add up worker stats.
+    before = (annotation_cache_stats.hits, annotation_cache_stats.misses)
+    with profile_span("parse", task[1]):
+        functions = scan_endpoint_source(*task)
+    stats = AnnotationCacheStats()
+    stats.hits = annotation_cache_stats.hits - before[0]
+    stats.misses = annotation_cache_stats.misses - before[1]
+    return task[1], functions, stats
 
 
-def main() -> None:
-    p = argparse.ArgumentParser(description="Generate an SDK wrapper.")
-    p.add_argument(
-        "--package", required=True, help="root package name of the generated client"
-    )
-    p.add_argument(
-        "--output", required=True, help="target .py file for the SDK wrapper"
-    )
-    p.add_argument("--class-name", default="WraperClient", help="wrapper class name")
-    args = p.parse_args()
-    code = render_wrapper(pkg_name=args.package, sdk_class_name=args.class_name)
-    Path(args.output).write_text(code)
-    print(f"✅  Wrote '{args.output}' with class '{args.class_name}'")
+def scan_endpoints(
+    module_paths: List[str], pkg_name: str, jobs: Optional[int] = None
+) -> Dict[str, Optional[List[EndpointFunction]]]:
+    """
+    Statically scans endpoint modules, spreading the work over `jobs` processes.
+
+    Modules the scanner can't resolve on its own fall back to `inspect_endpoint`,
+    so the result is always what the import-based path would produce.
+    """
+    pkg_dir = find_package_dir(pkg_name)
+    results: Dict[str, Optional[List[EndpointFunction]]] = {}
+    tasks: List[Tuple[str, str, str, str]] = []
+    for module_path in module_paths:
+        source = (
+            _module_source_path(pkg_dir, pkg_name, module_path) if pkg_dir else None
+        )
+        if source is None:
+            results[module_path] = None
+        else:
+            tasks.append((str(source), module_path, pkg_name, str(pkg_dir)))
+
+    jobs = jobs or os.cpu_count() or 1
+    if jobs > 1 and len(tasks) > PARALLEL_SCAN_THRESHOLD:
+        with concurrent.futures.ProcessPoolExecutor(max_workers=jobs) as pool:
+            chunksize = max(1, len(tasks) // (jobs * 4))
+            for module_path, functions, stats in pool.map(
+                _scan_endpoint_task, tasks, chunksize=chunksize
+            ):
+                results[module_path] = functions
+                annotation_cache_stats.merge(stats)
+    else:
+        for module_path, functions, _ in map(_scan_endpoint_task, tasks):
+            results[module_path] = functions
+
+    fallbacks = [path for path, functions in results.items() if functions is None]
+    if fallbacks:
+        unset_type = _load_unset_type(pkg_name)
+        for module_path in sorted(fallbacks):
+            results[module_path] = inspect_endpoint(module_path, pkg_name, unset_type)
+    return results
+
+
+def _load_unset_type(pkg_name: str) -> Type[Any]:
+    try:
+        _client_types_module = importlib.import_module(f"{pkg_name}.types")
+        UNSET_object = getattr(_client_types_module, "UNSET")
+        return type(UNSET_object)
+    except (ImportError, AttributeError):
+
+        class _PlaceholderUnsetType:
+            pass
+
+        return _PlaceholderUnsetType
+
+
+class PackageScan(NamedTuple):
+    """Everything the renderer needs to know about a client package."""
+
+    ns_map: Dict[str, List[str]]
+    endpoints: Dict[str, Optional[List[EndpointFunction]]]
+    has_types_module: bool
+    source_hashes: Dict[str, str]
+
+
+def hash_endpoint_sources(pkg_name: str, module_paths: List[str]) -> Dict[str, str]:
+    """SHA-256 of each endpoint module's source; modules without a file are left out."""
+    pkg_dir = find_package_dir(pkg_name)
+    hashes: Dict[str, str] = {}
+    if pkg_dir is None:
+        return hashes
+    for module_path in module_paths:
+        source = _module_source_path(pkg_dir, pkg_name, module_path)
+        if source is not None:
+            hashes[module_path] = hashlib.sha256(source.read_bytes()).hexdigest()
+    return hashes
+
+
+def scan_package(
+    pkg_name: str,
+    static: bool = False,
+    jobs: Optional[int] = None,
+    cache: Optional[Dict[str, Any]] = None,
+) -> PackageScan:
+    """
+    Collects namespaces and endpoint signatures for a client package.
+
+    With `static=True` endpoint modules are parsed instead of imported (see
+    `scan_endpoints`); the result is identical either way. `cache` is the
+    "operations" table of a previous manifest: endpoints whose source hash is
+    unchanged are taken from it instead of being scanned again.
+
+    Each call starts a fresh `format_type_annotation` memo; its counters are
+    in `annotation_cache_stats` afterwards.
+    """
+    reset_annotation_cache()
+    with profile_span("collect namespaces"):
+        ns_map = collect_namespaces_static(pkg_name) if static else collect_namespaces(pkg_name)
+    if not ns_map:
+        print(
+            f"Warning: No API namespaces found for package '{pkg_name}'. Generated SDK will be minimal."
+        )
+
+    all_module_paths = sorted(path for paths in ns_map.values() for path in paths)
+    with profile_span("hash sources"):
+        source_hashes = hash_endpoint_sources(pkg_name, all_module_paths)
+    endpoints: Dict[str, Optional[List[EndpointFunction]]] = {}
+    for module_path, entry in (cache or {}).items():
+        if module_path in source_hashes and entry.get("sha256") == source_hashes[module_path]:
+            endpoints[module_path] = endpoint_functions_from_json(entry["functions"])
+    module_paths_to_scan = [path for path in all_module_paths if path not in endpoints]
+    if cache is not None:
+        print(
+            f"Reusing {len(endpoints)} of {len(all_module_paths)} operations from the manifest."
+        )
+
+    if static:
+        with profile_span("scan endpoints"):
+            endpoints.update(scan_endpoints(module_paths_to_scan, pkg_name, jobs))
+        pkg_dir = find_package_dir(pkg_name)
+        has_types_module = bool(
+            pkg_dir and _module_source_path(pkg_dir, pkg_name, f"{pkg_name}.types")
+        )
+    else:
+        unset_type = _load_unset_type(pkg_name)
+        with profile_span("scan endpoints"):
+            for path in module_paths_to_scan:
+                with profile_span("scan", path):
+                    endpoints[path] = inspect_endpoint(path, pkg_name, unset_type)
+        try:
+            importlib.import_module(f"{pkg_name}.types")
+            has_types_module = True
+        except ImportError:
+            has_types_module = False
+    if not has_types_module:
+        print(
+            f"Warning: Could not import from {pkg_name}.types. Built-in File, Unset, UNSET, Response might be missing."
+        )
+    return PackageScan(ns_map, endpoints, has_types_module, source_hashes)
+
+
+# Bump when the manifest layout or the meaning of cached entries changes.
+MANIFEST_VERSION = 4
+
+
+def file_sha256(path: Path) -> str:
+    return hashlib.sha256(path.read_bytes()).hexdigest()
+
+
+def endpoint_functions_to_json(functions: List[EndpointFunction]) -> List[Dict[str, Any]]:
+    return [
+        {
+            "func_type": function.func_type,
+            "params": [list(param) for param in function.params],
+            "return_annotation": function.return_annotation,
+            "imports": sorted(function.imports),
+            "http_method": function.http_method,
+            "path": function.path,
+        }
+        for function in functions
+    ]
+
+
+def endpoint_functions_from_json(data: List[Dict[str, Any]]) -> List[EndpointFunction]:
+    return [
+        EndpointFunction(
+            item["func_type"],
+            [EndpointParam(*param) for param in item["params"]],
+            item["return_annotation"],
+            set(item["imports"]),
+            item.get("http_method"),
+            item.get("path"),
+        )
+        for item in data
+    ]
+
+
+def generator_fingerprint(**options: Any) -> str:
+    """Identifies this generator version plus the options that shape its output."""
+    digest = hashlib.sha256(Path(__file__).read_bytes())
+    digest.update(repr((MANIFEST_VERSION, sorted(options.items()))).encode())
+    return digest.hexdigest()
+
+
+def load_manifest(path: Path, fingerprint: str) -> Dict[str, Any]:
+    """Reads a generation manifest; one written by another generator/options is ignored."""
+    try:
+        manifest = json.loads(path.read_text())
+    except (OSError, ValueError):
+        return {}
+    if not isinstance(manifest, dict) or manifest.get("generator") != fingerprint:
+        return {}
+    return manifest
+
+
+def build_manifest(
+    fingerprint: str,
+    scan: PackageScan,
+    outputs: List[Path],
+    spec_sha256: Optional[str] = None,
+) -> Dict[str, Any]:
+    operations = {
+        module_path: {
+            "sha256": scan.source_hashes[module_path],
+            "functions": endpoint_functions_to_json(functions),
+        }
+        for module_path, functions in sorted(scan.endpoints.items())
+        if functions is not None and module_path in scan.source_hashes
+    }
+    return {
+        "version": MANIFEST_VERSION,
+        "generator": fingerprint,
+        "spec_sha256": spec_sha256,
+        "outputs": {path.name: file_sha256(path) for path in outputs},
+        "operations": operations,
+    }
+
+
+def manifest_is_current(
+    manifest: Dict[str, Any], outputs: List[Path], spec_sha256: Optional[str]
+) -> bool:
+    """True when the spec is unchanged and every output is still what we wrote."""
+    if not manifest or spec_sha256 is None or manifest.get("spec_sha256") != spec_sha256:
+        return False
+    recorded = manifest.get("outputs", {})
+    return all(
+        path.is_file() and recorded.get(path.name) == file_sha256(path)
+        for path in outputs
+    )
+
+
+LAZY_LOADER_TEMPLATE = """
+_MODELS_MODULE = "{pkg_name}.models"
+_LAZY_ENDPOINTS: Dict[str, str] = {{
+{endpoint_entries}
+}}
+
+
+def __getattr__(name: str) -> Any:
+    # Endpoint modules and models are imported on first use only.
+    module_path = _LAZY_ENDPOINTS.get(name)
+    if module_path is not None:
+        value = importlib.import_module(module_path)
+    else:
+        try:
+            value = getattr(importlib.import_module(_MODELS_MODULE), name)
+        except AttributeError:
+            raise AttributeError(f"module {{__name__!r}} has no attribute {{name!r}}") from None
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> List[str]:
+    models = importlib.import_module(_MODELS_MODULE)
+    return sorted(set(globals()) | set(getattr(models, "__all__", ())))
+
+
+def _endpoint(alias: str) -> Any:
+    return globals().get(alias) or __getattr__(alias)
+
+
+class _LazyNamespace:
+    \"\"\"Creates a client's namespace object the first time it is accessed.\"\"\"
+
+    def __init__(self, namespace_cls: Any):
+        self._namespace_cls = namespace_cls
+        self._name = ""
+
+    def __set_name__(self, owner: Any, name: str) -> None:
+        self._name = name
+
+    def __get__(self, instance: Any, owner: Any = None) -> Any:
+        if instance is None:
+            return self
+        namespace = self._namespace_cls(instance)
+        instance.__dict__[self._name] = namespace
+        return namespace
+
+"""
+
+
+SDK_TRANSPORT_TEMPLATE = """
+class _PooledClient(_GeneratedClient):
+    \"\"\"The generated client, handing out the async pool of the running event loop.\"\"\"
+
+    _pool: "_PooledTransport"
+
+    def get_async_httpx_client(self) -> httpx.AsyncClient:
+        return self._pool.async_client()
+
+
+def _close_on_loop(loop: asyncio.AbstractEventLoop, client: httpx.AsyncClient) -> None:
+    # A closed loop took its connections with it; a running one closes the client soon.
+    if loop.is_closed():
+        return
+    if loop.is_running():
+        asyncio.run_coroutine_threadsafe(client.aclose(), loop)
+        return
+    try:
+        loop.run_until_complete(client.aclose())
+    except RuntimeError:  # another loop is running in this thread
+        pass
+
+
+class _PooledTransport:
+    \"\"\"
+    A generated client plus the httpx clients behind it, shared process-wide.
+
+    Wrapper instances created with the same base URL and transport options
+    reuse one connection pool; it is closed when the last of them closes.
+    Async connections belong to an event loop, so each loop gets its own
+    async pool (over the same cache, retry and other state); pools of loops
+    that have closed are dropped.
+    \"\"\"
+
+    _lock = threading.Lock()
+    _shared: Dict[Tuple[Any, ...], "_PooledTransport"] = {{}}
+
+    def __init__(self, key: Optional[Tuple[Any, ...]], base_url: str, options: Dict[str, Any]):
+        self.key = key
+        self.refcount = 0
+        limits = httpx.Limits(
+            max_connections=options["max_connections"],
+            max_keepalive_connections=options["max_keepalive_connections"],
+            keepalive_expiry=options["keepalive_expiry"],
+        )
+        self.transport_args: Dict[str, Any] = dict(
+            verify=options["verify_ssl"], limits=limits, http2=options["http2"]
+        )
+        # (sync layer or None, async layer, extra arguments), innermost first.
+        self.layers: List[Tuple[Any, Any, Tuple[Any, ...]]] = []{transport_layers}
+        self.client_args: Dict[str, Any] = dict(
+            base_url=base_url, headers=options["headers"], timeout=options["timeout"]
+        )
+        transport: httpx.BaseTransport = httpx.HTTPTransport(**self.transport_args)
+        for layer, _, args in self.layers:
+            if layer is not None:
+                transport = layer(transport, *args)
+        self.http_client = httpx.Client(transport=transport, **self.client_args)
+        self.async_http_clients: Dict[asyncio.AbstractEventLoop, httpx.AsyncClient] = {{}}
+        self.raw = _PooledClient(base_url=base_url)
+        self.raw._pool = self
+        self.raw.set_httpx_client(self.http_client)
+
+    def async_client(self) -> httpx.AsyncClient:
+        \"\"\"The async client of the running event loop, created on its first call.\"\"\"
+        loop = asyncio.get_running_loop()
+        client = self.async_http_clients.get(loop)
+        if client is not None:
+            return client
+        with self._lock:
+            for stale in [other for other in self.async_http_clients if other.is_closed()]:
+                del self.async_http_clients[stale]
+            client = self.async_http_clients.get(loop)
+            if client is None:
+                transport: httpx.AsyncBaseTransport = httpx.AsyncHTTPTransport(**self.transport_args)
+                for _, layer, args in self.layers:
+                    transport = layer(transport, *args)
+                client = self.async_http_clients[loop] = httpx.AsyncClient(
+                    transport=transport, **self.client_args
+                )
+            return client
+
+    @classmethod
+    def acquire(cls, base_url: str, share_pool: bool, **options: Any) -> "_PooledTransport":
+        if not share_pool:
+            transport = cls(None, base_url, options)
+            transport.refcount = 1
+            return transport
+        key = (base_url,) + tuple(sorted((name, repr(value)) for name, value in options.items()))
+        with cls._lock:
+            transport = cls._shared.get(key)
+            if transport is None:
+                transport = cls._shared[key] = cls(key, base_url, options)
+            transport.refcount += 1
+            return transport
+
+    def _release(self) -> Optional[List[Tuple[asyncio.AbstractEventLoop, httpx.AsyncClient]]]:
+        \"\"\"Drops one reference; the async clients to close when it was the last, else None.\"\"\"
+        with self._lock:
+            self.refcount -= 1
+            if self.refcount > 0:
+                return None
+            if self.key is not None and self._shared.get(self.key) is self:
+                del self._shared[self.key]
+            clients = list(self.async_http_clients.items())
+            self.async_http_clients.clear()
+            return clients
+
+    def release(self) -> None:
+        clients = self._release()
+        if clients is not None:
+            self.http_client.close()
+            for loop, client in clients:
+                _close_on_loop(loop, client)
+
+    async def arelease(self) -> None:
+        clients = self._release()
+        if clients is not None:
+            self.http_client.close()
+            current = asyncio.get_running_loop()
+            for loop, client in clients:
+                if loop is current:
+                    await client.aclose()
+                else:
+                    _close_on_loop(loop, client)
+
+"""
+
+SDK_CACHE_ENTRY_TEMPLATE = """
+class _CacheEntry:
+    __slots__ = ("status_code", "headers", "content", "etag", "last_modified", "expires_at")
+
+    def __init__(self, response: httpx.Response, expires_at: float):
+        self.status_code = response.status_code
+        self.headers = [
+            (name, value)
+            for name, value in response.headers.multi_items()
+            if name.lower() not in ("content-encoding", "content-length", "transfer-encoding")
+        ]
+        self.content = response.content
+        self.etag = response.headers.get("etag")
+        self.last_modified = response.headers.get("last-modified")
+        self.expires_at = expires_at
+
+    def to_response(self, request: httpx.Request) -> httpx.Response:
+        return httpx.Response(self.status_code, headers=self.headers, content=self.content, request=request)
+
+"""
+
+SDK_CACHE_TEMPLATE = """
+class _ResponseCache:
+    \"\"\"
+    In-memory LRU of GET responses for the API's cacheable operations.
+
+    Entries live for `ttl` seconds or the response's `Cache-Control: max-age`,
+    whichever is shorter; `no-store` responses are never kept. Stale entries
+    with an ETag or Last-Modified are revalidated with a conditional request.
+    \"\"\"
+
+    def __init__(self, base_url: str, ttl: float, maxsize: int, operations: Optional[Sequence[str]]):
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self._base_path = httpx.URL(base_url).path.rstrip("/")
+        names = _CACHEABLE_ROUTES if operations is None else operations
+        self._routes = [re.compile(_CACHEABLE_ROUTES[name]) for name in names]
+        self._entries: "OrderedDict[Tuple[str, str], _CacheEntry]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = self.misses = self.revalidations = self.evictions = 0
+
+    def cacheable(self, request: httpx.Request) -> bool:
+        if request.method != "GET":
+            return False
+        path = request.url.path
+        if not path.startswith(self._base_path):
+            return False
+        path = path[len(self._base_path):] or "/"
+        return any(route.fullmatch(path) for route in self._routes)
+
+    def _ttl_for(self, response: httpx.Response) -> Optional[float]:
+        directives = [d.strip().lower() for d in response.headers.get("cache-control", "").split(",")]
+        if "no-store" in directives:
+            return None
+        if "no-cache" in directives:
+            return 0.0
+        for directive in directives:
+            if directive.startswith("max-age="):
+                try:
+                    return min(self.ttl, float(directive[len("max-age="):]))
+                except ValueError:
+                    break
+        return self.ttl
+
+    def before(self, request: httpx.Request) -> Tuple[Any, Optional[_CacheEntry], Optional[httpx.Response]]:
+        \"\"\"Returns (key, stale entry, cached response); adds validators to `request` when stale.\"\"\"
+        key = (str(request.url), request.headers.get("authorization", ""))
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                if entry.expires_at > time.monotonic():
+                    self.hits += 1
+                    return key, entry, entry.to_response(request)
+        if entry is not None:
+            if entry.etag:
+                request.headers["If-None-Match"] = entry.etag
+            if entry.last_modified:
+                request.headers["If-Modified-Since"] = entry.last_modified
+        return key, entry, None
+
+    def after(self, key: Any, entry: Optional[_CacheEntry], request: httpx.Request, response: httpx.Response) -> httpx.Response:
+        \"\"\"Records a fully read upstream response and returns what the caller should see.\"\"\"
+        ttl = self._ttl_for(response)
+        with self._lock:
+            if response.status_code == 304 and entry is not None:
+                self.revalidations += 1
+                entry.expires_at = time.monotonic() + (self.ttl if ttl is None else ttl)
+                return entry.to_response(request)
+            self.misses += 1
+            if response.status_code != 200 or ttl is None:
+                self._entries.pop(key, None)
+                return response
+            self._entries[key] = _CacheEntry(response, time.monotonic() + ttl)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+        return response
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {{
+                "hits": self.hits,
+                "misses": self.misses,
+                "revalidations": self.revalidations,
+                "evictions": self.evictions,
+                "size": len(self._entries),
+            }}
+
+
+class _CachingTransport(httpx.BaseTransport):
+    def __init__(self, inner: httpx.BaseTransport, cache: _ResponseCache):
+        self.inner = inner
+        self.cache = cache
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        if not self.cache.cacheable(request):
+            return self.inner.handle_request(request)
+        key, entry, cached = self.cache.before(request)
+        if cached is not None:
+            return cached
+        response = self.inner.handle_request(request)
+        response.read()
+        return self.cache.after(key, entry, request, response)
+
+    def close(self) -> None:
+        self.inner.close()
+
+
+class _AsyncCachingTransport(httpx.AsyncBaseTransport):
+    def __init__(self, inner: httpx.AsyncBaseTransport, cache: _ResponseCache):
+        self.inner = inner
+        self.cache = cache
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        if not self.cache.cacheable(request):
+            return await self.inner.handle_async_request(request)
+        key, entry, cached = self.cache.before(request)
+        if cached is not None:
+            return cached
+        response = await self.inner.handle_async_request(request)
+        await response.aread()
+        return self.cache.after(key, entry, request, response)
+
+    async def aclose(self) -> None:
+        await self.inner.aclose()
+
+"""
+
+CACHE_TRANSPORT_LAYER = """
+        self.cache: Optional[_ResponseCache] = None
+        if options["cache"]:
+            self.cache = _ResponseCache(
+                base_url, options["cache_ttl"], options["cache_maxsize"], options["cache_operations"]
+            )
+            self.layers.append((_CachingTransport, _AsyncCachingTransport, (self.cache,)))"""
+
+CLIENT_CACHE_METHODS = """
+    @property
+    def cache_stats(self) -> Optional[Dict[str, int]]:
+        \"\"\"Hit/miss counters of the response cache (shared by pooled clients), or None.\"\"\"
+        cache = self._transport.cache if self._transport is not None else None
+        return cache.stats() if cache is not None else None
+
+    def clear_cache(self) -> None:
+        if self._transport is not None and self._transport.cache is not None:
+            self._transport.cache.clear()
+"""
+CLIENT_CACHE_SIGNATURES = [
+    "@property",
+    "def cache_stats(self) -> Optional[Dict[str, int]]:",
+    "def clear_cache(self) -> None:",
+]
+
+SDK_COALESCE_TEMPLATE = """
+class _Flight:
+    __slots__ = ("event", "future", "entry", "error")
+
+    def __init__(self, future: "Optional[asyncio.Future[None]]" = None):
+        self.event = threading.Event() if future is None else None
+        self.future = future
+        self.entry: Optional[_CacheEntry] = None
+        self.error: Optional[BaseException] = None
+
+    def response(self, request: httpx.Request) -> httpx.Response:
+        if self.error is not None:
+            # A copy per waiter, so concurrent raises don't share one traceback.
+            try:
+                error = copy.copy(self.error)
+            except Exception:
+                raise self.error
+            raise error from self.error
+        assert self.entry is not None
+        return self.entry.to_response(request)
+
+
+class _SingleFlight:
+    \"\"\"
+    Collapses identical in-flight GETs into one upstream request.
+
+    Only the API's cacheable operations take part (or `operations`, a subset
+    of them). Two calls are identical when their URL, and therefore the
+    operation and its path and query arguments, and their headers match.
+    Waiting calls get their own copy of the leader's response, or of its
+    exception (chained to it). Sync calls wait on other threads; async ones on their own loop.
+    \"\"\"
+
+    def __init__(self, base_url: str, operations: Optional[Sequence[str]]):
+        self._base_path = httpx.URL(base_url).path.rstrip("/")
+        names = _CACHEABLE_ROUTES if operations is None else operations
+        self._routes = [(name, re.compile(_CACHEABLE_ROUTES[name])) for name in names]
+        self._flights: Dict[Tuple[Any, ...], _Flight] = {{}}
+        self._counts: Dict[str, List[int]] = {{}}  # operation -> [upstream, collapsed]
+        self._lock = threading.Lock()
+
+    def operation(self, request: httpx.Request) -> Optional[str]:
+        if request.method != "GET":
+            return None
+        path = request.url.path
+        if not path.startswith(self._base_path):
+            return None
+        path = path[len(self._base_path):] or "/"
+        for name, route in self._routes:
+            if route.fullmatch(path):
+                return name
+        return None
+
+    def join(self, request: httpx.Request, operation: str, loop: Optional[asyncio.AbstractEventLoop] = None) -> Tuple[Tuple[Any, ...], _Flight, bool]:
+        \"\"\"Returns (key, flight, is_leader); the leader must call `finish`.\"\"\"
+        key = (id(loop), str(request.url), tuple(sorted(request.headers.multi_items())))
+        with self._lock:
+            counts = self._counts.setdefault(operation, [0, 0])
+            flight = self._flights.get(key)
+            if flight is not None:
+                counts[1] += 1
+                return key, flight, False
+            counts[0] += 1
+            flight = self._flights[key] = _Flight(None if loop is None else loop.create_future())
+            return key, flight, True
+
+    def finish(self, key: Tuple[Any, ...], flight: _Flight, response: Optional[httpx.Response], error: Optional[BaseException]) -> None:
+        if response is not None:
+            flight.entry = _CacheEntry(response, 0.0)
+        flight.error = error
+        with self._lock:
+            if self._flights.get(key) is flight:
+                del self._flights[key]
+        if flight.event is not None:
+            flight.event.set()
+        elif isinstance(error, asyncio.CancelledError):
+            flight.future.cancel()  # waiters retry on their own
+        elif not flight.future.done():
+            flight.future.set_result(None)
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        with self._lock:
+            return {{
+                operation: {{"upstream": upstream, "collapsed": collapsed}}
+                for operation, (upstream, collapsed) in sorted(self._counts.items())
+            }}
+
+
+class _CoalescingTransport(httpx.BaseTransport):
+    def __init__(self, inner: httpx.BaseTransport, flights: _SingleFlight):
+        self.inner = inner
+        self.flights = flights
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        operation = self.flights.operation(request)
+        if operation is None:
+            return self.inner.handle_request(request)
+        key, flight, leader = self.flights.join(request, operation)
+        if not leader:
+            flight.event.wait()
+            return flight.response(request)
+        response = None
+        error: Optional[BaseException] = None
+        try:
+            response = self.inner.handle_request(request)
+            response.read()
+            return response
+        except BaseException as e:
+            error = e
+            raise
+        finally:
+            self.flights.finish(key, flight, response if error is None else None, error)
+
+    def close(self) -> None:
+        self.inner.close()
+
+
+class _AsyncCoalescingTransport(httpx.AsyncBaseTransport):
+    def __init__(self, inner: httpx.AsyncBaseTransport, flights: _SingleFlight):
+        self.inner = inner
+        self.flights = flights
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        operation = self.flights.operation(request)
+        if operation is None:
+            return await self.inner.handle_async_request(request)
+        while True:
+            key, flight, leader = self.flights.join(request, operation, asyncio.get_running_loop())
+            if leader:
+                break
+            # Not `await flight.future`: cancelling this waiter must not cancel the others.
+            await asyncio.wait([flight.future])
+            if not flight.future.cancelled():
+                return flight.response(request)
+        response = None
+        error: Optional[BaseException] = None
+        try:
+            response = await self.inner.handle_async_request(request)
+            await response.aread()
+            return response
+        except BaseException as e:
+            error = e
+            raise
+        finally:
+            self.flights.finish(key, flight, response if error is None else None, error)
+
+    async def aclose(self) -> None:
+        await self.inner.aclose()
+
+
+"""
+
+COALESCE_TRANSPORT_LAYER = """
+        self.single_flight: Optional[_SingleFlight] = None
+        if options["coalesce"]:
+            # Outermost, so collapsed calls skip the rate limiter and retries too.
+            self.single_flight = _SingleFlight(base_url, options["coalesce_operations"])
+            self.layers.append((_CoalescingTransport, _AsyncCoalescingTransport, (self.single_flight,)))"""
+
+CLIENT_COALESCE_METHODS = """
+    @property
+    def coalesce_stats(self) -> Optional[Dict[str, Dict[str, int]]]:
+        \"\"\"Per-operation upstream requests and calls collapsed into them, or None.\"\"\"
+        single_flight = self._transport.single_flight if self._transport is not None else None
+        return single_flight.stats() if single_flight is not None else None
+"""
+CLIENT_COALESCE_SIGNATURES = [
+    "@property",
+    "def coalesce_stats(self) -> Optional[Dict[str, Dict[str, int]]]:",
+]
+
+SDK_BATCH_TEMPLATE = """
+class BatchResult(NamedTuple):
+    \"\"\"Outcome of one call in a batch; `index` is its position in the input.\"\"\"
+
+    index: int
+    result: Any = None
+    error: Optional[BaseException] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+class _BatchMixin:
+    \"\"\"Concurrent fan-out over the `*_async` methods of a client or namespace.\"\"\"
+
+    def _async_operation(self, operation: str) -> Callable[..., Any]:
+        name = operation if operation.endswith("_async") else f"{{operation}}_async"
+        method = getattr(self, name, None)
+        if method is None or not inspect.iscoroutinefunction(method):
+            raise AttributeError(f"{{type(self).__name__}} has no async operation {{operation!r}}")
+        return method
+
+    async def batch(
+        self, operation: str, calls: Iterable[Dict[str, Any]], *, concurrency: int = 16
+    ) -> List[BatchResult]:
+        \"\"\"
+        Calls `operation` once per kwargs dict in `calls`, at most `concurrency`
+        at a time, and returns one `BatchResult` per call in input order.
+        Failures are reported per item instead of aborting the batch.
+        \"\"\"
+        results: List[BatchResult] = []
+        async for item in self.batch_stream(operation, calls, concurrency=concurrency):
+            results.append(item)
+        results.sort(key=lambda item: item.index)
+        return results
+
+    async def batch_stream(
+        self, operation: str, calls: Iterable[Dict[str, Any]], *, concurrency: int = 16
+    ) -> AsyncIterator[BatchResult]:
+        \"\"\"Like `batch`, but yields each `BatchResult` as soon as it completes.\"\"\"
+        method = self._async_operation(operation)
+        if concurrency < 1:
+            raise ValueError("concurrency must be at least 1")
+        pending = enumerate(calls)
+        done = object()
+        failures: List[BaseException] = []
+        queue: "asyncio.Queue[Any]" = asyncio.Queue(maxsize=concurrency)
+
+        async def worker() -> None:
+            try:
+                for index, kwargs in pending:
+                    try:
+                        item = BatchResult(index, await method(**kwargs))
+                    except Exception as e:
+                        item = BatchResult(index, error=e)
+                    await queue.put(item)
+            except Exception as e:  # `calls` itself raised
+                failures.append(e)
+            await queue.put(done)
+
+        workers = [asyncio.ensure_future(worker()) for _ in range(concurrency)]
+        try:
+            running = len(workers)
+            while running:
+                item = await queue.get()
+                if item is done:
+                    running -= 1
+                else:
+                    yield item
+            if failures:
+                raise failures[0]
+        finally:
+            for task in workers:
+                task.cancel()
+            await asyncio.gather(*workers, return_exceptions=True)
+
+"""
+
+SDK_BATCH_STUB = """
+class BatchResult(NamedTuple):
+    index: int
+    result: Any = ...
+    error: Optional[BaseException] = ...
+    @property
+    def ok(self) -> bool: ...
+
+class _BatchMixin:
+    async def batch(self, operation: str, calls: Iterable[Dict[str, Any]], *, concurrency: int = ...) -> List[BatchResult]: ...
+    def batch_stream(self, operation: str, calls: Iterable[Dict[str, Any]], *, concurrency: int = ...) -> AsyncIterator[BatchResult]: ...
+
+"""
+
+
+SDK_RAW_TEMPLATE = """
+class RawResponse(NamedTuple):
+    \"\"\"An unparsed response, as returned by the `*_raw` methods.\"\"\"
+
+    status_code: int
+    headers: httpx.Headers
+    content: bytes
+
+    def json(self) -> Any:
+        return json.loads(self.content)
+
+
+def _send_raw(client: httpx.Client, request_kwargs: Dict[str, Any]) -> RawResponse:
+    response = client.request(**request_kwargs)
+    return RawResponse(response.status_code, response.headers, response.content)
+
+
+async def _asend_raw(client: httpx.AsyncClient, request_kwargs: Dict[str, Any]) -> RawResponse:
+    response = await client.request(**request_kwargs)
+    return RawResponse(response.status_code, response.headers, response.content)
+
+"""
+
+SDK_RAW_STUB = """
+class RawResponse(NamedTuple):
+    status_code: int
+    headers: httpx.Headers
+    content: bytes
+    def json(self) -> Any: ...
+
+"""
+
+
+SDK_FAST_JSON_TEMPLATE = """
+# orjson, then msgspec, then the standard library, whichever imports.
+try:
+    import orjson as _orjson
+
+    JSON_BACKEND = "orjson"
+    _json_loads: Callable[[bytes], Any] = _orjson.loads
+    _json_dumps: Callable[[Any], bytes] = _orjson.dumps
+except ImportError:
+    try:
+        import msgspec as _msgspec
+
+        JSON_BACKEND = "msgspec"
+        _json_loads = _msgspec.json.Decoder().decode
+        _json_dumps = _msgspec.json.Encoder().encode
+    except ImportError:
+        JSON_BACKEND = "json"
+        _json_loads = json.loads
+
+        def _json_dumps(value: Any) -> bytes:
+            return json.dumps(value, separators=(",", ":")).encode()
+
+
+def _view(value: Any) -> Any:
+    if isinstance(value, dict):
+        return ModelView(value)
+    if isinstance(value, list):
+        return ModelList(value)
+    return value
+
+
+class ModelView:
+    \"\"\"
+    Read-only attribute access over a decoded JSON object.
+
+    Nested objects and arrays are wrapped only when they are accessed; use
+    `to_dict()` (or `Model.from_dict(view.to_dict())`) for the full model.
+    \"\"\"
+
+    __slots__ = ("_data",)
+
+    def __init__(self, data: Dict[str, Any]):
+        self._data = data
+
+    def __getattr__(self, name: str) -> Any:
+        # Model attributes never start with "_"; copy and pickle probe for dunders before _data is set.
+        if name.startswith("_"):
+            raise AttributeError(name)
+        data = self._data
+        if name in data:
+            return _view(data[name])
+        for key in _ATTRIBUTE_KEYS.get(name, ()):
+            if key in data:
+                return _view(data[key])
+        raise AttributeError(name)
+
+    def __getitem__(self, key: str) -> Any:
+        return _view(self._data[key])
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._data
+
+    def __eq__(self, other: object) -> bool:
+        return isinstance(other, ModelView) and other._data == self._data
+
+    def __repr__(self) -> str:
+        return f"ModelView({{self._data!r}})"
+
+    def to_dict(self) -> Dict[str, Any]:
+        return self._data
+
+
+class ModelList(Sequence[Any]):
+    \"\"\"A decoded JSON array whose objects become `ModelView`s one at a time, on access.\"\"\"
+
+    __slots__ = ("_items",)
+
+    def __init__(self, items: List[Any]):
+        self._items = items
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def __getitem__(self, index: Any) -> Any:
+        if isinstance(index, slice):
+            return ModelList(self._items[index])
+        return _view(self._items[index])
+
+    def __iter__(self) -> Iterator[Any]:
+        return map(_view, self._items)
+
+    def __repr__(self) -> str:
+        return f"ModelList({{len(self._items)}} items)"
+
+    def to_list(self) -> List[Any]:
+        return self._items
+
+
+def _fast_request(request_kwargs: Dict[str, Any]) -> Dict[str, Any]:
+    if "json" in request_kwargs:
+        request_kwargs = dict(request_kwargs)
+        headers = dict(request_kwargs.get("headers") or {{}})
+        headers["Content-Type"] = "application/json"
+        request_kwargs["content"] = _json_dumps(request_kwargs.pop("json"))
+        request_kwargs["headers"] = headers
+    return request_kwargs
+
+
+def _fast_result(response: httpx.Response, shape: str) -> Any:
+    if response.is_error:
+        response.raise_for_status()
+    if not response.content:
+        return None
+    value = _json_loads(response.content)
+    if shape == "value":
+        return value
+    return _view(value)
+
+
+def _send_fast(client: httpx.Client, request_kwargs: Dict[str, Any], shape: str) -> Any:
+    return _fast_result(client.request(**_fast_request(request_kwargs)), shape)
+
+
+async def _asend_fast(client: httpx.AsyncClient, request_kwargs: Dict[str, Any], shape: str) -> Any:
+    return _fast_result(await client.request(**_fast_request(request_kwargs)), shape)
+
+"""
+
+SDK_FAST_JSON_STUB = """
+JSON_BACKEND: str
+
+class ModelView:
+    def __init__(self, data: Dict[str, Any]) -> None: ...
+    def __getattr__(self, name: str) -> Any: ...
+    def __getitem__(self, key: str) -> Any: ...
+    def __contains__(self, key: object) -> bool: ...
+    def to_dict(self) -> Dict[str, Any]: ...
+
+class ModelList(Sequence[Any]):
+    def __init__(self, items: List[Any]) -> None: ...
+    def __len__(self) -> int: ...
+    def __getitem__(self, index: Any) -> Any: ...
+    def __iter__(self) -> Iterator[Any]: ...
+    def to_list(self) -> List[Any]: ...
+
+"""
+
+
+SDK_OPERATION_ROUTES_TEMPLATE = """
+class _OperationRoutes:
+    \"\"\"Maps requests back to operation names, indexed by method and first path segment.\"\"\"
+
+    def __init__(self, base_url: str):
+        self._base_path = httpx.URL(base_url).path.rstrip("/")
+        self._index: Dict[Tuple[str, str], List[Tuple[str, "re.Pattern[str]"]]] = {{}}
+        for name, (method, pattern) in _OPERATION_ROUTES.items():
+            first = pattern.lstrip("/").split("/", 1)[0]
+            segment = "" if "[" in first or "\\\\" in first else first
+            self._index.setdefault((method, segment), []).append((name, re.compile(pattern)))
+
+    def operation(self, request: httpx.Request) -> str:
+        path = request.url.path
+        if path.startswith(self._base_path):
+            path = path[len(self._base_path):] or "/"
+        first = path.lstrip("/").split("/", 1)[0]
+        for segment in (first, ""):
+            for name, route in self._index.get((request.method, segment), ()):
+                if route.fullmatch(path):
+                    return name
+        return f"{{request.method}} {{path}}"
+
+"""
+
+SDK_RESILIENCE_TEMPLATE = """
+_IDEMPOTENT_METHODS = frozenset({{"GET", "HEAD", "OPTIONS", "PUT", "DELETE", "TRACE"}})
+
+
+class RetryPolicy(NamedTuple):
+    \"\"\"
+    When and how long to retry a request.
+
+    Attempt n waits a random time up to `min(backoff_max, backoff_base * 2 ** (n - 1))`
+    ("full jitter"), or longer if the response's `Retry-After` asks for it. A
+    `Retry-After` beyond `max_retry_after` returns the response instead.
+    \"\"\"
+
+    max_attempts: int = 3
+    backoff_base: float = 0.5
+    backoff_max: float = 30.0
+    statuses: Tuple[int, ...] = (408, 429, 502, 503, 504)
+    methods: FrozenSet[str] = _IDEMPOTENT_METHODS
+    respect_retry_after: bool = True
+    max_retry_after: float = 60.0
+
+
+class RateLimit(NamedTuple):
+    \"\"\"Client-side token bucket: `rate` requests per second with bursts of up to `burst`.\"\"\"
+
+    rate: float
+    burst: int = 1
+
+
+class CircuitBreaker(NamedTuple):
+    \"\"\"Per-operation breaker: opens after `failure_threshold` consecutive failures for `reset_timeout` seconds.\"\"\"
+
+    failure_threshold: int = 5
+    reset_timeout: float = 30.0
+
+
+class CircuitOpenError(httpx.TransportError):
+    \"\"\"Raised instead of sending a request while its operation's circuit is open.\"\"\"
+
+
+class _TokenBucket:
+    def __init__(self, limit: RateLimit):
+        self.rate = limit.rate
+        self.burst = limit.burst
+        self.tokens = float(limit.burst)
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def reserve(self) -> float:
+        \"\"\"Takes a token and returns how long to wait before using it.\"\"\"
+        with self.lock:
+            now = time.monotonic()
+            self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            self.tokens -= 1
+            return 0.0 if self.tokens >= 0 else -self.tokens / self.rate
+
+
+class _Circuit:
+    \"\"\"Closed -> open after repeated failures -> half-open trial request after the timeout.\"\"\"
+
+    def __init__(self, policy: CircuitBreaker):
+        self.policy = policy
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+        self.trial_in_flight = False
+        self.lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return "closed"
+        if time.monotonic() - self.opened_at >= self.policy.reset_timeout:
+            return "half-open"
+        return "open"
+
+    def allow(self) -> str:
+        \"\"\"Returns "closed" or "trial" (the half-open trial request) to send, "" to refuse.\"\"\"
+        with self.lock:
+            state = self.state
+            if state == "closed":
+                return "closed"
+            if state == "half-open" and not self.trial_in_flight:
+                self.trial_in_flight = True
+                return "trial"
+            return ""
+
+    def abandon_trial(self) -> None:
+        \"\"\"Frees the half-open slot of a trial that ended without an outcome (e.g. cancelled).\"\"\"
+        with self.lock:
+            self.trial_in_flight = False
+
+    def record(self, success: bool) -> None:
+        with self.lock:
+            self.trial_in_flight = False
+            if success:
+                self.failures = 0
+                self.opened_at = None
+                return
+            self.failures += 1
+            if self.opened_at is not None or self.failures >= self.policy.failure_threshold:
+                self.opened_at = time.monotonic()
+
+
+def _retry_after(response: httpx.Response) -> Optional[float]:
+    value = response.headers.get("retry-after")
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, email.utils.parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+class _Resilience:
+    \"\"\"Retry policy, rate limiter and circuit breakers shared by one connection pool.\"\"\"
+
+    def __init__(self, base_url: str, retry: Optional[RetryPolicy], rate_limit: Optional[RateLimit], breaker: Optional[CircuitBreaker]):
+        self.retry = retry
+        self.bucket = _TokenBucket(rate_limit) if rate_limit is not None else None
+        self.breaker = breaker
+        self.routes = _OperationRoutes(base_url)
+        self._circuits: Dict[str, _Circuit] = {{}}
+        self._stats: Dict[str, List[float]] = {{}}
+        self._lock = threading.Lock()
+
+    def circuit(self, operation: str) -> Optional[_Circuit]:
+        if self.breaker is None:
+            return None
+        circuit = self._circuits.get(operation)
+        if circuit is None:
+            with self._lock:
+                circuit = self._circuits.setdefault(operation, _Circuit(self.breaker))
+        return circuit
+
+    def count(self, operation: str, field: int, amount: float = 1.0) -> None:
+        # Fields: retries, retry wait seconds, rate-limit waits, rate-limit wait seconds, rejections
+        with self._lock:
+            row = self._stats.setdefault(operation, [0.0] * 5)
+            row[field] += amount
+
+    def before_attempt(
+        self, request: httpx.Request, operation: str, circuit: Optional[_Circuit]
+    ) -> Tuple[float, bool]:
+        \"\"\"
+        Checks the circuit and takes a rate-limit token.
+
+        Returns the wait before sending and whether this attempt is the
+        circuit's half-open trial.
+        \"\"\"
+        admission = circuit.allow() if circuit is not None else "closed"
+        if not admission:
+            self.count(operation, 4)
+            raise CircuitOpenError(f"circuit open for {{operation!r}}", request=request)
+        wait = self.bucket.reserve() if self.bucket is not None else 0.0
+        if wait > 0:
+            self.count(operation, 2)
+            self.count(operation, 3, wait)
+        return wait, admission == "trial"
+
+    def retry_delay(self, request: httpx.Request, attempt: int, response: Optional[httpx.Response]) -> Optional[float]:
+        \"\"\"Seconds to wait before the next attempt, or None to stop retrying.\"\"\"
+        policy = self.retry
+        if policy is None or attempt >= policy.max_attempts or request.method not in policy.methods:
+            return None
+        if not isinstance(request.stream, httpx.ByteStream):
+            return None  # a streamed request body can't be sent twice
+        if response is not None and response.status_code not in policy.statuses:
+            return None
+        delay = random.uniform(0, min(policy.backoff_max, policy.backoff_base * 2 ** (attempt - 1)))
+        if response is not None and policy.respect_retry_after:
+            retry_after = _retry_after(response)
+            if retry_after is not None:
+                if retry_after > policy.max_retry_after:
+                    return None
+                delay = max(delay, retry_after)
+        return delay
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        with self._lock:
+            rows = {{name: list(row) for name, row in self._stats.items()}}
+            circuits = dict(self._circuits)
+        stats: Dict[str, Dict[str, Any]] = {{}}
+        for name in sorted(set(rows) | set(circuits)):
+            row = rows.get(name, [0.0] * 5)
+            stats[name] = {{
+                "retries": int(row[0]),
+                "retry_wait_seconds": row[1],
+                "rate_limited": int(row[2]),
+                "rate_limit_wait_seconds": row[3],
+                "circuit_rejections": int(row[4]),
+                "circuit": circuits[name].state if name in circuits else "closed",
+            }}
+        return stats
+
+    def prometheus(self, prefix: str) -> List[str]:
+        stats = self.stats()
+        lines: List[str] = []
+        for metric, key, help_text in (
+            ("retries_total", "retries", "Requests sent again after a retryable failure."),
+            ("retry_wait_seconds_total", "retry_wait_seconds", "Time spent backing off before retries."),
+            ("rate_limited_total", "rate_limited", "Requests delayed by the client-side rate limiter."),
+            ("rate_limit_wait_seconds_total", "rate_limit_wait_seconds", "Time spent waiting for rate-limit tokens."),
+            ("circuit_rejections_total", "circuit_rejections", "Requests refused because the circuit was open."),
+        ):
+            lines.append(f"# HELP {{prefix}}_{{metric}} {{help_text}}")
+            lines.append(f"# TYPE {{prefix}}_{{metric}} counter")
+            for operation, row in stats.items():
+                lines.append(f'{{prefix}}_{{metric}}{{{{operation="{{operation}}"}}}} {{row[key]}}')
+        lines.append(f"# HELP {{prefix}}_circuit_open Whether the operation's circuit is open (1) or not (0).")
+        lines.append(f"# TYPE {{prefix}}_circuit_open gauge")
+        for operation, row in stats.items():
+            lines.append(f'{{prefix}}_circuit_open{{{{operation="{{operation}}"}}}} {{int(row["circuit"] == "open")}}')
+        return lines
+
+
+class _ResilientTransport(httpx.BaseTransport):
+    def __init__(self, inner: httpx.BaseTransport, resilience: _Resilience):
+        self.inner = inner
+        self.resilience = resilience
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        resilience = self.resilience
+        operation = resilience.routes.operation(request)
+        circuit = resilience.circuit(operation)
+        attempt = 0
+        while True:
+            attempt += 1
+            wait, trial = resilience.before_attempt(request, operation, circuit)
+            try:
+                if wait:
+                    time.sleep(wait)
+                response = self.inner.handle_request(request)
+            except httpx.TransportError:
+                if circuit is not None:
+                    circuit.record(False)
+                delay = resilience.retry_delay(request, attempt, None)
+                if delay is None:
+                    raise
+            except BaseException:
+                # Interrupted with no outcome: let the next call be the trial instead.
+                if trial:
+                    circuit.abandon_trial()
+                raise
+            else:
+                if circuit is not None:
+                    circuit.record(response.status_code < 500)
+                delay = resilience.retry_delay(request, attempt, response)
+                if delay is None:
+                    return response
+                response.close()
+            resilience.count(operation, 0)
+            resilience.count(operation, 1, delay)
+            time.sleep(delay)
+
+    def close(self) -> None:
+        self.inner.close()
+
+
+class _AsyncResilientTransport(httpx.AsyncBaseTransport):
+    def __init__(self, inner: httpx.AsyncBaseTransport, resilience: _Resilience):
+        self.inner = inner
+        self.resilience = resilience
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        resilience = self.resilience
+        operation = resilience.routes.operation(request)
+        circuit = resilience.circuit(operation)
+        attempt = 0
+        while True:
+            attempt += 1
+            wait, trial = resilience.before_attempt(request, operation, circuit)
+            try:
+                if wait:
+                    await asyncio.sleep(wait)
+                response = await self.inner.handle_async_request(request)
+            except httpx.TransportError:
+                if circuit is not None:
+                    circuit.record(False)
+                delay = resilience.retry_delay(request, attempt, None)
+                if delay is None:
+                    raise
+            except BaseException:
+                # Cancelled (or a timeout scope) with no outcome: let the next call be the trial instead.
+                if trial:
+                    circuit.abandon_trial()
+                raise
+            else:
+                if circuit is not None:
+                    circuit.record(response.status_code < 500)
+                delay = resilience.retry_delay(request, attempt, response)
+                if delay is None:
+                    return response
+                await response.aclose()
+            resilience.count(operation, 0)
+            resilience.count(operation, 1, delay)
+            await asyncio.sleep(delay)
+
+    async def aclose(self) -> None:
+        await self.inner.aclose()
+
+
+"""
+
+SDK_RESILIENCE_STUB = """
+class RetryPolicy(NamedTuple):
+    max_attempts: int = ...
+    backoff_base: float = ...
+    backoff_max: float = ...
+    statuses: Tuple[int, ...] = ...
+    methods: FrozenSet[str] = ...
+    respect_retry_after: bool = ...
+    max_retry_after: float = ...
+
+class RateLimit(NamedTuple):
+    rate: float
+    burst: int = ...
+
+class CircuitBreaker(NamedTuple):
+    failure_threshold: int = ...
+    reset_timeout: float = ...
+
+class CircuitOpenError(httpx.TransportError): ...
+
+
+"""
+
+RESILIENCE_TRANSPORT_LAYER = """
+        self.resilience: Optional[_Resilience] = None
+        if options["retry"] or options["rate_limit"] or options["circuit_breaker"]:
+            self.resilience = _Resilience(
+                base_url, options["retry"], options["rate_limit"], options["circuit_breaker"]
+            )
+            self.layers.append((_ResilientTransport, _AsyncResilientTransport, (self.resilience,)))"""
+
+CLIENT_RESILIENCE_METHODS = """
+    @property
+    def resilience_stats(self) -> Optional[Dict[str, Dict[str, Any]]]:
+        \"\"\"Per-operation retries, backoff/rate-limit waits and circuit states, or None.\"\"\"
+        resilience = self._transport.resilience if self._transport is not None else None
+        return resilience.stats() if resilience is not None else None
+"""
+CLIENT_RESILIENCE_SIGNATURES = [
+    "@property",
+    "def resilience_stats(self) -> Optional[Dict[str, Dict[str, Any]]]:",
+]
+
+
+SDK_AUTO_BATCH_TEMPLATE = """
+class AutoBatch(NamedTuple):
+    \"\"\"
+    Sends concurrent async calls of `operations` to the server as bulk requests.
+
+    A call waits up to `window` seconds for others to join it; a batch is
+    sent as soon as it holds `max_size` calls. The batch is POSTed to `path`
+    (relative to the base URL) as `{{"requests": [{{"id", "method", "url",
+    "headers", "body"}}]}}` and the server answers `{{"responses": [{{"id",
+    "status", "headers", "body"}}]}}`, with JSON bodies inlined. Sync calls,
+    and requests whose body is not JSON, are sent on their own, and so is
+    everything once the server answers a batch with 404 or 405.
+    \"\"\"
+
+    operations: Sequence[str]
+    window: float = 0.002
+    max_size: int = 100
+    path: str = "/batch"
+
+
+class _OpenBatch:
+    __slots__ = ("inner", "calls", "timer")
+
+    def __init__(self, inner: httpx.AsyncBaseTransport) -> None:
+        self.inner = inner
+        self.calls: List[Tuple[httpx.Request, "asyncio.Future[httpx.Response]"]] = []
+        self.timer: Optional[asyncio.TimerHandle] = None
+
+
+class _Batcher:
+    \"\"\"Collects batchable requests per event loop and sends them through that loop's transport.\"\"\"
+
+    def __init__(self, base_url: str, config: AutoBatch):
+        self.config = config
+        self.routes = _OperationRoutes(base_url)
+        self.operations = frozenset(config.operations)
+        base = httpx.URL(base_url)
+        self.base_path = base.raw_path.split(b"?")[0].rstrip(b"/")
+        self.url = base.copy_with(raw_path=self.base_path + b"/" + config.path.lstrip("/").encode())
+        self._open: Dict[asyncio.AbstractEventLoop, _OpenBatch] = {{}}
+        self._sending: Set["asyncio.Task[None]"] = set()
+        self._counts = [0, 0, 0]  # bulk requests, calls in them, largest batch
+        self.unsupported = False  # the server has no batch endpoint
+
+    def batchable(self, request: httpx.Request) -> bool:
+        if self.unsupported or not isinstance(request.stream, httpx.ByteStream):
+            return False
+        if request.content and "json" not in request.headers.get("content-type", ""):
+            return False
+        return self.routes.operation(request) in self.operations
+
+    def add(
+        self, request: httpx.Request, inner: httpx.AsyncBaseTransport
+    ) -> "asyncio.Future[httpx.Response]":
+        loop = asyncio.get_running_loop()
+        future: "asyncio.Future[httpx.Response]" = loop.create_future()
+        batch = self._open.get(loop)
+        if batch is None:
+            batch = self._open[loop] = _OpenBatch(inner)
+            batch.timer = loop.call_later(self.config.window, self._flush, loop, batch)
+        batch.calls.append((request, future))
+        if len(batch.calls) >= self.config.max_size:
+            self._flush(loop, batch)
+        return future
+
+    def _flush(self, loop: asyncio.AbstractEventLoop, batch: _OpenBatch) -> None:
+        if self._open.get(loop) is batch:
+            del self._open[loop]
+        if batch.timer is not None:
+            batch.timer.cancel()
+        task = loop.create_task(
+            self._send(batch.inner, [call for call in batch.calls if not call[1].cancelled()])
+        )
+        self._sending.add(task)
+        task.add_done_callback(self._sending.discard)
+
+    @staticmethod
+    def _fail(calls: List[Tuple[httpx.Request, "asyncio.Future[httpx.Response]"]], error: BaseException) -> None:
+        for request, future in calls:
+            if future.done():
+                continue
+            if isinstance(error, httpx.RequestError):
+                future.set_exception(type(error)(str(error), request=request))
+            elif isinstance(error, Exception):
+                future.set_exception(error)
+            else:
+                future.cancel()
+
+    async def _send(
+        self, inner: httpx.AsyncBaseTransport, calls: List[Tuple[httpx.Request, "asyncio.Future[httpx.Response]"]]
+    ) -> None:
+        if not calls:
+            return
+        single = len(calls) == 1
+        if not single:
+            self._counts[0] += 1
+            self._counts[1] += len(calls)
+            self._counts[2] = max(self._counts[2], len(calls))
+        try:
+            response = await inner.handle_async_request(
+                calls[0][0] if single else self._bulk_request(calls)
+            )
+            content = await response.aread()
+        except BaseException as e:
+            self._fail(calls, e)
+            if not isinstance(e, Exception):
+                raise
+            return
+        if single:
+            if not calls[0][1].done():
+                calls[0][1].set_result(response)
+            return
+        if response.status_code in (404, 405):
+            self.unsupported = True
+            await asyncio.gather(*(self._send(inner, [call]) for call in calls))
+            return
+        try:
+            entries = json.loads(content)["responses"] if response.status_code == 200 else None
+            by_id = {{str(entry["id"]): entry for entry in entries or ()}}
+        except (ValueError, KeyError, TypeError):
+            entries = by_id = None
+        for index, (request, future) in enumerate(calls):
+            if future.done():
+                continue
+            if entries is None:
+                # The bulk request itself failed: every call gets a copy of its response.
+                future.set_result(
+                    httpx.Response(response.status_code, headers=response.headers, content=content, request=request)
+                )
+                continue
+            entry = by_id.get(str(index))
+            if entry is None:
+                future.set_exception(
+                    httpx.RemoteProtocolError(f"batch response has no entry for call {{index}}", request=request)
+                )
+                continue
+            future.set_result(self._response(request, entry))
+
+    def _bulk_request(self, calls: List[Tuple[httpx.Request, "asyncio.Future[httpx.Response]"]]) -> httpx.Request:
+        shared = [
+            (name, value)
+            for name, value in calls[0][0].headers.multi_items()
+            if name not in ("content-length", "content-type", "host")
+        ]
+        items = []
+        for index, (request, _) in enumerate(calls):
+            url = request.url.raw_path
+            if url.startswith(self.base_path):
+                url = url[len(self.base_path):]
+            item: Dict[str, Any] = {{"id": str(index), "method": request.method, "url": url.decode("ascii")}}
+            headers = {{
+                name: value
+                for name, value in request.headers.multi_items()
+                if name not in ("content-length", "host") and (name, value) not in shared
+            }}
+            if headers:
+                item["headers"] = headers
+            if request.content:
+                item["body"] = json.loads(request.content)
+            items.append(item)
+        return httpx.Request(
+            "POST", self.url, headers=shared, content=json.dumps({{"requests": items}}).encode(),
+            extensions=calls[0][0].extensions,
+        )
+
+    @staticmethod
+    def _response(request: httpx.Request, entry: Dict[str, Any]) -> httpx.Response:
+        headers = entry.get("headers") or {{}}
+        body = entry.get("body")
+        content_type = next((value for name, value in headers.items() if name.lower() == "content-type"), "")
+        if body is None and "json" not in content_type:
+            content = b""
+        elif isinstance(body, str) and "json" not in content_type:
+            content = body.encode()
+        else:
+            content = json.dumps(body).encode()
+        headers = {{name: value for name, value in headers.items() if name.lower() != "content-length"}}
+        return httpx.Response(int(entry["status"]), headers=headers, content=content, request=request)
+
+    def stats(self) -> Dict[str, int]:
+        batches, calls, largest = self._counts
+        return {{"batches": batches, "calls": calls, "largest": largest}}
+
+
+class _AsyncBatchingTransport(httpx.AsyncBaseTransport):
+    def __init__(self, inner: httpx.AsyncBaseTransport, batcher: _Batcher):
+        self.inner = inner
+        self.batcher = batcher
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        if not self.batcher.batchable(request):
+            return await self.inner.handle_async_request(request)
+        # Cancelling the caller cancels only its own future; a batch not yet sent leaves it out.
+        return await self.batcher.add(request, self.inner)
+
+    async def aclose(self) -> None:
+        await self.inner.aclose()
+
+"""
+
+SDK_AUTO_BATCH_STUB = """
+class AutoBatch(NamedTuple):
+    operations: Sequence[str]
+    window: float = ...
+    max_size: int = ...
+    path: str = ...
+
+"""
+
+
+AUTO_BATCH_TRANSPORT_LAYER = """
+        self.batcher: Optional[_Batcher] = None
+        if options["auto_batch"] is not None:
+            # Innermost, so retries, metrics and the cache still see every call on its own.
+            self.batcher = _Batcher(base_url, options["auto_batch"])
+            self.layers.append((None, _AsyncBatchingTransport, (self.batcher,)))"""
+
+CLIENT_AUTO_BATCH_METHODS = """
+    @property
+    def batch_stats(self) -> Optional[Dict[str, int]]:
+        \"\"\"Bulk requests sent by `auto_batch`, the calls in them and the largest batch, or None.\"\"\"
+        batcher = self._transport.batcher if self._transport is not None else None
+        return batcher.stats() if batcher is not None else None
+"""
+CLIENT_AUTO_BATCH_SIGNATURES = [
+    "@property",
+    "def batch_stats(self) -> Optional[Dict[str, int]]:",
+]
+
+SDK_COMPRESSION_TEMPLATE = """
+class Compression(NamedTuple):
+    \"\"\"
+    Request body compression and the response encodings to ask for.
+
+    Request bodies of at least `min_size` bytes are sent with
+    `request_encoding` ("gzip", "br" or "zstd"; None sends them as they
+    are) at `level` (the codec's default when None). `accept` lists the
+    response encodings to ask for, most preferred first; None asks for
+    every one whose codec is installed and () for none. Responses are
+    decoded chunk by chunk as they are read.
+    \"\"\"
+
+    request_encoding: Optional[str] = "gzip"
+    min_size: int = 1024
+    level: Optional[int] = None
+    accept: Optional[Sequence[str]] = None
+
+
+# Response encodings in order of preference when `Compression.accept` is None.
+COMPRESSION_ENCODINGS = ("zstd", "br", "gzip")
+_COMPRESSION_LEVELS = {{"gzip": 6, "br": 4, "zstd": 3}}
+_codecs: Dict[str, Any] = {{}}
+
+
+def _codec(encoding: str) -> Any:
+    \"\"\"The module behind `encoding`, imported on first use; None if it is not installed.\"\"\"
+    if encoding not in _codecs:
+        names = {{"gzip": ("zlib",), "br": ("brotli", "brotlicffi"), "zstd": ("zstandard",)}}
+        module = None
+        for name in names.get(encoding, ()):
+            try:
+                module = importlib.import_module(name)
+                break
+            except ImportError:
+                continue
+        _codecs[encoding] = module
+    return _codecs[encoding]
+
+
+def _compress(encoding: str, data: bytes, level: Optional[int]) -> bytes:
+    module = _codec(encoding)
+    if module is None:
+        raise RuntimeError(f"{{encoding!r}} request compression needs a module that is not installed")
+    level = _COMPRESSION_LEVELS[encoding] if level is None else level
+    if encoding == "gzip":
+        compressor = module.compressobj(level, module.DEFLATED, 16 + module.MAX_WBITS)
+        return compressor.compress(data) + compressor.flush()
+    if encoding == "br":
+        return module.compress(data, quality=level)
+    return module.ZstdCompressor(level=level).compress(data)
+
+
+class _EncodedStream(httpx.SyncByteStream, httpx.AsyncByteStream):
+    \"\"\"Counts an encoded response body's wire bytes; decodes zstd, which httpx before 0.27.1 cannot.\"\"\"
+
+    def __init__(self, stream: Any, compression: "_Compression", decoder: Any):
+        self.stream = stream
+        self.compression = compression
+        self.decoder = decoder
+
+    def _chunk(self, chunk: bytes) -> bytes:
+        self.compression.count(4, len(chunk))
+        return chunk if self.decoder is None else self.decoder.decompress(chunk)
+
+    def __iter__(self) -> Iterator[bytes]:
+        for chunk in self.stream:
+            data = self._chunk(chunk)
+            if data:
+                yield data
+
+    async def __aiter__(self) -> AsyncIterator[bytes]:
+        async for chunk in self.stream:
+            data = self._chunk(chunk)
+            if data:
+                yield data
+
+    def close(self) -> None:
+        self.stream.close()
+
+    async def aclose(self) -> None:
+        await self.stream.aclose()
+
+
+class _Compression:
+    \"\"\"Per-operation `Compression` settings of one connection pool, and byte counters.\"\"\"
+
+    def __init__(
+        self,
+        base_url: str,
+        default: Optional[Compression],
+        operations: Optional[Mapping[str, Optional[Compression]]],
+    ):
+        self.default = default
+        self.operations = dict(operations or {{}})
+        self.routes = _OperationRoutes(base_url) if self.operations else None
+        self._accept: Dict[Optional[Tuple[str, ...]], str] = {{}}
+        # Compressed requests, their bytes before and after, encoded responses, their bytes on the wire
+        self._counts = [0, 0, 0, 0, 0]
+        self._lock = threading.Lock()
+
+    def settings(self, request: httpx.Request) -> Optional[Compression]:
+        if self.routes is not None:
+            operation = self.routes.operation(request)
+            if operation in self.operations:
+                return self.operations[operation]
+        return self.default
+
+    def accept_encoding(self, accept: Optional[Sequence[str]]) -> str:
+        key = None if accept is None else tuple(accept)
+        value = self._accept.get(key)
+        if value is None:
+            encodings = [e for e in (COMPRESSION_ENCODINGS if key is None else key) if _codec(e) is not None]
+            value = self._accept[key] = ", ".join(encodings) or "identity"
+        return value
+
+    def request(self, request: httpx.Request) -> httpx.Request:
+        settings = self.settings(request)
+        if settings is None:
+            return request
+        request.headers["Accept-Encoding"] = self.accept_encoding(settings.accept)
+        encoding = settings.request_encoding
+        if (
+            encoding is None
+            or "content-encoding" in request.headers
+            or not isinstance(request.stream, httpx.ByteStream)
+            or len(request.content) < settings.min_size
+        ):
+            return request
+        body = _compress(encoding, request.content, settings.level)
+        self.count(0, 1)
+        self.count(1, len(request.content))
+        self.count(2, len(body))
+        headers = request.headers.copy()
+        headers["Content-Encoding"] = encoding
+        headers.pop("Content-Length", None)
+        return httpx.Request(request.method, request.url, headers=headers, content=body, extensions=request.extensions)
+
+    def response(self, response: httpx.Response) -> httpx.Response:
+        encoding = response.headers.get("content-encoding", "").strip().lower()
+        if not encoding or encoding == "identity":
+            return response
+        self.count(3, 1)
+        decoder = None
+        if encoding == "zstd" and _codec("zstd") is not None:
+            decoder = _codec("zstd").ZstdDecompressor().decompressobj()
+            del response.headers["content-encoding"]
+            response.headers.pop("content-length", None)
+        response.stream = _EncodedStream(response.stream, self, decoder)
+        return response
+
+    def count(self, field: int, amount: int) -> None:
+        with self._lock:
+            self._counts[field] += amount
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            requests, raw, sent, responses, received = self._counts
+        return {{
+            "requests_compressed": requests,
+            "request_bytes": raw,
+            "request_wire_bytes": sent,
+            "responses_encoded": responses,
+            "response_wire_bytes": received,
+        }}
+
+
+class _CompressingTransport(httpx.BaseTransport):
+    def __init__(self, inner: httpx.BaseTransport, compression: _Compression):
+        self.inner = inner
+        self.compression = compression
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        response = self.inner.handle_request(self.compression.request(request))
+        return self.compression.response(response)
+
+    def close(self) -> None:
+        self.inner.close()
+
+
+class _AsyncCompressingTransport(httpx.AsyncBaseTransport):
+    def __init__(self, inner: httpx.AsyncBaseTransport, compression: _Compression):
+        self.inner = inner
+        self.compression = compression
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        response = await self.inner.handle_async_request(self.compression.request(request))
+        return self.compression.response(response)
+
+    async def aclose(self) -> None:
+        await self.inner.aclose()
+
+"""
+
+SDK_COMPRESSION_STUB = """
+class Compression(NamedTuple):
+    request_encoding: Optional[str] = ...
+    min_size: int = ...
+    level: Optional[int] = ...
+    accept: Optional[Sequence[str]] = ...
+
+COMPRESSION_ENCODINGS: Tuple[str, ...]
+
+"""
+
+COMPRESSION_TRANSPORT_LAYER = """
+        self.compression: Optional[_Compression] = None
+        if options["compression"] is not None or options["compression_operations"]:
+            # Below batching, so a bulk request is compressed as one body.
+            self.compression = _Compression(
+                base_url, options["compression"], options["compression_operations"]
+            )
+            self.layers.append((_CompressingTransport, _AsyncCompressingTransport, (self.compression,)))"""
+
+CLIENT_COMPRESSION_METHODS = """
+    @property
+    def compression_stats(self) -> Optional[Dict[str, int]]:
+        \"\"\"Compressed requests and encoded responses with their raw and wire bytes, or None.\"\"\"
+        compression = self._transport.compression if self._transport is not None else None
+        return compression.stats() if compression is not None else None
+"""
+CLIENT_COMPRESSION_SIGNATURES = [
+    "@property",
+    "def compression_stats(self) -> Optional[Dict[str, int]]:",
+]
+
+
+SDK_INSTRUMENTATION_TEMPLATE = """
+class CallInfo:
+    \"\"\"What instrumentation hooks see about one SDK call.\"\"\"
+
+    __slots__ = (
+        "operation", "namespace", "started_at", "duration", "status_code",
+        "request_bytes", "response_bytes", "attempts", "error",
+    )
+
+    def __init__(self, namespace: str, operation: str):
+        self.namespace = namespace
+        self.operation = operation
+        self.started_at = time.time()
+        self.duration: Optional[float] = None
+        self.status_code: Optional[int] = None
+        self.request_bytes = 0
+        self.response_bytes = 0
+        self.attempts = 0
+        self.error: Optional[BaseException] = None
+
+    @property
+    def failed(self) -> bool:
+        return self.error is not None or (self.status_code or 0) >= 400
+
+
+_CURRENT_CALL: "contextvars.ContextVar[Optional[CallInfo]]" = contextvars.ContextVar("_CURRENT_CALL", default=None)
+_LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+# Row layout: count, duration sum, errors, request bytes, response bytes, bucket counts (+Inf last)
+_ROW_FIELDS = 5
+
+
+class _Histograms:
+    \"\"\"
+    Per-operation latency histograms.
+
+    Each thread writes to its own shard, so recording never takes a lock;
+    shards are merged when the metrics are read.
+    \"\"\"
+
+    def __init__(self) -> None:
+        self._local = threading.local()
+        self._shards: List[Dict[str, List[float]]] = []
+        self._shards_lock = threading.Lock()
+
+    def record(self, info: CallInfo) -> None:
+        shard = getattr(self._local, "shard", None)
+        if shard is None:
+            shard = self._local.shard = {{}}
+            with self._shards_lock:
+                self._shards.append(shard)
+        row = shard.get(info.operation)
+        if row is None:
+            row = shard[info.operation] = [0.0] * (_ROW_FIELDS + len(_LATENCY_BUCKETS) + 1)
+        duration = info.duration or 0.0
+        row[0] += 1
+        row[1] += duration
+        row[2] += info.failed
+        row[3] += info.request_bytes
+        row[4] += info.response_bytes
+        row[_ROW_FIELDS + bisect.bisect_left(_LATENCY_BUCKETS, duration)] += 1
+
+    def merged(self) -> Dict[str, List[float]]:
+        with self._shards_lock:
+            shards = list(self._shards)
+        totals: Dict[str, List[float]] = {{}}
+        for shard in shards:
+            for operation, row in list(shard.items()):
+                total = totals.setdefault(operation, [0.0] * len(row))
+                for i, value in enumerate(row):
+                    total[i] += value
+        return totals
+
+
+class _Instrumentation:
+    \"\"\"Hooks and metrics for one client; methods skip it entirely while `active` is False.\"\"\"
+
+    def __init__(self, metrics: bool):
+        self.pre_hooks: List[Callable[[CallInfo], Any]] = []
+        self.post_hooks: List[Callable[[CallInfo], Any]] = []
+        self.histograms = _Histograms() if metrics else None
+        self.active = metrics
+
+    def call(self, namespace: str, operation: str) -> "_CallScope":
+        return _CallScope(self, CallInfo(namespace, operation))
+
+    def add_hook(self, pre: Optional[Callable[[CallInfo], Any]], post: Optional[Callable[[CallInfo], Any]]) -> None:
+        if pre is not None:
+            self.pre_hooks.append(pre)
+        if post is not None:
+            self.post_hooks.append(post)
+        self.active = True
+
+    def clear_hooks(self) -> None:
+        self.pre_hooks.clear()
+        self.post_hooks.clear()
+        self.active = self.histograms is not None
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        if self.histograms is None:
+            return {{}}
+        snapshot: Dict[str, Dict[str, Any]] = {{}}
+        for operation, row in sorted(self.histograms.merged().items()):
+            cumulative, buckets = 0, {{}}
+            for bound, count in zip(_LATENCY_BUCKETS + (float("inf"),), row[_ROW_FIELDS:]):
+                cumulative += int(count)
+                buckets["+Inf" if bound == float("inf") else repr(bound)] = cumulative
+            snapshot[operation] = {{
+                "count": int(row[0]),
+                "duration_sum": row[1],
+                "errors": int(row[2]),
+                "request_bytes": int(row[3]),
+                "response_bytes": int(row[4]),
+                "buckets": buckets,
+            }}
+        return snapshot
+
+    def prometheus(self, prefix: str) -> str:
+        lines = [
+            f"# HELP {{prefix}}_request_duration_seconds Latency of SDK calls.",
+            f"# TYPE {{prefix}}_request_duration_seconds histogram",
+        ]
+        snapshot = self.snapshot()
+        for operation, stats in snapshot.items():
+            label = f'operation="{{operation}}"'
+            for bound, count in stats["buckets"].items():
+                lines.append(f'{{prefix}}_request_duration_seconds_bucket{{{{{{label}},le="{{bound}}"}}}} {{count}}')
+            lines.append(f"{{prefix}}_request_duration_seconds_sum{{{{{{label}}}}}} {{stats['duration_sum']}}")
+            lines.append(f"{{prefix}}_request_duration_seconds_count{{{{{{label}}}}}} {{stats['count']}}")
+        for metric, key, help_text in (
+            ("request_errors_total", "errors", "SDK calls that raised or got a 4xx/5xx status."),
+            ("request_bytes_total", "request_bytes", "Request body bytes sent."),
+            ("response_bytes_total", "response_bytes", "Response body bytes received."),
+        ):
+            lines.append(f"# HELP {{prefix}}_{{metric}} {{help_text}}")
+            lines.append(f"# TYPE {{prefix}}_{{metric}} counter")
+            for operation, stats in snapshot.items():
+                lines.append(f'{{prefix}}_{{metric}}{{{{operation="{{operation}}"}}}} {{stats[key]}}')
+        return "\\n".join(lines) + "\\n"
+
+
+class _CallScope:
+    __slots__ = ("instrumentation", "info", "token", "started")
+
+    def __init__(self, instrumentation: _Instrumentation, info: CallInfo):
+        self.instrumentation = instrumentation
+        self.info = info
+
+    def __enter__(self) -> CallInfo:
+        for hook in self.instrumentation.pre_hooks:
+            hook(self.info)
+        self.token = _CURRENT_CALL.set(self.info)
+        self.started = time.perf_counter()
+        return self.info
+
+    def __exit__(self, exc_type: Any, exc: Any, tb: Any) -> None:
+        info = self.info
+        info.duration = time.perf_counter() - self.started
+        info.error = exc
+        _CURRENT_CALL.reset(self.token)
+        if self.instrumentation.histograms is not None:
+            self.instrumentation.histograms.record(info)
+        for hook in self.instrumentation.post_hooks:
+            hook(info)
+
+
+class _CountingStream(httpx.SyncByteStream, httpx.AsyncByteStream):
+    \"\"\"Adds the response body's on-the-wire size to the current call.\"\"\"
+
+    def __init__(self, stream: Any, info: CallInfo):
+        self.stream = stream
+        self.info = info
+
+    def __iter__(self) -> Iterator[bytes]:
+        for chunk in self.stream:
+            self.info.response_bytes += len(chunk)
+            yield chunk
+
+    async def __aiter__(self) -> AsyncIterator[bytes]:
+        async for chunk in self.stream:
+            self.info.response_bytes += len(chunk)
+            yield chunk
+
+    def close(self) -> None:
+        self.stream.close()
+
+    async def aclose(self) -> None:
+        await self.stream.aclose()
+
+
+def _record_request(info: CallInfo, request: httpx.Request) -> None:
+    info.attempts += 1
+    info.request_bytes += int(request.headers.get("content-length") or 0)
+
+
+class _InstrumentedTransport(httpx.BaseTransport):
+    def __init__(self, inner: httpx.BaseTransport):
+        self.inner = inner
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        info = _CURRENT_CALL.get()
+        if info is None:
+            return self.inner.handle_request(request)
+        _record_request(info, request)
+        response = self.inner.handle_request(request)
+        info.status_code = response.status_code
+        response.stream = _CountingStream(response.stream, info)
+        return response
+
+    def close(self) -> None:
+        self.inner.close()
+
+
+class _AsyncInstrumentedTransport(httpx.AsyncBaseTransport):
+    def __init__(self, inner: httpx.AsyncBaseTransport):
+        self.inner = inner
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        info = _CURRENT_CALL.get()
+        if info is None:
+            return await self.inner.handle_async_request(request)
+        _record_request(info, request)
+        response = await self.inner.handle_async_request(request)
+        info.status_code = response.status_code
+        response.stream = _CountingStream(response.stream, info)
+        return response
+
+    async def aclose(self) -> None:
+        await self.inner.aclose()
+
+"""
+
+INSTRUMENTATION_TRANSPORT_LAYER = """
+        self.layers.append((_InstrumentedTransport, _AsyncInstrumentedTransport, ()))"""
+
+CLIENT_INSTRUMENTATION_METHODS = """
+    def add_hook(
+        self,
+        *,
+        pre: Optional[Callable[[CallInfo], Any]] = None,
+        post: Optional[Callable[[CallInfo], Any]] = None,
+    ) -> None:
+        \"\"\"Registers callbacks run before and after every SDK call with its `CallInfo`.\"\"\"
+        self._instrumentation.add_hook(pre, post)
+
+    def clear_hooks(self) -> None:
+        self._instrumentation.clear_hooks()
+
+    def metrics_snapshot(self) -> Dict[str, Dict[str, Any]]:
+        \"\"\"Per-operation latency histograms, error counts and payload sizes.\"\"\"
+        return self._instrumentation.snapshot()
+
+    def metrics_prometheus(self, prefix: str = "sdk") -> str:
+        \"\"\"The metrics snapshot, plus retry/rate-limit/circuit counters, in Prometheus text format.\"\"\"
+        text = self._instrumentation.prometheus(prefix){resilience_metrics}
+        return text
+"""
+INSTRUMENTATION_RESILIENCE_METRICS = """
+        resilience = self._transport.resilience if self._transport is not None else None
+        if resilience is not None:
+            text += "".join(f"{line}\\n" for line in resilience.prometheus(prefix))"""
+CLIENT_INSTRUMENTATION_SIGNATURES = [
+    "def add_hook(self, *, pre: Optional[Callable[[CallInfo], Any]] = ..., post: Optional[Callable[[CallInfo], Any]] = ...) -> None:",
+    "def clear_hooks(self) -> None:",
+    "def metrics_snapshot(self) -> Dict[str, Dict[str, Any]]:",
+    "def metrics_prometheus(self, prefix: str = ...) -> str:",
+]
+
+SDK_INSTRUMENTATION_STUB = """
+class CallInfo:
+    operation: str
+    namespace: str
+    started_at: float
+    duration: Optional[float]
+    status_code: Optional[int]
+    request_bytes: int
+    response_bytes: int
+    attempts: int
+    error: Optional[BaseException]
+    @property
+    def failed(self) -> bool: ...
+
+"""
+
+
+# Media types of 2xx responses that get `*_stream` methods, by decoder kind.
+STREAM_MEDIA_TYPES = {
+    "text/event-stream": "sse",
+    "application/x-ndjson": "ndjson",
+    "application/ndjson": "ndjson",
+    "application/jsonl": "ndjson",
+    "application/jsonlines": "ndjson",
+    "application/x-jsonlines": "ndjson",
+    "application/octet-stream": "bytes",
+}
+STREAM_ITEM_TYPES = {"sse": "ServerSentEvent", "ndjson": "Any", "bytes": "bytes"}
+
+
+def _route_key(http_method: str, path: str) -> Tuple[str, str]:
+    # Path parameter names differ between the spec and generated code.
+    return http_method.lower(), re.sub(r"\{[^}]*\}", "{}", path)
+
+
+def streaming_routes(spec: Dict[str, Any]) -> Dict[Tuple[str, str], str]:
+    """
+    Finds operations whose success response should be streamed.
+
+    Maps `_route_key(method, path)` to "sse", "ndjson" or "bytes"; a binary
+    (`format: binary`) schema under a non-JSON media type also counts as bytes.
+    """
+    routes: Dict[Tuple[str, str], str] = {}
+    for path, path_item in (spec.get("paths") or {}).items():
+        for http_method, operation in path_item.items():
+            if not isinstance(operation, dict) or "responses" not in operation:
+                continue
+            kinds: Set[str] = set()
+            for status, response in operation["responses"].items():
+                if not str(status).startswith("2") or not isinstance(response, dict):
+                    continue
+                for media_type, media in (response.get("content") or {}).items():
+                    media_type = media_type.split(";")[0].strip().lower()
+                    kind = STREAM_MEDIA_TYPES.get(media_type)
+                    schema = (media or {}).get("schema") or {}
+                    if kind is None and "json" not in media_type and schema.get("format") == "binary":
+                        kind = "bytes"
+                    if kind is not None:
+                        kinds.add(kind)
+            for kind in ("sse", "ndjson", "bytes"):
+                if kind in kinds:
+                    routes[_route_key(http_method, path)] = kind
+                    break
+    return routes
+
+
+FAST_JSON_RESULT_TYPES = {
+    "list": "Optional[ModelList]",
+    "object": "Optional[ModelView]",
+    "value": "Any",
+}
+
+
+def _resolve_schema(spec: Dict[str, Any], schema: Any) -> Dict[str, Any]:
+    schemas = (spec.get("components") or {}).get("schemas") or {}
+    seen: Set[str] = set()
+    while isinstance(schema, dict) and "$ref" in schema and schema["$ref"] not in seen:
+        seen.add(schema["$ref"])
+        schema = schemas.get(schema["$ref"].rsplit("/", 1)[-1])
+    return schema if isinstance(schema, dict) else {}
+
+
+def _schema_shape(spec: Dict[str, Any], schema: Any) -> str:
+    schema = _resolve_schema(spec, schema)
+    if schema.get("type") == "array":
+        return "list"
+    if schema.get("type") == "object" or "properties" in schema or "allOf" in schema:
+        return "object"
+    return "value"
+
+
+def _success_json_schemas(spec: Dict[str, Any]) -> Iterator[Tuple[Tuple[str, str], Any]]:
+    """Yields each operation's route key and the schema of its first 2xx JSON response."""
+    for path, path_item in (spec.get("paths") or {}).items():
+        for http_method, operation in path_item.items():
+            if not isinstance(operation, dict) or "responses" not in operation:
+                continue
+            for status, response in sorted(operation["responses"].items()):
+                if not str(status).startswith("2") or not isinstance(response, dict):
+                    continue
+                content = response.get("content") or {}
+                media = next(
+                    (
+                        media
+                        for media_type, media in content.items()
+                        if media_type.split(";")[0].strip().lower() == "application/json"
+                    ),
+                    None,
+                )
+                if media is not None:
+                    yield _route_key(http_method, path), (media or {}).get("schema")
+                    break
+
+
+def response_shapes(spec: Dict[str, Any]) -> Dict[Tuple[str, str], str]:
+    """
+    Classifies each operation's JSON success response for the `*_fast` methods.
+
+    Maps `_route_key(method, path)` to "list" (an array, decoded into a
+    `ModelList`), "object" (a `ModelView`) or "value" (returned as decoded).
+    """
+    return {
+        route: _schema_shape(spec, schema)
+        for route, schema in _success_json_schemas(spec)
+    }
+
+
+def annotation_shape(return_annotation: str) -> str:
+    """
+    Guesses the response shape from a `sync` return annotation (no spec given).
+
+    openapi-python-client lists the success type first, so the first member
+    of `Optional[Union[...]]` that is not `None` decides.
+    """
+    try:
+        node = ast.parse(return_annotation, mode="eval").body
+    except SyntaxError:
+        return "value"
+    while isinstance(node, ast.Subscript) and ast.unparse(node.value) in ("Optional", "Union"):
+        members = node.slice.elts if isinstance(node.slice, ast.Tuple) else [node.slice]
+        members = [m for m in members if ast.unparse(m) != "None"]
+        if not members:
+            return "value"
+        node = members[0]
+    if isinstance(node, ast.Constant) and isinstance(node.value, str):
+        return annotation_shape(node.value)
+    if isinstance(node, ast.Subscript):
+        return "list" if ast.unparse(node.value) in ("List", "list") else "value"
+    name = ast.unparse(node)
+    if name[:1].isupper() and name not in ("Any", "File", "Unset") and not hasattr(builtins, name):
+        return "object"
+    return "value"
+
+
+
+# Query parameter names that select a page, by pagination style.
+PAGINATION_PARAMS = {
+    "cursor": ("cursor", "after", "page_token", "next_token", "starting_after", "continuation_token"),
+    "offset": ("offset", "skip", "start"),
+    "page": ("page", "page_number", "page_num"),
+}
+PAGE_SIZE_PARAMS = ("limit", "page_size", "per_page", "size", "max_results")
+# JSON properties of a page object, in order of preference.
+PAGE_ITEM_FIELDS = ("items", "data", "results", "records", "entries", "values")
+PAGE_TOTAL_FIELDS = (
+    "total", "total_count", "totalCount", "total_items", "totalItems", "total_results", "totalResults",
+)
+PAGE_CURSOR_FIELDS = (
+    "next_cursor", "nextCursor", "next_page_token", "nextPageToken", "next_token", "nextToken", "next", "cursor",
+)
+_RESERVED_WORDS = (set(dir(builtins)) | {"self", "true", "false", "datetime"}) - {"type", "id"}
+
+
+def python_identifier(name: str) -> str:
+    """The attribute name openapi-python-client gives the JSON property `name`."""
+    value = re.sub(r"[^\w. _-]+", "", name)
+    if any(c.isupper() for c in value):
+        value = " ".join(re.split("([A-Z]?[a-z]+)", value))
+    identifier = "_".join(re.findall(r"[^. _-]+", value)).lower()
+    if identifier in _RESERVED_WORDS or keyword.iskeyword(identifier):
+        identifier += "_"
+    if not identifier.isidentifier() or name.startswith("_"):
+        identifier = f"field_{identifier}"
+    return identifier
+
+
+def attribute_keys(spec: Dict[str, Any]) -> Dict[str, Tuple[str, ...]]:
+    """
+    Maps model attribute names to the JSON properties they stand for.
+
+    Only properties whose `python_identifier` differs from the property name
+    are listed; `ModelView` looks up the others as they are.
+    """
+    keys: Dict[str, Set[str]] = {}
+
+    def walk(node: Any) -> None:
+        if isinstance(node, list):
+            for item in node:
+                walk(item)
+        elif isinstance(node, dict):
+            properties = node.get("properties")
+            if isinstance(properties, dict):
+                for name in properties:
+                    identifier = python_identifier(name)
+                    if identifier != name:
+                        keys.setdefault(identifier, set()).add(name)
+            for value in node.values():
+                walk(value)
+
+    walk(spec)
+    return {identifier: tuple(sorted(names)) for identifier, names in sorted(keys.items())}
+
+
+class PageShape(NamedTuple):
+    items: Optional[str]  # attribute holding the items; None when the response is the list
+    total: Optional[str]
+    next_cursor: Optional[str]
+
+
+def page_shapes(spec: Dict[str, Any]) -> Dict[Tuple[str, str], PageShape]:
+    """
+    Finds JSON success responses that look like a page of items.
+
+    That is an array, or an object with an array property (`items`, `data`,
+    ... or its only array); an integer total and a string next-page cursor
+    are picked up when present. Keys are `_route_key(method, path)`.
+    """
+    shapes: Dict[Tuple[str, str], PageShape] = {}
+    for route, schema in _success_json_schemas(spec):
+        schema = _resolve_schema(spec, schema)
+        if schema.get("type") == "array":
+            shapes[route] = PageShape(None, None, None)
+            continue
+        properties: Dict[str, Any] = {}
+        for part in [schema] + [_resolve_schema(spec, s) for s in schema.get("allOf", [])]:
+            properties.update(
+                (name, _resolve_schema(spec, prop))
+                for name, prop in (part.get("properties") or {}).items()
+            )
+        arrays = [name for name, prop in properties.items() if prop.get("type") == "array"]
+        items = next((name for name in PAGE_ITEM_FIELDS if name in arrays), None)
+        if items is None and len(arrays) == 1:
+            items = arrays[0]
+        if items is None:
+            continue
+        total = next(
+            (n for n in PAGE_TOTAL_FIELDS if properties.get(n, {}).get("type") == "integer"),
+            None,
+        )
+        cursor = next(
+            (n for n in PAGE_CURSOR_FIELDS if properties.get(n, {}).get("type") == "string"),
+            None,
+        )
+        shapes[route] = PageShape(
+            python_identifier(items),
+            python_identifier(total) if total else None,
+            python_identifier(cursor) if cursor else None,
+        )
+    return shapes
+
+
+def pagination(params: List[EndpointParam], shape: Optional[PageShape]) -> Optional[str]:
+    """
+    The `_Pager(...)` expression for an operation, or None if it does not page.
+
+    Cursor pagination needs a next-cursor field in the response; offset and
+    page-number pagination only need the parameter and a page of items.
+    """
+    if shape is None:
+        return None
+    names = [param.name for param in params]
+    size_param = next((name for name in PAGE_SIZE_PARAMS if name in names), None)
+    for style, candidates in PAGINATION_PARAMS.items():
+        if style == "cursor" and shape.next_cursor is None:
+            continue
+        param = next((name for name in candidates if name in names), None)
+        if param is not None:
+            return (
+                f"_Pager({style!r}, {param!r}, {size_param!r}, {shape.items!r}, "
+                f"{shape.total!r}, {shape.next_cursor!r})"
+            )
+    return None
+
+SDK_STREAM_TEMPLATE = """
+# Longest line a streaming method buffers before giving up on the response.
+STREAM_MAX_LINE_BYTES = 4 * 1024 * 1024
+_NEWLINE = re.compile(rb"\\r\\n|\\r|\\n")
+
+
+class ServerSentEvent(NamedTuple):
+    event: str
+    data: str
+    id: Optional[str]
+    retry: Optional[int]
+
+    def json(self) -> Any:
+        return json.loads(self.data)
+
+
+class _LineDecoder:
+    \"\"\"Splits a byte stream into lines (CR, LF or CRLF) with a bounded buffer.\"\"\"
+
+    def __init__(self) -> None:
+        self.pending = b""
+
+    def feed(self, chunk: bytes) -> List[str]:
+        data = self.pending + chunk
+        tail = b""
+        if data.endswith(b"\\r"):
+            # The LF of a CRLF may arrive with the next chunk.
+            data, tail = data[:-1], b"\\r"
+        lines = _NEWLINE.split(data)
+        self.pending = lines.pop() + tail
+        if len(self.pending) > STREAM_MAX_LINE_BYTES:
+            raise ValueError(f"stream line exceeds {{STREAM_MAX_LINE_BYTES}} bytes")
+        return [line.decode("utf-8") for line in lines]
+
+    def flush(self) -> List[str]:
+        pending, self.pending = self.pending.rstrip(b"\\r"), b""
+        return [pending.decode("utf-8")] if pending else []
+
+
+class _SSEDecoder:
+    \"\"\"Turns event-stream lines into `ServerSentEvent`s, as the WHATWG spec describes.\"\"\"
+
+    def __init__(self) -> None:
+        self.event = ""
+        self.data: List[str] = []
+        self.last_id: Optional[str] = None
+        self.retry: Optional[int] = None
+
+    def decode(self, line: str) -> Optional[ServerSentEvent]:
+        if not line:
+            if not self.data:
+                self.event = ""
+                return None
+            event = ServerSentEvent(self.event or "message", "\\n".join(self.data), self.last_id, self.retry)
+            self.event, self.data, self.retry = "", [], None
+            return event
+        if line.startswith(":"):
+            return None
+        field, _, value = line.partition(":")
+        if value.startswith(" "):
+            value = value[1:]
+        if field == "data":
+            self.data.append(value)
+        elif field == "event":
+            self.event = value
+        elif field == "id" and "\\0" not in value:
+            self.last_id = value
+        elif field == "retry" and value.isdigit():
+            self.retry = int(value)
+        return None
+
+
+class _StreamDecoder:
+    def __init__(self, kind: str):
+        self.kind = kind
+        self.lines = _LineDecoder()
+        self.sse = _SSEDecoder()
+
+    def feed(self, chunk: bytes) -> List[Any]:
+        if self.kind == "bytes":
+            return [chunk]
+        return self._items(self.lines.feed(chunk))
+
+    def flush(self) -> List[Any]:
+        if self.kind == "bytes":
+            return []
+        # An event without its closing blank line is incomplete and dropped.
+        return self._items(self.lines.flush())
+
+    def _items(self, lines: List[str]) -> List[Any]:
+        if self.kind == "ndjson":
+            return [json.loads(line) for line in lines if line.strip()]
+        events = (self.sse.decode(line) for line in lines)
+        return [event for event in events if event is not None]
+
+
+def _check_stream_status(response: httpx.Response, body: bytes) -> None:
+    if response.is_error:
+        response._content = body
+        response.raise_for_status()
+
+
+def _iter_stream(client: httpx.Client, kind: str, request_kwargs: Dict[str, Any], scope: Any = None) -> Iterator[Any]:
+    \"\"\"
+    Sends the request and yields decoded items as the body arrives.
+
+    Chunks are decoded as they arrive and the next one is only read once the
+    consumer asks for more, so a slow consumer slows the download instead of
+    buffering it. Leaving the loop closes the response.
+    \"\"\"
+    request = client.build_request(**request_kwargs)
+    if scope is None:
+        response = client.send(request, stream=True)
+    else:
+        with scope:
+            response = client.send(request, stream=True)
+    try:
+        if response.is_error:
+            _check_stream_status(response, response.read())
+        decoder = _StreamDecoder(kind)
+        for chunk in response.iter_bytes():
+            yield from decoder.feed(chunk)
+        yield from decoder.flush()
+    finally:
+        response.close()
+
+
+async def _aiter_stream(client: httpx.AsyncClient, kind: str, request_kwargs: Dict[str, Any], scope: Any = None) -> AsyncIterator[Any]:
+    request = client.build_request(**request_kwargs)
+    if scope is None:
+        response = await client.send(request, stream=True)
+    else:
+        with scope:
+            response = await client.send(request, stream=True)
+    try:
+        if response.is_error:
+            _check_stream_status(response, await response.aread())
+        decoder = _StreamDecoder(kind)
+        async for chunk in response.aiter_bytes():
+            for item in decoder.feed(chunk):
+                yield item
+        for item in decoder.flush():
+            yield item
+    finally:
+        await response.aclose()
+
+"""
+
+SDK_STREAM_STUB = """
+STREAM_MAX_LINE_BYTES: int
+
+class ServerSentEvent(NamedTuple):
+    event: str
+    data: str
+    id: Optional[str]
+    retry: Optional[int]
+    def json(self) -> Any: ...
+
+"""
+
+
+SDK_PAGINATION_TEMPLATE = """
+class PaginationError(Exception):
+    \"\"\"A page request of an `iter_*`/`aiter_*` method got an error or unparsable response.\"\"\"
+
+    def __init__(self, status_code: int, content: bytes):
+        super().__init__(f"page request failed with status {{status_code}}: {{content[:200]!r}}")
+        self.status_code = status_code
+        self.content = content
+
+
+class _Pager(NamedTuple):
+    style: str  # "offset", "page" or "cursor"
+    param: str  # argument holding the offset, page number or cursor
+    size_param: Optional[str]
+    items: Optional[str]  # attribute with the page's items; None when the page is the list
+    total: Optional[str]
+    next_cursor: Optional[str]
+
+
+def _given(value: Any) -> bool:
+    return value is not None and not isinstance(value, Unset)
+
+
+class _Pages:
+    \"\"\"Page bookkeeping shared by `_iter_pages` and `_aiter_pages`.\"\"\"
+
+    def __init__(self, pager: _Pager, kwargs: Dict[str, Any], prefetch: int):
+        self.pager = pager
+        self.kwargs = kwargs
+        self.prefetch = max(prefetch, 0)
+        start = kwargs.get(pager.param)
+        if pager.style == "cursor":
+            self.first = start
+        else:
+            self.first = start if _given(start) else (0 if pager.style == "offset" else 1)
+        size = kwargs.get(pager.size_param) if pager.size_param else None
+        self.size: Optional[int] = size if isinstance(size, int) and size > 0 else None
+        self.last = self.first  # last position requested
+        self.next_cursor: Any = None
+        self.total: Optional[int] = None
+        self.pages = 0
+        self.exhausted = False
+
+    def request(self, position: Any) -> Dict[str, Any]:
+        kwargs = dict(self.kwargs)
+        kwargs[self.pager.param] = position
+        return kwargs
+
+    def take(self, page: Any) -> List[Any]:
+        \"\"\"Returns the page's items and works out whether another page follows.\"\"\"
+        pager = self.pager
+        items = page if pager.items is None else getattr(page, pager.items, None)
+        items = list(items) if _given(items) else []
+        self.pages += 1
+        if pager.total is not None:
+            total = getattr(page, pager.total, None)
+            if isinstance(total, int):
+                self.total = total
+        if pager.style == "cursor":
+            cursor = getattr(page, pager.next_cursor, None) if pager.next_cursor else None
+            if items and _given(cursor) and cursor != "":
+                self.next_cursor = cursor
+            else:
+                self.exhausted = True
+            return items
+        if self.pages == 1 and (self.size is None or 0 < len(items) < self.size):
+            self.size = len(items)  # the server's default, or capped, page size
+        # Without a total, a short first page may just be capped: only a later
+        # short page, or an empty one, ends the listing.
+        if not items or (self.total is None and self.pages > 1 and len(items) < (self.size or 0)):
+            self.exhausted = True
+        return items
+
+    def advance(self) -> Any:
+        \"\"\"The next position to request, or None when no further page is known yet.\"\"\"
+        if self.exhausted:
+            return None
+        if self.pager.style == "cursor":
+            position, self.next_cursor = self.next_cursor, None
+            return position
+        if not self.size:
+            return None
+        if self.pager.style == "offset":
+            position = self.last + self.size
+            first_item = position
+        else:
+            position = self.last + 1
+            first_item = (position - 1) * self.size
+        if self.total is not None and first_item >= self.total:
+            return None
+        self.last = position
+        return position
+
+    def ahead(self) -> int:
+        \"\"\"Pages to keep in flight. Without a total, each page decides whether there is another.\"\"\"
+        if self.pager.style != "cursor" and self.total is not None:
+            return max(self.prefetch, 1)
+        return 1
+
+
+def _page(response: Any) -> Any:
+    if not 200 <= response.status_code < 300 or response.parsed is None:
+        raise PaginationError(response.status_code, response.content)
+    return response.parsed
+
+
+def _iter_pages(fetch: Callable[..., Any], kwargs: Dict[str, Any], pager: _Pager, prefetch: int) -> Iterator[Any]:
+    \"\"\"
+    Yields the items of every page, requesting up to `prefetch` pages ahead.
+
+    `fetch` is an operation's `*_detailed` method. With a known total, offset
+    and page numbered pages are fetched concurrently; otherwise one page ahead.
+    \"\"\"
+    pages = _Pages(pager, kwargs, prefetch)
+    executor = concurrent.futures.ThreadPoolExecutor(pages.prefetch) if pages.prefetch else None
+    queue: Deque[Tuple[Any, Optional["concurrent.futures.Future[Any]"]]] = deque([(pages.first, None)])
+    try:
+        while queue:
+            position, future = queue.popleft()
+            if future is None:
+                response = fetch(**pages.request(position))
+            else:
+                response = future.result()
+            items = pages.take(_page(response))
+            if pages.exhausted:
+                for _, pending in queue:
+                    if pending is not None:
+                        pending.cancel()
+                queue.clear()
+            while len(queue) < pages.ahead():
+                position = pages.advance()
+                if position is None:
+                    break
+                if executor is None:
+                    queue.append((position, None))
+                else:
+                    queue.append((position, executor.submit(fetch, **pages.request(position))))
+            yield from items
+    finally:
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+
+async def _aiter_pages(fetch: Callable[..., Any], kwargs: Dict[str, Any], pager: _Pager, prefetch: int) -> AsyncIterator[Any]:
+    \"\"\"Async `_iter_pages`: pages ahead are fetched by tasks on the running loop.\"\"\"
+    pages = _Pages(pager, kwargs, prefetch)
+    queue: Deque[Tuple[Any, Optional["asyncio.Future[Any]"]]] = deque([(pages.first, None)])
+    try:
+        while queue:
+            position, task = queue.popleft()
+            if task is None:
+                response = await fetch(**pages.request(position))
+            else:
+                response = await task
+            items = pages.take(_page(response))
+            if pages.exhausted:
+                for _, pending in queue:
+                    if pending is not None:
+                        pending.cancel()
+                queue.clear()
+            while len(queue) < pages.ahead():
+                position = pages.advance()
+                if position is None:
+                    break
+                if pages.prefetch:
+                    queue.append((position, asyncio.ensure_future(fetch(**pages.request(position)))))
+                else:
+                    queue.append((position, None))
+            for item in items:
+                yield item
+    finally:
+        for _, pending in queue:
+            if pending is not None:
+                pending.cancel()
+
+
+"""
+
+SDK_PAGINATION_STUB = """
+class PaginationError(Exception):
+    status_code: int
+    content: bytes
+    def __init__(self, status_code: int, content: bytes) -> None: ...
+
+
+"""
+
+SDK_UPLOAD_TEMPLATE = """
+UPLOAD_CHUNK_SIZE = 1024 * 1024
+
+
+class _NoMultipart:
+    \"\"\"Stands in for a multipart body model, so `_get_kwargs` builds everything but the body.\"\"\"
+
+    def to_multipart(self) -> Dict[str, Any]:
+        return {{}}
+
+
+_NO_MULTIPART = _NoMultipart()
+
+
+class _UploadPart(NamedTuple):
+    header: bytes
+    source: Any  # bytes, a path, a file object or an async iterable of bytes
+    size: Optional[int]  # None when it is only known once the source is exhausted
+    offset: Optional[int]  # start position of a seekable file object
+
+
+def _form_quote(value: str) -> str:
+    return re.sub(r'[\\x00-\\x1f"]', lambda m: "%{{:02X}}".format(ord(m.group())), value.replace("\\\\", "\\\\\\\\"))
+
+
+def _part_header(boundary: str, name: str, filename: Optional[str], content_type: Optional[str]) -> bytes:
+    disposition = f'form-data; name="{{_form_quote(name)}}"'
+    if filename is not None:
+        disposition += f'; filename="{{_form_quote(filename)}}"'
+    lines = [f"--{{boundary}}", f"Content-Disposition: {{disposition}}"]
+    if content_type:
+        lines.append(f"Content-Type: {{content_type}}")
+    return ("\\r\\n".join(lines) + "\\r\\n\\r\\n").encode()
+
+
+def _form_value(value: Any) -> bytes:
+    if isinstance(value, bytes):
+        return value
+    if isinstance(value, bool):
+        return b"true" if value else b"false"
+    if value is None:
+        return b""
+    if isinstance(value, (dict, list)):
+        return json.dumps(value).encode()
+    return str(value).encode()
+
+
+def _form_items(fields: Any) -> List[Tuple[str, Any]]:
+    items = list(fields.items()) if hasattr(fields, "items") else list(fields or ())
+    return [
+        (name, item)
+        for name, value in items
+        for item in (value if isinstance(value, list) else [value])
+    ]
+
+
+def _file_part(boundary: str, name: str, value: Any) -> _UploadPart:
+    \"\"\"
+    Describes one file field without reading it.
+
+    `value` is a path, bytes, a binary file object, an async iterable of
+    bytes, the client's `File`, or a `(filename, value[, content_type])` tuple.
+    \"\"\"
+    filename = content_type = None
+    if isinstance(value, tuple):
+        filename, value, content_type = (value + (None,))[:3]
+    elif hasattr(value, "payload") and hasattr(value, "to_tuple"):
+        filename, value, content_type = value.to_tuple()
+    size: Optional[int] = None
+    offset: Optional[int] = None
+    if isinstance(value, (str, os.PathLike)):
+        value = os.fspath(value)
+        size = os.path.getsize(value)
+        default_name: Optional[str] = os.path.basename(value)
+    elif isinstance(value, (bytes, bytearray, memoryview)):
+        value = bytes(value)
+        size = len(value)
+        default_name = name
+    elif hasattr(value, "read"):
+        if getattr(value, "seekable", lambda: False)():
+            offset = value.tell()
+            size = value.seek(0, os.SEEK_END) - offset
+            value.seek(offset)
+        file_name = getattr(value, "name", None)
+        default_name = os.path.basename(file_name) if isinstance(file_name, str) else name
+    elif hasattr(value, "__aiter__"):
+        default_name = name
+    else:
+        raise TypeError(f"cannot upload {{type(value).__name__}} as file field {{name!r}}")
+    if filename is None:
+        filename = default_name
+    if content_type is None:
+        content_type = mimetypes.guess_type(filename or "")[0] or "application/octet-stream"
+    return _UploadPart(_part_header(boundary, name, filename, content_type), value, size, offset)
+
+
+class _MultipartUpload(httpx.SyncByteStream, httpx.AsyncByteStream):
+    \"\"\"
+    A multipart/form-data body that reads its files chunk by chunk as it is sent.
+
+    The body can be iterated again (by retries), and `progress(sent, total)`
+    is called after every chunk; `total` is None when a part's size is unknown,
+    in which case the body is sent with chunked transfer encoding.
+    \"\"\"
+
+    def __init__(
+        self,
+        parts: List[_UploadPart],
+        boundary: str,
+        progress: Optional[Callable[[int, Optional[int]], None]],
+        use_mmap: bool,
+    ):
+        self.parts = parts
+        self.closing = f"--{{boundary}}--\\r\\n".encode()
+        self.boundary = boundary
+        self.progress = progress
+        self.use_mmap = use_mmap
+        self.sent = 0
+        self.total: Optional[int] = None
+        if all(part.size is not None for part in parts):
+            self.total = sum(len(part.header) + part.size + 2 for part in parts) + len(self.closing)
+
+    def headers(self) -> Dict[str, str]:
+        headers = {{"Content-Type": f"multipart/form-data; boundary={{self.boundary}}"}}
+        if self.total is None:
+            headers["Transfer-Encoding"] = "chunked"
+        else:
+            headers["Content-Length"] = str(self.total)
+        return headers
+
+    def _count(self, chunk: bytes) -> bytes:
+        self.sent += len(chunk)
+        if self.progress is not None:
+            self.progress(self.sent, self.total)
+        return chunk
+
+    def _read_path(self, path: str) -> Iterator[bytes]:
+        with open(path, "rb") as file:
+            if not self.use_mmap or os.fstat(file.fileno()).st_size == 0:
+                while True:
+                    chunk = file.read(UPLOAD_CHUNK_SIZE)
+                    if not chunk:
+                        return
+                    yield chunk
+            with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                # Pages already sent are dropped again, so resident memory stays flat.
+                dontneed = getattr(mmap, "MADV_DONTNEED", None) if hasattr(mapped, "madvise") else None
+                step = -(-UPLOAD_CHUNK_SIZE // mmap.PAGESIZE) * mmap.PAGESIZE
+                for start in range(0, len(mapped), step):
+                    yield mapped[start:start + step]
+                    if dontneed is not None:
+                        mapped.madvise(dontneed, start, min(step, len(mapped) - start))
+
+    def _read(self, part: _UploadPart) -> Iterator[bytes]:
+        source = part.source
+        if isinstance(source, bytes):
+            yield source
+        elif isinstance(source, str):
+            yield from self._read_path(source)
+        elif hasattr(source, "read"):
+            if part.offset is not None:
+                source.seek(part.offset)
+            while True:
+                chunk = source.read(UPLOAD_CHUNK_SIZE)
+                if not chunk:
+                    return
+                yield chunk.encode() if isinstance(chunk, str) else chunk
+        else:
+            raise TypeError("async iterables can only be uploaded by the *_upload_async methods")
+
+    def __iter__(self) -> Iterator[bytes]:
+        self.sent = 0
+        for part in self.parts:
+            yield self._count(part.header)
+            for chunk in self._read(part):
+                yield self._count(chunk)
+            yield self._count(b"\\r\\n")
+        yield self._count(self.closing)
+
+    async def __aiter__(self) -> AsyncIterator[bytes]:
+        self.sent = 0
+        loop = asyncio.get_running_loop()
+        for part in self.parts:
+            yield self._count(part.header)
+            if hasattr(part.source, "__aiter__"):
+                async for chunk in part.source:
+                    yield self._count(bytes(chunk))
+            else:
+                # Disk reads happen on the default executor, off the event loop.
+                chunks = self._read(part)
+                try:
+                    while True:
+                        chunk = await loop.run_in_executor(None, next, chunks, None)
+                        if chunk is None:
+                            break
+                        yield self._count(chunk)
+                finally:
+                    chunks.close()
+            yield self._count(b"\\r\\n")
+        yield self._count(self.closing)
+
+
+def _upload_request(
+    client: Any,
+    request_kwargs: Dict[str, Any],
+    files: Any,
+    data: Any,
+    progress: Optional[Callable[[int, Optional[int]], None]],
+    use_mmap: bool,
+) -> httpx.Request:
+    request_kwargs = dict(request_kwargs)
+    request_kwargs.pop("files", None)
+    request_kwargs.pop("data", None)
+    boundary = os.urandom(16).hex()
+    parts = []
+    for name, value in _form_items(data):
+        content = _form_value(value)
+        parts.append(_UploadPart(_part_header(boundary, name, None, None), content, len(content), None))
+    parts.extend(_file_part(boundary, name, value) for name, value in _form_items(files))
+    stream = _MultipartUpload(parts, boundary, progress, use_mmap)
+    headers = httpx.Headers(request_kwargs.pop("headers", None))
+    headers.update(stream.headers())
+    request = client.build_request(headers=headers, content=stream, **request_kwargs)
+    request.stream = stream  # httpx wraps iterables as sync-only streams
+    return request
+
+
+def _send_upload(client: httpx.Client, request_kwargs: Dict[str, Any], *args: Any) -> httpx.Response:
+    return client.send(_upload_request(client, request_kwargs, *args))
+
+
+async def _asend_upload(client: httpx.AsyncClient, request_kwargs: Dict[str, Any], *args: Any) -> httpx.Response:
+    return await client.send(_upload_request(client, request_kwargs, *args))
+
+"""
+
+SDK_UPLOAD_STUB = """
+UPLOAD_CHUNK_SIZE: int
+
+"""
+
+# Trailing keyword parameters of the `*_upload` methods, with their defaults.
+UPLOAD_METHOD_PARAMS = [
+    ("files: Union[Mapping[str, Any], Sequence[Tuple[str, Any]]]", ""),
+    ("data: Optional[Mapping[str, Any]]", " = None"),
+    ("progress: Optional[Callable[[int, Optional[int]], None]]", " = None"),
+    ("use_mmap: bool", " = False"),
+]
+
+# Wrapper constructor parameters; the transport ones are forwarded to the pool.
+CLIENT_INIT_PARAMS = [
+    "self",
+    "base_url: str",
+    "*",
+    "timeout: Union[float, httpx.Timeout, None] = None",
+    "headers: Optional[Dict[str, str]] = None",
+    "verify_ssl: bool = True",
+    "max_connections: Optional[int] = 100",
+    "max_keepalive_connections: Optional[int] = 20",
+    "keepalive_expiry: Optional[float] = 5.0",
+    "http2: bool = False",
+    "share_pool: bool = True",
+]
+CLIENT_TRANSPORT_OPTIONS = [
+    "timeout",
+    "headers",
+    "verify_ssl",
+    "max_connections",
+    "max_keepalive_connections",
+    "keepalive_expiry",
+    "http2",
+]
+
+CLIENT_LIFECYCLE_METHODS = """
+    def close(self) -> None:
+        \"\"\"Releases this client's share of the connection pool.\"\"\"
+        transport, self._transport = self._transport, None
+        if transport is not None:
+            transport.release()
+
+    async def aclose(self) -> None:
+        transport, self._transport = self._transport, None
+        if transport is not None:
+            await transport.arelease()
+
+    def __enter__(self) -> "{sdk_class}":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    async def __aenter__(self) -> "{sdk_class}":
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        await self.aclose()
+"""
+CLIENT_LIFECYCLE_SIGNATURES = [
+    "def close(self) -> None:",
+    "async def aclose(self) -> None:",
+    'def __enter__(self) -> "{sdk_class}":',
+    "def __exit__(self, *exc_info: Any) -> None:",
+    'async def __aenter__(self) -> "{sdk_class}":',
+    "async def __aexit__(self, *exc_info: Any) -> None:",
+]
+
+
+class RuntimeFeature(NamedTuple):
+    """Runtime code a wrapper only carries when it is generated with the feature."""
+
+    help: str
+    template: str
+    stub: str = ""
+    imports: Tuple[str, ...] = ()
+    shared: Tuple[str, ...] = ()  # templates other features need as well
+    init_params: Tuple[str, ...] = ()  # forwarded to the connection pool
+    layer: str = ""
+    methods: str = ""
+    signatures: Sequence[str] = ()
+
+
+# Opt-in wrapper features, by `features=` name; the pool's layers go in `TRANSPORT_LAYER_ORDER`.
+RUNTIME_FEATURES: Dict[str, RuntimeFeature] = {
+    "raw_methods": RuntimeFeature(
+        "add *_raw methods returning the undecoded response",
+        SDK_RAW_TEMPLATE,
+        SDK_RAW_STUB,
+        imports=("from typing import NamedTuple", "import json"),
+    ),
+    "batch_methods": RuntimeFeature(
+        "add batch/batch_stream fan-out over the *_async methods",
+        SDK_BATCH_TEMPLATE,
+        SDK_BATCH_STUB,
+        imports=(
+            "from typing import AsyncIterator",
+            "from typing import Iterable",
+            "from typing import NamedTuple",
+        ),
+    ),
+    "cache": RuntimeFeature(
+        "add the cache= option: a TTL/LRU cache of GET responses",
+        SDK_CACHE_TEMPLATE,
+        imports=("from collections import OrderedDict", "import re", "import time"),
+        shared=(SDK_CACHE_ENTRY_TEMPLATE,),
+        init_params=(
+            "cache: bool = False",
+            "cache_ttl: float = 60.0",
+            "cache_maxsize: int = 1024",
+            "cache_operations: Optional[Sequence[str]] = None",
+        ),
+        layer=CACHE_TRANSPORT_LAYER,
+        methods=CLIENT_CACHE_METHODS,
+        signatures=CLIENT_CACHE_SIGNATURES,
+    ),
+    "resilience": RuntimeFeature(
+        "add the retry=, rate_limit= and circuit_breaker= options",
+        SDK_RESILIENCE_TEMPLATE,
+        SDK_RESILIENCE_STUB,
+        imports=(
+            "from typing import FrozenSet",
+            "from typing import NamedTuple",
+            "import email.utils",
+            "import random",
+            "import re",
+            "import time",
+        ),
+        shared=(SDK_OPERATION_ROUTES_TEMPLATE,),
+        init_params=(
+            "retry: Optional[RetryPolicy] = None",
+            "rate_limit: Optional[RateLimit] = None",
+            "circuit_breaker: Optional[CircuitBreaker] = None",
+        ),
+        layer=RESILIENCE_TRANSPORT_LAYER,
+        methods=CLIENT_RESILIENCE_METHODS,
+        signatures=CLIENT_RESILIENCE_SIGNATURES,
+    ),
+    "coalesce": RuntimeFeature(
+        "add the coalesce= option collapsing identical in-flight GETs",
+        SDK_COALESCE_TEMPLATE,
+        imports=("import copy", "import re"),
+        shared=(SDK_CACHE_ENTRY_TEMPLATE,),
+        init_params=(
+            "coalesce: bool = False",
+            "coalesce_operations: Optional[Sequence[str]] = None",
+        ),
+        layer=COALESCE_TRANSPORT_LAYER,
+        methods=CLIENT_COALESCE_METHODS,
+        signatures=CLIENT_COALESCE_SIGNATURES,
+    ),
+    "auto_batch": RuntimeFeature(
+        "add the auto_batch= option sending concurrent async calls as bulk requests",
+        SDK_AUTO_BATCH_TEMPLATE,
+        SDK_AUTO_BATCH_STUB,
+        imports=("from typing import NamedTuple", "import json", "import re"),
+        shared=(SDK_OPERATION_ROUTES_TEMPLATE,),
+        init_params=("auto_batch: Optional[AutoBatch] = None",),
+        layer=AUTO_BATCH_TRANSPORT_LAYER,
+        methods=CLIENT_AUTO_BATCH_METHODS,
+        signatures=CLIENT_AUTO_BATCH_SIGNATURES,
+    ),
+    "compression": RuntimeFeature(
+        "add the compression= option for request and response bodies",
+        SDK_COMPRESSION_TEMPLATE,
+        SDK_COMPRESSION_STUB,
+        imports=(
+            "from typing import AsyncIterator",
+            "from typing import Iterator",
+            "from typing import Mapping",
+            "from typing import NamedTuple",
+            "import re",
+        ),
+        shared=(SDK_OPERATION_ROUTES_TEMPLATE,),
+        init_params=(
+            "compression: Optional[Compression] = None",
+            "compression_operations: Optional[Mapping[str, Optional[Compression]]] = None",
+        ),
+        layer=COMPRESSION_TRANSPORT_LAYER,
+        methods=CLIENT_COMPRESSION_METHODS,
+        signatures=CLIENT_COMPRESSION_SIGNATURES,
+    ),
+}
+# Innermost first.
+TRANSPORT_LAYER_ORDER = ("compression", "auto_batch", "cache", "instrument", "resilience", "coalesce")
+
+
+def add_feature_arguments(parser: argparse.ArgumentParser) -> None:
+    """One flag per `RUNTIME_FEATURES` entry (`--batch-methods`, `--cache`, ...)."""
+    for name, feature in RUNTIME_FEATURES.items():
+        parser.add_argument(f"--{name.replace('_', '-')}", action="store_true", help=feature.help)
+
+
+def selected_features(args: argparse.Namespace) -> Tuple[str, ...]:
+    return tuple(name for name in RUNTIME_FEATURES if getattr(args, name))
+
+
+def render_wrapper(
+    pkg_name: str,
+    sdk_class_name: str,
+    static: bool = False,
+    jobs: Optional[int] = None,
+    lazy: bool = False,
+    scan: Optional[PackageScan] = None,
+    instrument: bool = False,
+    spec: Optional[Dict[str, Any]] = None,
+    fast_json: bool = False,
+    production: bool = False,
+    features: Sequence[str] = (),
+) -> str:
+    """
+    Renders the SDK wrapper source.
+
+    `lazy=True` renders a wrapper that imports endpoint modules and models on
+    first use and builds namespaces on first access; pair it with
+    `render_stub` so type checkers still see the whole API.
+
+    `instrument=True` wraps every call in latency/retry/error hooks and adds
+    the client's `metrics=` option; without it none of that code is emitted.
+
+    `spec` is the OpenAPI document the package was generated from. Response
+    media types are not visible in the generated code, so operations that
+    stream (see `streaming_routes`) only get `*_stream` methods when it is given.
+
+    `fast_json=True` adds `*_fast` methods that decode with orjson/msgspec
+    (when installed) into lightweight views instead of models; their result
+    type follows `response_shapes(spec)`, or `annotation_shape` without a spec.
+    View attributes are named like the model's (`attribute_keys(spec)`);
+    without a spec they are the JSON property names as they are.
+
+    `production=True` leaves out the `__main__` smoke test (see
+    `render_smoke_test`) and every import the module does not refer to.
+
+    `features` names the `RUNTIME_FEATURES` to include (`*_raw` and batch
+    methods, the cache, retries, coalescing, auto-batching, compression);
+    without them the wrapper has none of that code or its client options.
+    """
+    scan = scan or scan_package(pkg_name, static=static, jobs=jobs)
+    with profile_span("spec shapes"):
+        streams = streaming_routes(spec) if spec else {}
+        shapes = response_shapes(spec) if spec else None
+        pages = page_shapes(spec) if spec else None
+        keys = attribute_keys(spec) if spec and fast_json else {}
+    return _render_sdk(
+        pkg_name,
+        sdk_class_name,
+        scan,
+        "lazy" if lazy else "eager",
+        instrument,
+        streams,
+        fast_json,
+        shapes,
+        pages,
+        production,
+        features=features,
+        attribute_keys=keys,
+    )
+
+
+def render_stub(
+    pkg_name: str,
+    sdk_class_name: str,
+    static: bool = False,
+    jobs: Optional[int] = None,
+    scan: Optional[PackageScan] = None,
+    instrument: bool = False,
+    spec: Optional[Dict[str, Any]] = None,
+    fast_json: bool = False,
+    features: Sequence[str] = (),
+) -> str:
+    """Renders a `.pyi` stub describing the full wrapper API."""
+    scan = scan or scan_package(pkg_name, static=static, jobs=jobs)
+    return _render_sdk(
+        pkg_name,
+        sdk_class_name,
+        scan,
+        "stub",
+        instrument,
+        streaming_routes(spec) if spec else {},
+        fast_json,
+        response_shapes(spec) if spec else None,
+        page_shapes(spec) if spec else None,
+        features=features,
+    )
+
+
+def _render_sdk(
+    pkg_name: str,
+    sdk_class_name: str,
+    scan: PackageScan,
+    mode: str,
+    instrument: bool = False,
+    streams: Optional[Dict[Tuple[str, str], str]] = None,
+    fast_json: bool = False,
+    shapes: Optional[Dict[Tuple[str, str], str]] = None,
+    pages: Optional[Dict[Tuple[str, str], PageShape]] = None,
+    production: bool = False,
+    features: Sequence[str] = (),
+    attribute_keys: Optional[Dict[str, Tuple[str, ...]]] = None,
+) -> str:
+    is_lazy = mode == "lazy"
+    is_stub = mode == "stub"
+    ns_map, endpoints = scan.ns_map, scan.endpoints
+    steps = _ProfileSteps(active_profile)
+    unknown = sorted(set(features) - set(RUNTIME_FEATURES))
+    if unknown:
+        raise ValueError(f"unknown runtime features: {', '.join(unknown)}")
+    enabled = [RUNTIME_FEATURES[name] for name in RUNTIME_FEATURES if name in features]
+    mixin = "(_BatchMixin)" if "batch_methods" in features else ""
+
+    sdk_imports: Set[str] = {
+        "from typing import Any, List, Union, Optional, Dict, Tuple, Set, Sequence, Callable, TypeVar, Type",
+        f"from {pkg_name}.client import Client as _GeneratedClient",
+        "from uuid import UUID",
+        "import datetime",
+        "import importlib",
+        "import inspect",
+        "import asyncio",
+        "import httpx",
+        "import threading",
+    }
+    for feature in enabled:
+        sdk_imports.update(feature.imports)
+    if instrument:
+        sdk_imports.update(
+            [
+                "from typing import Iterator",
+                "from typing import AsyncIterator",
+                "import bisect",
+                "import contextvars",
+                "import time",
+            ]
+        )
+    if fast_json:
+        sdk_imports.update(["from typing import Iterator", "import json"])
+    streams = streams or {}
+    has_streams = False
+    has_pages = False
+    has_uploads = False
+    if not is_lazy:
+        sdk_imports.add(f"from {pkg_name}.models import *")  # Wildcard import for models
+    if scan.has_types_module:
+        sdk_imports.add(f"from {pkg_name}.types import UNSET, Unset, File, Response")
+
+    endpoint_module_imports: Set[str] = set()
+    namespace_class_definitions: List[str] = []
+    client_fields: List[str] = []
+    client_inits: List[str] = []
+    top_level_method_definitions: List[str] = []
+    cacheable_routes: Dict[str, str] = {}
+    operation_routes: Dict[str, Tuple[str, str]] = {}
+
+    for ns_name, endpoint_module_paths in sorted(ns_map.items()):
+        is_default_namespace = ns_name == "default"
+
+        pascal_ns_name = get_pascal_case(ns_name)
+        ns_class_name = f"_{pascal_ns_name}Namespace"
+
+        if not is_default_namespace:
+            if is_lazy:
+                client_fields.append(
+                    f"    {ns_name} = _LazyNamespace({ns_class_name})"
+                )
+            elif is_stub:
+                client_fields.append(f"    {ns_name}: {ns_class_name}")
+            else:
+                client_fields.append(f"    {ns_name}: {ns_class_name}")
+                client_inits.append(
+                    f"        self.{ns_name} = {ns_class_name}(self)"
+                )
+
+            current_ns_class_code: List[str] = [
+                f"class {ns_class_name}{mixin}:",
+                "    _raw: _GeneratedClient",
+                "",
+            ]
+            if is_stub:
+                current_ns_class_code.append(
+                    "    def __init__(self, client: Any) -> None: ..."
+                )
+            else:
+                current_ns_class_code.extend(
+                    [
+                        "    def __init__(self, client: Any):",
+                        "        self._raw = client._raw",
+                    ]
+                )
+                if instrument:
+                    current_ns_class_code.append(
+                        "        self._instrumentation = client._instrumentation"
+                    )
+            current_ns_class_code.append("")
+            method_indent = "    "
+        else:
+            current_ns_class_code = top_level_method_definitions
+            method_indent = ""
+
+        for endpoint_module_path in sorted(endpoint_module_paths):
+            steps.next("render", endpoint_module_path)
+            endpoint_name = endpoint_module_path.split(".")[-1]
+            endpoint_module_alias = f"_ep_{ns_name}_{endpoint_name}"
+            if is_lazy:
+                endpoint_module_imports.add(
+                    f'    "{endpoint_module_alias}": "{endpoint_module_path}",'
+                )
+                endpoint_ref = f'_endpoint("{endpoint_module_alias}")'
+            else:
+                endpoint_module_imports.add(
+                    f"import {endpoint_module_path} as {endpoint_module_alias}"
+                )
+                endpoint_ref = endpoint_module_alias
+
+            functions = endpoints.get(endpoint_module_path)
+            if functions is None:
+                continue
+
+            operation_id = (
+                endpoint_name if is_default_namespace else f"{ns_name}.{endpoint_name}"
+            )
+            stream_kind = None
+            shape = None
+            page_shape = None
+            for function in functions:
+                if function.http_method is not None and function.path is not None:
+                    stream_kind = streams.get(
+                        _route_key(function.http_method, function.path)
+                    )
+                    if shapes is not None:
+                        shape = shapes.get(
+                            _route_key(function.http_method, function.path), "value"
+                        )
+                    if pages is not None:
+                        page_shape = pages.get(
+                            _route_key(function.http_method, function.path)
+                        )
+                    operation_routes[operation_id] = (
+                        function.http_method.upper(),
+                        route_pattern(function.path),
+                    )
+                    break
+            def add_method(method_def: str, method_body: str) -> None:
+                if is_stub:
+                    current_ns_class_code.append(f"{method_indent}{method_def} ...")
+                    return
+                current_ns_class_code.append(f"{method_indent}{method_def}")
+                if instrument:
+                    # Hooks and metrics off: one attribute check, then the plain call.
+                    current_ns_class_code.extend(
+                        [
+                            f"{method_indent}    if not self._instrumentation.active:",
+                            f"{method_indent}        {method_body}",
+                            f'{method_indent}    with self._instrumentation.call("{ns_name}", "{operation_id}"):',
+                        ]
+                    )
+                    method_body = f"    {method_body}"
+                current_ns_class_code.append(f"{method_indent}    {method_body}")
+                current_ns_class_code.append("")
+
+            for function in functions:
+                if function.func_type not in METHOD_SUFFIXES:
+                    continue
+                if (
+                    function.http_method == "get"
+                    and function.path is not None
+                    and stream_kind is None
+                ):
+                    cacheable_routes[operation_id] = route_pattern(function.path)
+                func_type = function.func_type
+                sdk_imports.update(function.imports)
+                params_list_for_sig: List[str] = []
+                call_args_list: List[str] = ["client=self._raw"]
+
+                for param in function.params:
+                    param_sig_part = f"{param.name}: {param.annotation}"
+                    if param.default is not None:
+                        param_sig_part += " = ..." if is_stub else f" = {param.default}"
+                    params_list_for_sig.append(param_sig_part)
+                    call_args_list.append(f"{param.name}={param.name}")
+
+                params_str_for_sig = ", ".join(params_list_for_sig)
+                call_args_str = ", ".join(call_args_list)
+                return_type_str = function.return_annotation
+
+                method_signature_parts = ["self"]
+                if params_str_for_sig:
+                    method_signature_parts.append("*")
+                    method_signature_parts.append(params_str_for_sig)
+                method_signature = ", ".join(method_signature_parts)
+
+                method_name = endpoint_name + METHOD_SUFFIXES[func_type]
+                if func_type.startswith("asyncio"):
+                    method_def = f"async def {method_name}({method_signature}) -> {return_type_str}:"
+                    method_body = f"return await {endpoint_ref}.{func_type}({call_args_str})"
+                else:
+                    method_def = f"def {method_name}({method_signature}) -> {return_type_str}:"
+                    method_body = f"return {endpoint_ref}.{func_type}({call_args_str})"
+                add_method(method_def, method_body)
+
+            request_function = next(
+                (f for f in functions if f.func_type == "_get_kwargs"), None
+            )
+            if request_function is not None:
+                sdk_imports.update(request_function.imports)
+                request_sig = ", ".join(
+                    ["self"]
+                    + (["*"] if request_function.params else [])
+                    + [
+                        f"{param.name}: {param.annotation}"
+                        + (
+                            ""
+                            if param.default is None
+                            else " = ..." if is_stub else f" = {param.default}"
+                        )
+                        for param in request_function.params
+                    ]
+                )
+                request_args = ", ".join(
+                    f"{param.name}={param.name}" for param in request_function.params
+                )
+                request_ref = f"{endpoint_ref}._get_kwargs({request_args})"
+                if "raw_methods" in features:
+                    # Raw variants skip response parsing entirely.
+                    add_method(
+                        f"def {endpoint_name}_raw({request_sig}) -> RawResponse:",
+                        f"return _send_raw(self._raw.get_httpx_client(), {request_ref})",
+                    )
+                    add_method(
+                        f"async def {endpoint_name}_raw_async({request_sig}) -> RawResponse:",
+                        f"return await _asend_raw(self._raw.get_async_httpx_client(), {request_ref})",
+                    )
+                detailed = next(
+                    (f for f in functions if f.func_type == "sync_detailed"), None
+                )
+                if pages is None and any(
+                    f.func_type == "sync" and annotation_shape(f.return_annotation) == "list"
+                    for f in functions
+                ):
+                    page_shape = PageShape(None, None, None)
+                pager = (
+                    pagination(detailed.params, page_shape)
+                    if detailed is not None
+                    and scan.has_types_module
+                    and stream_kind is None
+                    and any(f.func_type == "asyncio_detailed" for f in functions)
+                    else None
+                )
+                if pager is not None:
+                    has_pages = True
+                    page_sig = ", ".join(
+                        ["self", "*"]
+                        + [
+                            f"{param.name}: {param.annotation}"
+                            + (
+                                ""
+                                if param.default is None
+                                else " = ..." if is_stub else f" = {param.default}"
+                            )
+                            for param in detailed.params
+                        ]
+                        + ["prefetch: int = ..." if is_stub else "prefetch: int = 1"]
+                    )
+                    page_kwargs = ", ".join(
+                        f"{param.name}={param.name}" for param in detailed.params
+                    )
+                    for prefix, iterator, helper, method in (
+                        ("iter", "Iterator", "_iter_pages", f"{endpoint_name}_detailed"),
+                        ("aiter", "AsyncIterator", "_aiter_pages", f"{endpoint_name}_detailed_async"),
+                    ):
+                        method_def = f"def {prefix}_{endpoint_name}({page_sig}) -> {iterator}[Any]:"
+                        if is_stub:
+                            current_ns_class_code.append(f"{method_indent}{method_def} ...")
+                            continue
+                        current_ns_class_code.extend(
+                            [
+                                f"{method_indent}{method_def}",
+                                f"{method_indent}    return {helper}(self.{method}, "
+                                f"dict({page_kwargs}), {pager}, prefetch)",
+                                "",
+                            ]
+                        )
+                if (
+                    detailed is not None
+                    and any(f.func_type == "_build_response" for f in functions)
+                    and any(param.name == "multipart_data" for param in request_function.params)
+                ):
+                    # Multipart bodies are streamed from the caller's files instead of
+                    # being built in memory by the generated model's `to_multipart`.
+                    has_uploads = True
+                    upload_params = [
+                        param
+                        for param in request_function.params
+                        if param.name != "multipart_data"
+                    ]
+                    upload_sig = ", ".join(
+                        ["self", "*"]
+                        + [
+                            f"{param.name}: {param.annotation}"
+                            + (
+                                ""
+                                if param.default is None
+                                else " = ..." if is_stub else f" = {param.default}"
+                            )
+                            for param in upload_params
+                        ]
+                        + [
+                            f"{param}{' = ...' if is_stub and default else default}"
+                            for param, default in UPLOAD_METHOD_PARAMS
+                        ]
+                    )
+                    upload_request = f"{endpoint_ref}._get_kwargs(" + ", ".join(
+                        [f"{param.name}={param.name}" for param in upload_params]
+                        + ["multipart_data=_NO_MULTIPART"]
+                    ) + "), files, data, progress, use_mmap"
+                    add_method(
+                        f"def {endpoint_name}_upload({upload_sig}) -> {detailed.return_annotation}:",
+                        f"return {endpoint_ref}._build_response(client=self._raw, response="
+                        f"_send_upload(self._raw.get_httpx_client(), {upload_request}))",
+                    )
+                    add_method(
+                        f"async def {endpoint_name}_upload_async({upload_sig}) -> "
+                        f"{detailed.return_annotation}:",
+                        f"return {endpoint_ref}._build_response(client=self._raw, response="
+                        f"await _asend_upload(self._raw.get_async_httpx_client(), {upload_request}))",
+                    )
+                if fast_json and stream_kind is None:
+                    if shape is None:
+                        shape = next(
+                            (
+                                annotation_shape(f.return_annotation)
+                                for f in functions
+                                if f.func_type == "sync"
+                            ),
+                            "value",
+                        )
+                    result_type = FAST_JSON_RESULT_TYPES[shape]
+                    add_method(
+                        f"def {endpoint_name}_fast({request_sig}) -> {result_type}:",
+                        f'return _send_fast(self._raw.get_httpx_client(), {request_ref}, "{shape}")',
+                    )
+                    add_method(
+                        f"async def {endpoint_name}_fast_async({request_sig}) -> {result_type}:",
+                        f"return await _asend_fast(self._raw.get_async_httpx_client(), "
+                        f'{request_ref}, "{shape}")',
+                    )
+                if stream_kind is not None:
+                    has_streams = True
+                    scope_arg = (
+                        f', self._instrumentation.call("{ns_name}", "{operation_id}")'
+                        " if self._instrumentation.active else None"
+                        if instrument
+                        else ""
+                    )
+                    item_type = STREAM_ITEM_TYPES[stream_kind]
+                    for suffix, iterator, helper, getter in (
+                        ("_stream", "Iterator", "_iter_stream", "get_httpx_client"),
+                        ("_stream_async", "AsyncIterator", "_aiter_stream", "get_async_httpx_client"),
+                    ):
+                        method_def = (
+                            f"def {endpoint_name}{suffix}({request_sig}) -> {iterator}[{item_type}]:"
+                        )
+                        if is_stub:
+                            current_ns_class_code.append(f"{method_indent}{method_def} ...")
+                            continue
+                        current_ns_class_code.extend(
+                            [
+                                f"{method_indent}{method_def}",
+                                f'{method_indent}    return {helper}(self._raw.{getter}(), "{stream_kind}", '
+                                f"{request_ref}{scope_arg})",
+                                "",
+                            ]
+                        )
+
+        if not is_default_namespace:
+            if current_ns_class_code and not current_ns_class_code[-1] == "":
+                current_ns_class_code.append("")
+            namespace_class_definitions.append("\n".join(current_ns_class_code))
+
+    steps.next("assemble")
+    if top_level_method_definitions and top_level_method_definitions[-1] != "":
+        top_level_method_definitions.append("")
+
+    if has_streams:
+        sdk_imports.update(
+            [
+                "from typing import Iterator",
+                "from typing import AsyncIterator",
+                "from typing import NamedTuple",
+                "import json",
+                "import re",
+            ]
+        )
+    if has_pages:
+        sdk_imports.update(
+            [
+                "from typing import Iterator",
+                "from typing import AsyncIterator",
+                "from typing import NamedTuple",
+                "from typing import Deque",
+                "from collections import deque",
+                "import concurrent.futures",
+            ]
+        )
+    if has_uploads:
+        sdk_imports.update(
+            [
+                "from typing import Iterator",
+                "from typing import AsyncIterator",
+                "from typing import NamedTuple",
+                "from typing import Mapping",
+                "import json",
+                "import re",
+                "import mimetypes",
+                "import mmap",
+                "import os",
+            ]
+        )
+
+    has_specific_typing_import = any(
+        imp.startswith("from typing import ") and "Any" not in imp
+        for imp in sdk_imports
+    )
+    is_any_explicitly_used_in_ns = any(
+        "-> Any" in line or ": Any" in line
+        for ns_class_def in namespace_class_definitions
+        for line in ns_class_def.splitlines()
+    )
+    is_any_explicitly_used_in_top = any(
+        "-> Any" in line or ": Any" in line for line in top_level_method_definitions
+    )
+    is_any_explicitly_used = (
+        is_any_explicitly_used_in_ns or is_any_explicitly_used_in_top
+    )
+
+    if (
+        has_specific_typing_import
+        and "from typing import Any" in sdk_imports
+        and not is_any_explicitly_used
+    ):
+        sdk_imports.discard("from typing import Any")
+
+    sorted_sdk_imports = sorted(
+        list(sdk_imports),
+        key=lambda x: (not x.startswith("from typing"), x.startswith("from "), x),
+    )
+
+    if is_lazy:
+        code_parts = [
+            "from __future__ import annotations\n",
+            "\n".join(sorted_sdk_imports),
+            LAZY_LOADER_TEMPLATE.format(
+                pkg_name=pkg_name,
+                endpoint_entries="\n".join(sorted(endpoint_module_imports)),
+            ),
+        ]
+    elif is_stub:
+        code_parts = ["\n".join(sorted_sdk_imports), "\n"]
+    else:
+        code_parts = [
+            "\n".join(sorted_sdk_imports),
+            "\n",
+            "\n".join(sorted(list(endpoint_module_imports))),
+            "\n",
+        ]
+    if is_stub:
+        code_parts.extend(feature.stub for feature in enabled if feature.stub)
+        if fast_json:
+            code_parts.append(SDK_FAST_JSON_STUB)
+        if instrument:
+            code_parts.append(SDK_INSTRUMENTATION_STUB)
+        if has_streams:
+            code_parts.append(SDK_STREAM_STUB)
+        if has_pages:
+            code_parts.append(SDK_PAGINATION_STUB)
+        if has_uploads:
+            code_parts.append(SDK_UPLOAD_STUB)
+    else:
+        if "cache" in features or "coalesce" in features:
+            code_parts.append("_CACHEABLE_ROUTES: Dict[str, str] = {")
+            code_parts.extend(
+                f"    {name!r}: {pattern!r}," for name, pattern in sorted(cacheable_routes.items())
+            )
+            code_parts.append("}")
+        code_parts.append("_OPERATION_ROUTES: Dict[str, Tuple[str, str]] = {")
+        code_parts.extend(
+            f"    {name!r}: {route!r}," for name, route in sorted(operation_routes.items())
+        )
+        code_parts.append("}\n")
+        shared = [template for feature in enabled for template in feature.shared]
+        code_parts.extend(
+            template.format() for i, template in enumerate(shared) if template not in shared[:i]
+        )
+        code_parts.extend(feature.template.format() for feature in enabled)
+        layers = {name: RUNTIME_FEATURES[name].layer for name in RUNTIME_FEATURES if name in features}
+        if instrument:
+            code_parts.append(SDK_INSTRUMENTATION_TEMPLATE.format())
+            layers["instrument"] = INSTRUMENTATION_TRANSPORT_LAYER
+        code_parts.append(
+            SDK_TRANSPORT_TEMPLATE.format(
+                transport_layers="".join(layers.get(name, "") for name in TRANSPORT_LAYER_ORDER)
+            )
+        )
+        if fast_json:
+            code_parts.append("# JSON properties behind model attributes named differently (HTTPStatus -> http_status).")
+            code_parts.append("_ATTRIBUTE_KEYS: Dict[str, Tuple[str, ...]] = {")
+            code_parts.extend(
+                f"    {name!r}: {properties!r},"
+                for name, properties in sorted((attribute_keys or {}).items())
+            )
+            code_parts.append("}")
+            code_parts.append(SDK_FAST_JSON_TEMPLATE.format())
+        if has_streams:
+            code_parts.append(SDK_STREAM_TEMPLATE.format())
+        if has_pages:
+            code_parts.append(SDK_PAGINATION_TEMPLATE.format())
+        if has_uploads:
+            code_parts.append(SDK_UPLOAD_TEMPLATE.format())
+    code_parts.extend(
+        [
+            "\n\n".join(namespace_class_definitions),
+            "\n",
+            f"class {sdk_class_name}{mixin}:",
+            "    base_url: str",
+        ]
+    )
+    code_parts.extend(client_fields)
+    code_parts.extend(["", "    def __init__("])
+    init_params = CLIENT_INIT_PARAMS + [param for feature in enabled for param in feature.init_params]
+    if instrument:
+        init_params.append("metrics: bool = False")
+    code_parts.extend(f"        {param}," for param in init_params)
+    if is_stub:
+        signatures = CLIENT_LIFECYCLE_SIGNATURES + [
+            signature for feature in enabled for signature in feature.signatures
+        ]
+        if instrument:
+            signatures += CLIENT_INSTRUMENTATION_SIGNATURES
+        code_parts.append("    ) -> None: ...")
+        code_parts.extend(
+            f"    {line}" if line.startswith("@") else f"    {line} ..."
+            for line in (
+                signature.format(sdk_class=sdk_class_name) for signature in signatures
+            )
+        )
+    else:
+        code_parts.append("    ):")
+        code_parts.extend(
+            [
+                "        self.base_url = base_url",
+                "        self._transport = _PooledTransport.acquire(",
+                "            base_url,",
+                "            share_pool,",
+            ]
+        )
+        transport_options = CLIENT_TRANSPORT_OPTIONS + [
+            param.split(":")[0] for feature in enabled for param in feature.init_params
+        ]
+        code_parts.extend(f"            {name}={name}," for name in transport_options)
+        code_parts.extend(["        )", "        self._raw = self._transport.raw"])
+        if instrument:
+            code_parts.append("        self._instrumentation = _Instrumentation(metrics)")
+        code_parts.extend(client_inits)
+        code_parts.append(
+            CLIENT_LIFECYCLE_METHODS.format(sdk_class=sdk_class_name).rstrip("\n")
+        )
+        code_parts.extend(feature.methods.rstrip("\n") for feature in enabled if feature.methods)
+        if instrument:
+            code_parts.append(
+                CLIENT_INSTRUMENTATION_METHODS.format(
+                    resilience_metrics=(
+                        INSTRUMENTATION_RESILIENCE_METRICS if "resilience" in features else ""
+                    )
+                ).rstrip("\n")
+            )
+
+    if top_level_method_definitions:
+        # Ensure methods are indented correctly within the class
+        indented_top_level_methods = [""]  # Start with a newline for separation
+        for line in "\n".join(top_level_method_definitions).splitlines():
+            indented_top_level_methods.append(f"    {line}" if line.strip() else "")
+        code_parts.extend(indented_top_level_methods)
+
+    if is_stub:
+        source = "\n".join(code_parts) + "\n"
+    elif production:
+        steps.next("prune imports")
+        imports_index = code_parts.index("\n".join(sorted_sdk_imports))
+        code_parts[imports_index] = "\n".join(
+            prune_imports(sorted_sdk_imports, referenced_names("\n".join(code_parts)))
+        )
+        if not is_lazy:
+            # Most of a large module's import time goes to evaluating annotations.
+            code_parts.insert(0, "from __future__ import annotations\n")
+        source = "\n".join(code_parts) + "\n"
+    else:
+        code_parts.extend(
+            [
+                "\n",
+                SDK_TEST_CODE_TEMPLATE.format(pkg_name=pkg_name, sdk_class=sdk_class_name),
+            ]
+        )
+        source = "\n".join(code_parts)
+    steps.close()
+    return source
+
+
+def referenced_names(code: str) -> Set[str]:
+    """Global names `code` reads, including those inside string annotations."""
+    names: Set[str] = set()
+    annotations: List[ast.AST] = []
+    for node in ast.walk(ast.parse(code)):
+        if isinstance(node, ast.Name):
+            names.add(node.id)
+        elif isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)) and node.returns:
+            annotations.append(node.returns)
+        elif isinstance(node, ast.arg) and node.annotation:
+            annotations.append(node.annotation)
+        elif isinstance(node, ast.AnnAssign):
+            annotations.append(node.annotation)
+    for annotation in annotations:
+        for node in ast.walk(annotation):
+            if isinstance(node, ast.Constant) and isinstance(node.value, str):
+                try:
+                    names |= referenced_names(node.value)
+                except SyntaxError:
+                    pass
+    return names
+
+
+def prune_imports(import_lines: List[str], used: Set[str]) -> List[str]:
+    """
+    Drops the names `import_lines` bind that are not in `used`.
+
+    Star imports stay; the other `from` imports of one module are merged
+    into a single line, in order of first appearance.
+    """
+    kept_lines: List[str] = []
+    from_names: Dict[str, List[str]] = {}
+    for line in import_lines:
+        node = ast.parse(line).body[0]
+        assert isinstance(node, (ast.Import, ast.ImportFrom))
+        if isinstance(node, ast.ImportFrom) and any(a.name == "*" for a in node.names):
+            kept_lines.append(line)
+            continue
+        for alias in node.names:
+            if (alias.asname or alias.name.split(".")[0]) not in used:
+                continue
+            name = f"{alias.name} as {alias.asname}" if alias.asname else alias.name
+            if isinstance(node, ast.Import):
+                kept_lines.append(f"import {name}")
+                continue
+            module = f"{'.' * node.level}{node.module or ''}"
+            if module not in from_names:
+                from_names[module] = []
+                kept_lines.append(module)  # placeholder, filled in below
+            if name not in from_names[module]:
+                from_names[module].append(name)
+    return [
+        f"from {line} import {', '.join(from_names[line])}" if line in from_names else line
+        for line in kept_lines
+    ]
+
+
+SDK_SMOKE_TEST_TEMPLATE = """\"\"\"
+Smoke test for `{module}`, kept out of its production build.
+
+Calls every operation that takes no or only simple arguments:
+
+    python {module}_smoke.py
+\"\"\"
+import importlib
+import inspect
+from typing import Any, Callable, Optional, Union
+from uuid import UUID
+
+from {module} import {sdk_class}
+{test_code}"""
+
+
+def render_smoke_test(module: str, pkg_name: str, sdk_class_name: str) -> str:
+    """The `__main__` block of a default wrapper, as a module importing `module`."""
+    return SDK_SMOKE_TEST_TEMPLATE.format(
+        module=module,
+        sdk_class=sdk_class_name,
+        test_code=SDK_TEST_CODE_TEMPLATE.format(pkg_name=pkg_name, sdk_class=sdk_class_name),
+    )
+
+
+SDK_LOAD_TEST_TEMPLATE = """\"\"\"
+Load test for `{module}`, generated alongside it.
+
+Every operation whose arguments can be built from its annotations is called
+by concurrent virtual users through its `*_detailed_async` method. Model
+arguments are filled in recursively (required fields only) with sample
+values for their field types.
+
+    python {module}_loadtest.py --base-url http://localhost:8000 --users 20 --duration 30
+    python {module}_loadtest.py --base-url ... --rps 200 --ramp 10 --read-only --json report.json
+\"\"\"
+import argparse
+import asyncio
+import collections.abc
+import datetime
+import enum
+import inspect
+import io
+import json
+import math
+import random
+import sys
+import time
+import typing
+import uuid
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from attrs import NOTHING
+
+import {pkg_name}.models as _models
+import {pkg_name}.types as _types
+import {module} as _sdk
+
+MAX_MODEL_DEPTH = 8
+
+
+class PayloadFactory:
+    \"\"\"Sample values for annotations; attrs models get their required fields filled.\"\"\"
+
+    def __init__(self, namespace: Dict[str, Any]):
+        self.namespace = {{**vars(typing), **vars(_types), **vars(_models), **namespace}}
+        self._hints: Dict[type, Dict[str, Any]] = {{}}
+        self._parameters: Dict[Callable[..., Any], List[Tuple[str, Any]]] = {{}}
+
+    def _resolve(self, annotation: Any) -> Any:
+        if isinstance(annotation, typing.ForwardRef):
+            annotation = annotation.__forward_arg__
+        if isinstance(annotation, str):
+            annotation = eval(annotation, self.namespace)
+        return annotation
+
+    def value(self, annotation: Any, depth: int = 0) -> Any:
+        annotation = self._resolve(annotation)
+        origin = typing.get_origin(annotation)
+        args = typing.get_args(annotation)
+        if origin is typing.Union:
+            candidates = [arg for arg in args if arg not in (type(None), _types.Unset)]
+            return self.value(candidates[0], depth) if candidates else None
+        if origin in (list, tuple, set, collections.abc.Sequence):
+            item = [self.value(args[0], depth)] if args and args[0] is not Ellipsis else []
+            return origin(item) if origin in (tuple, set) else item
+        if origin is dict or annotation is dict:
+            return {{}}
+        if annotation is Any:
+            return "load-test"
+        if not isinstance(annotation, type):
+            raise LookupError(f"no sample value for {{annotation!r}}")
+        if issubclass(annotation, enum.Enum):
+            return next(iter(annotation))
+        if annotation is bool:
+            return True
+        if annotation is _types.File:
+            return _types.File(payload=io.BytesIO(b"load-test"), file_name="load-test.txt")
+        if hasattr(annotation, "__attrs_attrs__"):
+            return self.model(annotation, depth + 1)
+        for kind, sample in SAMPLE_VALUES:
+            if issubclass(annotation, kind):
+                return sample()
+        raise LookupError(f"no sample value for {{annotation.__name__}}")
+
+    def model(self, cls: type, depth: int) -> Any:
+        if depth > MAX_MODEL_DEPTH:
+            raise LookupError(f"{{cls.__name__}} nests deeper than {{MAX_MODEL_DEPTH}} levels")
+        hints = self._hints.get(cls)
+        if hints is None:
+            hints = self._hints[cls] = typing.get_type_hints(
+                cls, {{**vars(sys.modules[cls.__module__]), **self.namespace}}
+            )
+        return cls(
+            **{{
+                field.name: self.value(hints[field.name], depth)
+                for field in cls.__attrs_attrs__
+                if field.default is NOTHING
+            }}
+        )
+
+    def arguments(self, method: Callable[..., Any]) -> Dict[str, Any]:
+        \"\"\"Fresh keyword arguments for the required parameters of an SDK method.\"\"\"
+        parameters = self._parameters.get(method)
+        if parameters is None:
+            parameters = self._parameters[method] = [
+                (parameter.name, self._resolve(parameter.annotation))
+                for parameter in inspect.signature(method).parameters.values()
+                if parameter.default is inspect.Parameter.empty
+            ]
+        return {{name: self.value(annotation) for name, annotation in parameters}}
+
+
+SAMPLE_VALUES: List[Tuple[type, Callable[[], Any]]] = [
+    (int, lambda: 1),
+    (float, lambda: 1.0),
+    (str, lambda: "load-test"),
+    (bytes, lambda: b"load-test"),
+    (datetime.datetime, lambda: datetime.datetime.now(datetime.timezone.utc)),
+    (datetime.date, datetime.date.today),
+    (uuid.UUID, uuid.uuid4),
+]
+
+
+class Operation:
+    def __init__(self, name: str, http_method: str, call: Callable[..., Any]):
+        self.name = name
+        self.http_method = http_method
+        self.call = call
+        self.latencies: List[float] = []
+        self.errors = 0
+        self.statuses: Dict[str, int] = {{}}
+
+    def record(self, latency: float, status: str, failed: bool) -> None:
+        self.latencies.append(latency)
+        self.statuses[status] = self.statuses.get(status, 0) + 1
+        if failed:
+            self.errors += 1
+
+
+def discover(client: Any, factory: PayloadFactory, names: Optional[List[str]], read_only: bool) -> Tuple[List[Operation], Dict[str, str]]:
+    \"\"\"The operations to drive, and the reasons others were skipped.\"\"\"
+    operations: List[Operation] = []
+    skipped: Dict[str, str] = {{}}
+    for name, (http_method, _) in sorted(_sdk._OPERATION_ROUTES.items()):
+        if names is not None and name not in names:
+            continue
+        if read_only and http_method not in ("GET", "HEAD", "OPTIONS"):
+            skipped[name] = f"{{http_method}} (--read-only)"
+            continue
+        owner = client
+        *namespace, endpoint = name.split(".")
+        for part in namespace:
+            owner = getattr(owner, part)
+        method = getattr(owner, f"{{endpoint}}_detailed_async", None)
+        if method is None:
+            skipped[name] = "no *_detailed_async method"
+            continue
+        try:
+            factory.arguments(method)
+        except Exception as e:  # annotations this factory cannot fill in
+            skipped[name] = f"arguments: {{e}}"
+            continue
+        operations.append(Operation(name, http_method, method))
+    return operations, skipped
+
+
+class Pacer:
+    \"\"\"
+    Hands out start times for `rps` calls per second.
+
+    With a `ramp`, the rate grows linearly from zero over that many seconds.
+    Calls that fall behind schedule start at once, so the offered load does
+    not drop when the service slows down (as long as users are free).
+    \"\"\"
+
+    def __init__(self, rps: Optional[float], ramp: float, started: float):
+        self.rps = rps
+        self.ramp = ramp
+        self.started = started
+        self.issued = 0
+
+    def offset(self, call: int) -> float:
+        \"\"\"Seconds after the start at which call number `call` is due.\"\"\"
+        assert self.rps is not None
+        ramp_calls = self.rps * self.ramp / 2  # calls made during the ramp
+        if call < ramp_calls:
+            return math.sqrt(2 * self.ramp * call / self.rps)
+        return self.ramp / 2 + call / self.rps
+
+    async def wait(self) -> None:
+        if self.rps is None:
+            return
+        slot = self.started + self.offset(self.issued)
+        self.issued += 1
+        delay = slot - time.perf_counter()
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+
+async def virtual_user(index: int, operations: List[Operation], factory: PayloadFactory, pacer: Pacer, users: int, ramp: float, deadline: float) -> None:
+    if pacer.rps is None and ramp:
+        await asyncio.sleep(ramp * index / users)  # users join one after another
+    rng = random.Random(index)
+    while True:
+        await pacer.wait()
+        if time.perf_counter() >= deadline:
+            return
+        operation = rng.choice(operations)
+        kwargs = factory.arguments(operation.call)
+        started = time.perf_counter()
+        try:
+            response = await operation.call(**kwargs)
+            status = int(response.status_code)
+            operation.record(time.perf_counter() - started, str(status), status >= 400)
+        except Exception as e:
+            operation.record(time.perf_counter() - started, type(e).__name__, True)
+
+
+def percentile(samples: List[float], q: float) -> float:
+    ordered = sorted(samples)
+    return ordered[int(round(q * (len(ordered) - 1)))] if ordered else 0.0
+
+
+def summarize(operations: List[Operation], elapsed: float) -> List[Dict[str, Any]]:
+    rows = []
+    everything = Operation("total", "", lambda: None)
+    for operation in operations + [everything]:
+        if operation is everything:
+            for other in operations:
+                everything.latencies += other.latencies
+                everything.errors += other.errors
+                for status, count in other.statuses.items():
+                    everything.statuses[status] = everything.statuses.get(status, 0) + count
+        calls = len(operation.latencies)
+        rows.append(
+            {{
+                "operation": operation.name,
+                "calls": calls,
+                "rps": calls / elapsed if elapsed else 0.0,
+                "error_rate": operation.errors / calls if calls else 0.0,
+                "p50_ms": percentile(operation.latencies, 0.50) * 1000,
+                "p90_ms": percentile(operation.latencies, 0.90) * 1000,
+                "p99_ms": percentile(operation.latencies, 0.99) * 1000,
+                "max_ms": max(operation.latencies, default=0.0) * 1000,
+                "statuses": dict(sorted(operation.statuses.items())),
+            }}
+        )
+    return rows
+
+
+def format_table(rows: List[Dict[str, Any]]) -> str:
+    width = max(len(row["operation"]) for row in rows)
+    lines = [
+        f"{{'operation':<{{width}}}}  {{'calls':>7}}  {{'req/s':>8}}  {{'errors':>7}}"
+        f"  {{'p50':>8}}  {{'p90':>8}}  {{'p99':>8}}  {{'max':>8}}  statuses"
+    ]
+    for row in rows:
+        lines.append(
+            f"{{row['operation']:<{{width}}}}  {{row['calls']:>7}}  {{row['rps']:>8.1f}}  {{row['error_rate']:>7.1%}}"
+            + "".join(f"  {{row[key]:>6.1f}}ms" for key in ("p50_ms", "p90_ms", "p99_ms", "max_ms"))
+            + "  " + " ".join(f"{{status}}:{{count}}" for status, count in row["statuses"].items())
+        )
+    return "\\n".join(lines)
+
+
+async def run(args: argparse.Namespace) -> Dict[str, Any]:
+    headers = dict(header.split(":", 1) for header in args.header)
+    client = _sdk.{sdk_class}(
+        base_url=args.base_url,
+        timeout=args.timeout,
+        headers={{key.strip(): value.strip() for key, value in headers.items()}},
+        max_connections=args.users,
+        max_keepalive_connections=args.users,
+        share_pool=False,
+    )
+    factory = PayloadFactory(vars(_sdk))
+    names = args.operations.split(",") if args.operations else None
+    unknown = sorted(set(names or ()) - set(_sdk._OPERATION_ROUTES))
+    if unknown:
+        raise SystemExit(f"unknown operations: {{', '.join(unknown)}}")
+    operations, skipped = discover(client, factory, names, args.read_only)
+    for name, reason in skipped.items():
+        print(f"skipped {{name}}: {{reason}}")
+    if not operations:
+        raise SystemExit("no operations to run")
+    print(
+        f"{{len(operations)}} operations, {{args.users}} users, {{args.duration:g}}s"
+        + (f", {{args.rps:g}} req/s" if args.rps else "")
+        + (f", {{args.ramp:g}}s ramp" if args.ramp else "")
+    )
+    started = time.perf_counter()
+    pacer = Pacer(args.rps, args.ramp, started)
+    deadline = started + args.duration
+    try:
+        await asyncio.gather(
+            *(
+                virtual_user(index, operations, factory, pacer, args.users, args.ramp, deadline)
+                for index in range(args.users)
+            )
+        )
+    finally:
+        await client.aclose()
+    elapsed = time.perf_counter() - started
+    return {{"elapsed": elapsed, "operations": summarize(operations, elapsed), "skipped": skipped}}
+
+
+def main() -> None:
+    p = argparse.ArgumentParser(description="Load-test a service through {sdk_class}.")
+    p.add_argument("--base-url", default="http://localhost:8000", help="service base URL")
+    p.add_argument("--users", type=int, default=10, help="concurrent virtual users")
+    p.add_argument("--duration", type=float, default=10.0, help="seconds to run")
+    p.add_argument("--rps", type=float, default=None, help="target requests/s over all users")
+    p.add_argument("--ramp", type=float, default=0.0, help="seconds to ramp up users or --rps")
+    p.add_argument("--operations", default=None, help="comma-separated operation names (default: all)")
+    p.add_argument("--read-only", action="store_true", help="only GET, HEAD and OPTIONS operations")
+    p.add_argument("--timeout", type=float, default=30.0, help="per-request timeout in seconds")
+    p.add_argument("--header", action="append", default=[], help="extra header, 'Name: value'")
+    p.add_argument("--json", default=None, help="also write the report to this JSON file")
+    args = p.parse_args()
+
+    report = asyncio.run(run(args))
+    print(format_table(report["operations"]))
+    if args.json:
+        with open(args.json, "w") as file:
+            json.dump(report, file, indent=2)
+
+
+if __name__ == "__main__":
+    main()
+"""
+
+
+def render_load_test(module: str, pkg_name: str, sdk_class_name: str) -> str:
+    """A standalone asyncio load-test script driving `module` (see `SDK_LOAD_TEST_TEMPLATE`)."""
+    return SDK_LOAD_TEST_TEMPLATE.format(
+        module=module, pkg_name=pkg_name, sdk_class=sdk_class_name
+    )
+
+
+IMPORT_REPORT_RUNS = 5
+
+
+def import_report(package: str, class_name: str, scan: PackageScan, **options: Any) -> str:
+    """
+    Compares the default and production wrappers rendered from `scan`.
+
+    Reports source size, `compile()` time, and the module's own and total
+    import time (`-X importtime`, best of `IMPORT_REPORT_RUNS` fresh
+    interpreters with up-to-date bytecode). `options` go to `render_wrapper`.
+    """
+    import py_compile
+    import tempfile
+
+    rows = []
+    with tempfile.TemporaryDirectory() as tmp:
+        search_path = [tmp] + [entry or os.getcwd() for entry in sys.path]
+        env = {**os.environ, "PYTHONPATH": os.pathsep.join(search_path)}
+        for label, production in (("default", False), ("production", True)):
+            module = f"sdk_{label}"
+            source = render_wrapper(
+                package, class_name, scan=scan, production=production, **options
+            )
+            path = Path(tmp) / f"{module}.py"
+            path.write_text(source)
+            compile_times = []
+            for _ in range(3):
+                started = time.perf_counter()
+                compile(source, str(path), "exec")
+                compile_times.append(time.perf_counter() - started)
+            py_compile.compile(str(path), doraise=True)
+            own = total = float("inf")
+            for _ in range(IMPORT_REPORT_RUNS):
+                result = subprocess.run(
+                    [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+                    env=env,
+                    capture_output=True,
+                    text=True,
+                    check=True,
+                )
+                for line in result.stderr.splitlines():
+                    fields = line.split("|")
+                    if len(fields) == 3 and fields[2].strip() == module:
+                        own = min(own, int(fields[0].split(":")[1]) / 1e6)
+                        total = min(total, int(fields[1]) / 1e6)
+            rows.append(
+                (label, len(source.encode()), source.count("\n"), min(compile_times), own, total)
+            )
+
+    lines = [
+        f"{'profile':<10}  {'size':>10}  {'lines':>6}  {'compile':>8}  {'import':>8}  {'with deps':>9}"
+    ]
+    for label, size, line_count, compile_s, own, total in rows:
+        lines.append(
+            f"{label:<10}  {size / 1024:6.1f} KiB  {line_count:>6}  {compile_s * 1000:6.1f}ms"
+            f"  {own * 1000:6.1f}ms  {total * 1000:7.1f}ms"
+        )
+    (_, size, _, compile_s, own, _), (_, new_size, _, new_compile_s, new_own, _) = rows
+    lines.append(
+        f"production: {new_size / size:.0%} of the size, {new_compile_s / compile_s:.0%} of the "
+        f"compile time, {new_own / own:.0%} of the module's own import time"
+    )
+    return "\n".join(lines)
+
+
+def write_if_changed(path: Path, text: str) -> bool:
+    """Writes `text` unless the file already holds it, keeping mtimes stable."""
+    try:
+        if path.read_text() == text:
+            return False
+    except OSError:
+        pass
+    path.write_text(text)
+    return True
+
+
+def generate_wrapper_file(
+    package: str,
+    output: str,
+    class_name: str,
+    static: bool = False,
+    jobs: Optional[int] = None,
+    lazy: bool = False,
+    instrument: bool = False,
+    fast_json: bool = False,
+    verbose: bool = False,
+    manifest_path: Optional[str] = None,
+    spec_path: Optional[str] = None,
+    production: bool = False,
+    report: bool = False,
+    load_test: bool = False,
+    features: Sequence[str] = (),
+) -> bool:
+    """
+    Scans `package` and writes the wrapper (and stub, when lazy) to `output`.
+
+    With `manifest_path` unchanged operations are reused, and nothing is done
+    when the spec and outputs are unchanged; returns False in that case.
+
+    `production` also writes the smoke test as `<output>_smoke.py` and
+    byte-compiles the wrapper and the client package; `report` prints
+    `import_report` for the default and production wrappers. `load_test`
+    writes the load-test script from `render_load_test` as `<output>_loadtest.py`.
+    `features` are the `RUNTIME_FEATURES` the wrapper carries.
+    """
+    output_path = Path(output)
+    stub_path = output_path.with_suffix(".pyi")
+    smoke_path = output_path.with_name(f"{output_path.stem}_smoke.py")
+    load_test_path = output_path.with_name(f"{output_path.stem}_loadtest.py")
+    outputs = [output_path, stub_path] if lazy else [output_path]
+    if production:
+        outputs.append(smoke_path)
+    if load_test:
+        outputs.append(load_test_path)
+    fingerprint = generator_fingerprint(
+        package=package,
+        class_name=class_name,
+        lazy=lazy,
+        instrument=instrument,
+        fast_json=fast_json,
+        production=production,
+        load_test=load_test,
+        features=sorted(features),
+    )
+    manifest: Dict[str, Any] = {}
+    spec_sha256 = file_sha256(Path(spec_path)) if spec_path else None
+    if manifest_path:
+        manifest = load_manifest(Path(manifest_path), fingerprint)
+        if manifest_is_current(manifest, outputs, spec_sha256):
+            print(f"✅  '{output}' is up to date (spec unchanged)")
+            return False
+
+    with profile_span("scan"):
+        scan = scan_package(
+            package,
+            static=static,
+            jobs=jobs,
+            cache=manifest.get("operations", {}) if manifest_path else None,
+        )
+    if verbose:
+        print(f"Annotation cache: {annotation_cache_stats}")
+    spec = json.loads(Path(spec_path).read_text()) if spec_path else None
+    with profile_span("render wrapper"):
+        code = render_wrapper(
+            pkg_name=package,
+            sdk_class_name=class_name,
+            lazy=lazy,
+            scan=scan,
+            instrument=instrument,
+            spec=spec,
+            fast_json=fast_json,
+            production=production,
+            features=features,
+        )
+    with profile_span("write"):
+        write_if_changed(output_path, code)
+    if lazy:
+        with profile_span("render stub"):
+            stub = render_stub(
+                package,
+                class_name,
+                scan=scan,
+                instrument=instrument,
+                spec=spec,
+                fast_json=fast_json,
+                features=features,
+            )
+        write_if_changed(stub_path, stub)
+        print(f"✅  Wrote type stub '{stub_path}'")
+    print(f"✅  Wrote '{output}' with class '{class_name}'")
+    if production:
+        import compileall
+        import py_compile
+
+        write_if_changed(smoke_path, render_smoke_test(output_path.stem, package, class_name))
+        print(f"✅  Wrote smoke test '{smoke_path}'")
+        with profile_span("byte-compile"):
+            py_compile.compile(str(output_path), doraise=True)
+            pkg_dir = find_package_dir(package)
+            if pkg_dir is not None:
+                compileall.compile_dir(str(pkg_dir), quiet=1)
+        print("✅  Byte-compiled the wrapper and the client package")
+    if load_test:
+        write_if_changed(load_test_path, render_load_test(output_path.stem, package, class_name))
+        print(f"✅  Wrote load test '{load_test_path}'")
+    if report:
+        print(
+            import_report(
+                package,
+                class_name,
+                scan,
+                lazy=lazy,
+                instrument=instrument,
+                spec=spec,
+                fast_json=fast_json,
+                features=features,
+            )
+        )
+    if manifest_path:
+        Path(manifest_path).write_text(
+            json.dumps(
+                build_manifest(fingerprint, scan, outputs, spec_sha256), indent=2
+            )
+        )
+    return True
+
+
+class BatchSpec(NamedTuple):
+    name: str
+    spec: str
+    class_name: str
+
+
+class BatchSpecResult(NamedTuple):
+    name: str
+    status: str  # "generated", "unchanged" or "failed"
+    timings: Dict[str, float]
+    error: Optional[str] = None
+
+
+def load_batch_manifest(path: Path) -> List[BatchSpec]:
+    """
+    Reads a batch manifest: `{"specs": [{"name", "spec", "class_name"?}, ...]}`.
+
+    `spec` is a URL or a path relative to the manifest; `name` becomes the
+    output directory and (as an identifier) the client package prefix.
+    """
+    data = json.loads(path.read_text())
+    entries: List[BatchSpec] = []
+    for item in data["specs"] if isinstance(data, dict) else data:
+        name = item["name"]
+        spec = item["spec"]
+        if "://" not in spec:
+            spec = str((path.parent / spec).resolve())
+        class_name = item.get("class_name") or f"{get_pascal_case(name)}Client"
+        entries.append(BatchSpec(name, spec, class_name))
+    names = [entry.name for entry in entries]
+    duplicates = sorted({name for name in names if names.count(name) > 1})
+    if duplicates:
+        raise ValueError(f"duplicate names in {path}: {', '.join(duplicates)}")
+    return sorted(entries)
+
+
+def read_spec_source(source: str) -> bytes:
+    """The spec at `source`, a local path or an http(s) URL."""
+    if "://" in source:
+        with urllib.request.urlopen(source, timeout=60) as response:
+            return response.read()
+    return Path(source).read_bytes()
+
+
+EXAMPLE_USAGE_TEMPLATE = """#!/usr/bin/env python3
+\"\"\"
+Example usage of the generated SDK.
+Generated from: {source}
+\"\"\"
+
+from {module} import {class_name}
+
+# Initialize the client (using keyword arguments)
+client = {class_name}(
+    base_url="{base_url}"  # Extracted from your OpenAPI JSON URL
+)
+
+# Example usage (adjust based on your API)
+try:
+    # List available methods
+    result = client.health_check()
+    print(f"Health check result: {{result}}")
+
+except Exception as e:
+    print(f"Error using SDK: {{e}}")
+    print("Make sure your API server is running and accessible!")
+"""
+
+# Importable module -> pip requirement for the client-generation step.
+GENERATE_REQUIREMENTS = {
+    "openapi_python_client": "openapi-python-client==0.15.2",
+    "httpx": "httpx",
+    "attrs": "attrs",
+    "dateutil": "python-dateutil",
+}
+
+
+def missing_requirements() -> List[str]:
+    """Requirements of `generate` that are not importable (checked without importing)."""
+    import importlib.util
+
+    return [
+        requirement
+        for module, requirement in GENERATE_REQUIREMENTS.items()
+        if importlib.util.find_spec(module) is None
+    ]
+
+
+@contextlib.contextmanager
+def _stage(name: str, timings: Dict[str, float]) -> Iterator[None]:
+    started = time.perf_counter()
+    with profile_span(name):
+        yield
+    timings[name] = time.perf_counter() - started
+    print(f"  {name:<8} {timings[name]:6.2f}s")
+
+
+def generate_client_package(
+    spec_path: Path, work_dir: Path, package: str, format_code: bool = True
+) -> None:
+    """
+    Runs openapi-python-client in-process, (re)creating `work_dir/package`.
+
+    `format_code=False` skips its autoflake/isort/black post hooks, which
+    take most of its time on large specs and do not affect the wrapper.
+    """
+    from openapi_python_client import MetaType, create_new_client
+    from openapi_python_client.config import Config
+    from openapi_python_client.parser.errors import ErrorLevel
+
+    config = Config(
+        package_name_override=package,
+        project_name_override=package,
+        **({} if format_code else {"post_hooks": []}),
+    )
+    spec_path = spec_path.resolve()
+    shutil.rmtree(work_dir / package, ignore_errors=True)
+    cwd = os.getcwd()
+    os.chdir(work_dir)  # the generator writes relative to the working directory
+    try:
+        errors = create_new_client(
+            url=None, path=spec_path, meta=MetaType.NONE, config=config
+        )
+    finally:
+        os.chdir(cwd)
+    fatal = []
+    for error in errors:
+        if error.level == ErrorLevel.ERROR:
+            fatal.append(error)
+        else:
+            print(f"Warning: {error.header}: {error.detail}")
+    if fatal or not (work_dir / package).is_dir():
+        raise RuntimeError(
+            "; ".join(f"{e.header}: {e.detail}" for e in fatal)
+            or f"openapi-python-client did not create '{package}'"
+        )
+
+
+def generate_from_spec(
+    source: str,
+    output_dir: Path,
+    package: str,
+    output: str,
+    class_name: str,
+    force: bool = False,
+    format_code: bool = True,
+    write_example: bool = True,
+    timings: Optional[Dict[str, float]] = None,
+    **options: Any,
+) -> bool:
+    """
+    The whole pipeline for one spec (file or URL), in this process.
+
+    Writes `openapi.json`, the client `package`, the wrapper `output` with
+    its manifest and, optionally, `example_usage.py` into `output_dir`, and
+    records each stage's time in `timings`. An unchanged spec is a no-op
+    (returns False) unless `force`. `options` go to `generate_wrapper_file`.
+    """
+    timings = {} if timings is None else timings
+    with _stage("fetch", timings):
+        spec_bytes = read_spec_source(source)
+        output_dir.mkdir(parents=True, exist_ok=True)
+        spec_path = output_dir / "openapi.json"
+        if not spec_path.is_file() or spec_path.read_bytes() != spec_bytes:
+            spec_path.write_bytes(spec_bytes)
+
+    output_path = output_dir / output
+    manifest_path = output_path.with_suffix(".manifest.json")
+    if force:
+        manifest_path.unlink(missing_ok=True)
+    with _stage("client", timings):
+        try:
+            previous_sha256 = json.loads(manifest_path.read_text()).get("spec_sha256")
+        except (OSError, ValueError, AttributeError):
+            previous_sha256 = None
+        # The client package only depends on the spec; options only affect the wrapper.
+        client_current = (
+            previous_sha256 == file_sha256(spec_path) and (output_dir / package).is_dir()
+        )
+        if not client_current:
+            generate_client_package(spec_path, output_dir, package, format_code)
+
+    with _stage("wrapper", timings):
+        sys.path.insert(0, str(output_dir.resolve()))
+        importlib.invalidate_caches()
+        generated = generate_wrapper_file(
+            package,
+            str(output_path),
+            class_name,
+            manifest_path=str(manifest_path),
+            spec_path=str(spec_path),
+            **options,
+        )
+
+    if write_example and (generated or not client_current):
+        base_url = "http://localhost:8000"
+        if "://" in source:
+            base_url = re.sub(r"/(openapi\.json|docs|redoc).*$", "", source)
+        write_if_changed(
+            output_dir / "example_usage.py",
+            EXAMPLE_USAGE_TEMPLATE.format(
+                source=source,
+                module=output_path.stem,
+                class_name=class_name,
+                base_url=base_url,
+            ),
+        )
+    return generated or not client_current
+
+
+def _generate_batch_entry(
+    entry: BatchSpec, output_dir: str, options: Dict[str, Any]
+) -> BatchSpecResult:
+    """
+    Process-pool task: runs `generate_from_spec` for one manifest entry.
+
+    Everything imported from the generated package is dropped again before
+    returning, so the next spec handled by this worker starts clean.
+    """
+    timings: Dict[str, float] = {}
+    started = time.perf_counter()
+    slug = re.sub(r"\W", "_", entry.name).lower()
+    package = f"{slug}_client"
+    sys_path = list(sys.path)
+    log = io.StringIO()
+    try:
+        with contextlib.redirect_stdout(log):
+            generated = generate_from_spec(
+                entry.spec,
+                Path(output_dir) / entry.name,
+                package,
+                f"{slug}_sdk.py",
+                entry.class_name,
+                write_example=False,
+                timings=timings,
+                **options,
+            )
+        timings["total"] = time.perf_counter() - started
+        return BatchSpecResult(entry.name, "generated" if generated else "unchanged", timings)
+    except Exception as e:
+        lines = f"{type(e).__name__}: {e}".splitlines()
+        if len(lines) > 10:
+            lines = lines[:10] + [f"... ({len(lines) - 10} more lines)"]
+        timings["total"] = time.perf_counter() - started
+        return BatchSpecResult(entry.name, "failed", timings, "\n".join(lines))
+    finally:
+        sys.path[:] = sys_path
+        for module in [m for m in sys.modules if m == package or m.startswith(f"{package}.")]:
+            del sys.modules[module]
+
+
+def run_batch(
+    entries: List[BatchSpec],
+    output_dir: str,
+    jobs: Optional[int] = None,
+    **options: Any,
+) -> List[BatchSpecResult]:
+    """
+    Generates every entry in a process pool and returns results in entry order.
+
+    A failing spec does not stop the others. `options` are passed on to
+    `generate_from_spec` (format_code, static, lazy, instrument, fast_json,
+    features).
+    """
+    results: Dict[str, BatchSpecResult] = {}
+    workers = min(jobs or os.cpu_count() or 1, max(len(entries), 1))
+    with concurrent.futures.ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = {
+            pool.submit(_generate_batch_entry, entry, output_dir, options): entry
+            for entry in entries
+        }
+        for future in concurrent.futures.as_completed(futures):
+            entry = futures[future]
+            try:
+                result = future.result()
+            except Exception as e:  # the worker process itself died
+                result = BatchSpecResult(entry.name, "failed", {}, f"{type(e).__name__}: {e}")
+            results[entry.name] = result
+            print(f"  {result.status:<9} {entry.name}", flush=True)
+    return [results[entry.name] for entry in entries]
+
+
+def format_batch_summary(results: List[BatchSpecResult]) -> str:
+    stages = ("fetch", "client", "wrapper", "total")
+    width = max([len(r.name) for r in results] + [4])
+    lines = [
+        f"{'spec':<{width}}  {'status':<9}"
+        + "".join(f"  {stage:>8}" for stage in stages)
+    ]
+    for result in results:
+        lines.append(
+            f"{result.name:<{width}}  {result.status:<9}"
+            + "".join(
+                f"  {result.timings[stage]:7.2f}s" if stage in result.timings else f"  {'-':>8}"
+                for stage in stages
+            )
+        )
+    failed = [result for result in results if result.status == "failed"]
+    lines.append(f"{len(results) - len(failed)} ok, {len(failed)} failed")
+    for result in failed:
+        lines.append(f"\n❌  {result.name}:")
+        lines.extend(f"    {line}" for line in (result.error or "").splitlines())
+    return "\n".join(lines)
+
+
+RUNTIME_CACHE_DIR = Path(
+    os.environ.get("SDK_AUTOGEN_CACHE") or Path.home() / ".cache" / "sdk_autogen"
+)
+RUNTIME_CACHE_ENTRIES = 32
+_CACHE_COMPLETE = "complete"  # written last; an entry without it is unfinished
+
+
+@contextlib.contextmanager
+def _file_lock(path: Path) -> Iterator[None]:
+    """Holds an exclusive lock on `path` across processes (flock, msvcrt on Windows)."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "a+b") as handle:
+        if os.name == "nt":
+            import msvcrt
+
+            while True:
+                try:
+                    handle.seek(0)
+                    msvcrt.locking(handle.fileno(), msvcrt.LK_LOCK, 1)
+                    break
+                except OSError:  # LK_LOCK gives up after 10 seconds; keep waiting
+                    pass
+            try:
+                yield
+            finally:
+                handle.seek(0)
+                msvcrt.locking(handle.fileno(), msvcrt.LK_UNLCK, 1)
+        else:
+            import fcntl
+
+            fcntl.flock(handle.fileno(), fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(handle.fileno(), fcntl.LOCK_UN)
+
+
+def _forget_cache_modules(name: str) -> None:
+    """Drops entry `name`'s wrapper and client package from `sys.modules`."""
+    for module in [m for m in sys.modules if m == name or m.startswith(f"{name}_client")]:
+        del sys.modules[module]
+
+
+def _build_cache_entry(
+    spec_bytes: bytes, root: Path, name: str, class_name: str, options: Dict[str, Any]
+) -> None:
+    """Generates entry `name` in a scratch directory, then moves it into place and compiles it."""
+    import compileall
+
+    for stale in root.glob(".tmp-*"):  # left behind by a builder that died
+        shutil.rmtree(stale, ignore_errors=True)
+    scratch = root / f".tmp-{name}-{os.getpid()}"
+    scratch.mkdir(parents=True)
+    sys_path = list(sys.path)
+    try:
+        spec_path = scratch / "openapi.json"
+        spec_path.write_bytes(spec_bytes)
+        with contextlib.redirect_stdout(io.StringIO()):
+            generate_client_package(spec_path, scratch, f"{name}_client", format_code=False)
+            sys.path.insert(0, str(scratch))
+            # Static scanning never imports the package from the scratch path.
+            generate_wrapper_file(
+                f"{name}_client",
+                str(scratch / f"{name}.py"),
+                class_name,
+                static=True,
+                spec_path=str(spec_path),
+                production=True,
+                **options,
+            )
+    except BaseException:
+        shutil.rmtree(scratch, ignore_errors=True)
+        raise
+    finally:
+        sys.path[:] = sys_path
+    # Anything imported from the scratch path would go stale once it is moved.
+    _forget_cache_modules(name)
+    entry = root / name
+    shutil.rmtree(entry, ignore_errors=True)
+    os.replace(scratch, entry)
+    # Forced, so code objects name the entry's files rather than the scratch copies.
+    compileall.compile_dir(str(entry), quiet=1, force=True)
+    (entry / _CACHE_COMPLETE).write_text(json.dumps({"class_name": class_name, **options}))
+
+
+def _evict_cache_entries(root: Path, max_entries: int, keep: str) -> None:
+    """Removes the least recently loaded entries beyond `max_entries`."""
+    entries = []
+    for marker in root.glob(f"sdk_*/{_CACHE_COMPLETE}"):
+        try:
+            entries.append((marker.stat().st_mtime, marker.parent))
+        except OSError:
+            pass
+    entries.sort(reverse=True)
+    for _, entry in entries[max(max_entries, 1):]:
+        if entry.name != keep:
+            shutil.rmtree(entry, ignore_errors=True)
+
+
+def _import_cache_entry(root: Path, name: str) -> ModuleType:
+    entry = str(root / name)
+    if entry not in sys.path:
+        sys.path.insert(0, entry)
+    importlib.invalidate_caches()
+    return importlib.import_module(name)
+
+
+def load_client(
+    source: Union[str, Path],
+    class_name: str = "GeneratedClient",
+    cache_dir: Optional[Union[str, Path]] = None,
+    max_entries: int = RUNTIME_CACHE_ENTRIES,
+    lazy: bool = False,
+    instrument: bool = False,
+    fast_json: bool = False,
+    features: Sequence[str] = (),
+) -> ModuleType:
+    """
+    Imports the SDK for the spec at `source` (path or URL), generating it on a miss.
+
+    Entries live in `cache_dir` (default `$SDK_AUTOGEN_CACHE` or
+    `~/.cache/sdk_autogen`), keyed by the spec's hash, this generator and
+    the options, and are built with the production profile. Hits take no
+    lock; misses build under a file lock, so concurrent processes generate a
+    spec once, and then evict the least recently loaded entries beyond
+    `max_entries`.
+    Returns the wrapper module; the client class is `module.<class_name>`.
+    """
+    spec_bytes = read_spec_source(str(source))
+    options = {
+        "lazy": lazy,
+        "instrument": instrument,
+        "fast_json": fast_json,
+        "features": tuple(sorted(features)),
+    }
+    digest = hashlib.sha256(spec_bytes)
+    digest.update(generator_fingerprint(class_name=class_name, **options).encode())
+    name = f"sdk_{digest.hexdigest()[:24]}"
+    if name in sys.modules:
+        return sys.modules[name]
+
+    root = Path(cache_dir) if cache_dir is not None else RUNTIME_CACHE_DIR
+    marker = root / name / _CACHE_COMPLETE
+    if marker.is_file():
+        try:
+            os.utime(marker)  # recency for eviction
+            return _import_cache_entry(root, name)
+        except (OSError, ImportError):  # evicted by another process meanwhile
+            _forget_cache_modules(name)
+    with _file_lock(root / ".lock"):
+        if not marker.is_file():
+            _build_cache_entry(spec_bytes, root, name, class_name, options)
+            _evict_cache_entries(root, max_entries, keep=name)
+        os.utime(marker)
+        return _import_cache_entry(root, name)
+
+
+MOCK_STATS_PATH = "/__mock__/stats"
+MOCK_STREAM_CHUNK = 1024  # bytes per chunk of a streamed binary response
+MOCK_STRING_FORMATS = {
+    "date-time": "2024-01-01T00:00:00+00:00",
+    "date": "2024-01-01",
+    "time": "00:00:00",
+    "uuid": "00000000-0000-4000-8000-000000000000",
+    "email": "mock@example.com",
+    "uri": "https://example.com/mock",
+    "url": "https://example.com/mock",
+    "hostname": "example.com",
+    "ipv4": "127.0.0.1",
+    "ipv6": "::1",
+    "byte": "bW9jaw==",
+}
+_MOCK_OMIT = object()  # a value that would recurse into a schema being built
+
+
+class MockOptions(NamedTuple):
+    """How `MockApp` answers: delays, injected errors and response sizes."""
+
+    latency: float = 0.0  # seconds before every response
+    jitter: float = 0.0  # up to this many extra seconds, uniformly distributed
+    error_rate: float = 0.0  # fraction of matched requests answered with an error
+    error_statuses: Tuple[int, ...] = (500, 503)
+    retry_after: Optional[float] = None  # Retry-After of injected 429 and 503 responses
+    array_items: int = 3  # items per array and map, within minItems/maxItems
+    string_length: int = 8  # characters per free-form string, within minLength/maxLength
+    stream_items: int = 10  # events, lines or chunks per streamed response
+    seed: Optional[int] = None  # same seed and request order, same delays and errors
+
+
+class MockRoute(NamedTuple):
+    operation: str
+    pattern: "re.Pattern[str]"
+    status: int
+    content_type: Optional[str]
+    body: bytes  # the whole body, or one event, line or chunk when streamed
+    stream: Optional[str]  # "sse", "ndjson" or "bytes", as in STREAM_MEDIA_TYPES
+
+
+def _mock_number(schema: Dict[str, Any], value: float, step: float) -> float:
+    """`value` moved inside the schema's bounds; exclusive ones are kept `step` away."""
+    multiple = schema.get("multipleOf")
+    if multiple:
+        value = -(-value // multiple) * multiple
+    bounds: List[Optional[float]] = []
+    for key, sign in (("minimum", 1), ("maximum", -1)):
+        bound = schema.get(key)
+        exclusive = schema.get(f"exclusive{key.capitalize()}")
+        if isinstance(exclusive, bool):  # OpenAPI 3.0: a flag on minimum/maximum
+            if exclusive and bound is not None:
+                bound += sign * step
+        elif exclusive is not None:  # OpenAPI 3.1: the bound itself
+            bound = exclusive + sign * step
+        bounds.append(bound)
+    low, high = bounds
+    if low is not None:
+        value = max(value, low)
+    if high is not None:
+        value = min(value, high)
+    return value
+
+
+def _mock_nullable(spec: Dict[str, Any], schema: Any, required: bool) -> bool:
+    """Whether a property may be left out (`required` False) or null."""
+    schema = _resolve_schema(spec, schema)
+    kinds = schema.get("type")
+    return (
+        not required
+        or bool(schema.get("nullable"))
+        or (isinstance(kinds, list) and "null" in kinds)
+        or any(
+            _resolve_schema(spec, choice).get("type") == "null"
+            for choice in schema.get("anyOf", []) + schema.get("oneOf", [])
+        )
+    )
+
+
+def mock_value(
+    spec: Dict[str, Any], schema: Any, options: MockOptions, refs: Tuple[str, ...] = ()
+) -> Any:
+    """
+    A JSON value valid against `schema`, with arrays and strings sized by `options`.
+
+    `const`, `enum`, and the `example`/`default` of scalars are used as they
+    are. Next-page cursors (`PAGE_CURSOR_FIELDS`) are left out or null where
+    the schema allows it, so paginated operations return a single page.
+    Returns `_MOCK_OMIT` where the value would recurse into one of `refs`,
+    so the optional property or array item holding it is left out.
+    """
+    if not isinstance(schema, dict):
+        return None
+    ref = schema.get("$ref")
+    if ref is not None:
+        if ref in refs:
+            return _MOCK_OMIT
+        return mock_value(spec, _resolve_schema(spec, schema), options, refs + (ref,))
+    if "const" in schema:
+        return schema["const"]
+    if "enum" in schema:
+        return next((value for value in schema["enum"] if value is not None), None)
+    if "allOf" in schema:
+        merged: Dict[str, Any] = {}
+        for part in schema["allOf"] + [{k: v for k, v in schema.items() if k != "allOf"}]:
+            value = mock_value(spec, part, options, refs)
+            if value is _MOCK_OMIT:
+                return _MOCK_OMIT
+            if not isinstance(value, dict):
+                return value
+            merged.update(value)
+        return merged
+    for key in ("oneOf", "anyOf"):
+        if key not in schema:
+            continue
+        nullable = False
+        for choice in schema[key]:
+            if _resolve_schema(spec, choice).get("type") == "null":
+                nullable = True
+                continue
+            value = mock_value(spec, choice, options, refs)
+            if value is not _MOCK_OMIT:
+                return value
+        return None if nullable or schema.get("nullable") else _MOCK_OMIT
+
+    kind = schema.get("type")
+    if isinstance(kind, list):
+        kind = next((item for item in kind if item != "null"), "null")
+    if kind is None and ("properties" in schema or "additionalProperties" in schema):
+        kind = "object"
+    elif kind is None and "items" in schema:
+        kind = "array"
+    if kind not in ("object", "array"):
+        if "example" in schema:
+            return schema["example"]
+        if isinstance(schema.get("examples"), list) and schema["examples"]:
+            return schema["examples"][0]
+        if "default" in schema:
+            return schema["default"]
+
+    if kind == "null":
+        return None
+    if kind == "object":
+        value = {}
+        required = set(schema.get("required") or ())
+        for name, prop in (schema.get("properties") or {}).items():
+            if name in PAGE_CURSOR_FIELDS and _mock_nullable(spec, prop, name in required):
+                # A canned next-page cursor would page forever; end after one page.
+                if name in required:
+                    value[name] = None
+                continue
+            item = mock_value(spec, prop, options, refs)
+            if item is _MOCK_OMIT:
+                if name in required:
+                    return _MOCK_OMIT
+                continue
+            value[name] = item
+        extra = schema.get("additionalProperties")
+        if not value and isinstance(extra, dict):
+            item = mock_value(spec, extra, options, refs)
+            if item is not _MOCK_OMIT:
+                value = {f"key{i}": item for i in range(options.array_items)}
+        return value
+    if kind == "array":
+        low = schema.get("minItems", 0)
+        count = max(low, min(options.array_items, schema.get("maxItems", options.array_items)))
+        item = mock_value(spec, schema.get("items", {}), options, refs)
+        if item is _MOCK_OMIT:
+            return _MOCK_OMIT if low else []
+        return [item] * count
+    if kind == "integer":
+        return int(_mock_number(schema, 1, 1))
+    if kind == "number":
+        return float(_mock_number(schema, 1.5, 0.5))
+    if kind == "boolean":
+        return True
+    if schema.get("format") in MOCK_STRING_FORMATS:
+        return MOCK_STRING_FORMATS[schema["format"]]
+    length = max(
+        schema.get("minLength", 0),
+        min(options.string_length, schema.get("maxLength", options.string_length)),
+    )
+    return ("mock" * (length // 4 + 1))[:length]
+
+
+def _mock_response(spec: Dict[str, Any], operation: Dict[str, Any]) -> Tuple[int, Dict[str, Any]]:
+    """The status and (resolved) response object of an operation's first 2xx response."""
+    responses = operation["responses"]
+    success = sorted(str(status) for status in responses if str(status).startswith("2"))
+    key = success[0] if success else "default"
+    response = responses.get(key, responses.get(int(key)) if key.isdigit() else None) or {}
+    if "$ref" in response:
+        name = response["$ref"].rsplit("/", 1)[-1]
+        response = ((spec.get("components") or {}).get("responses") or {}).get(name) or {}
+    return (int(key) if key.isdigit() else 200), response
+
+
+def mock_routes(spec: Dict[str, Any], options: MockOptions) -> List[Tuple[str, str, MockRoute]]:
+    """`(method, path, route)` with a pre-rendered response for every operation in `spec`."""
+    routes = []
+    for path, path_item in (spec.get("paths") or {}).items():
+        for http_method, operation in path_item.items():
+            if not isinstance(operation, dict) or "responses" not in operation:
+                continue
+            status, response = _mock_response(spec, operation)
+            content = response.get("content") or {}
+            content_type: Optional[str] = None
+            body = b""
+            stream = None
+            if content and status not in (204, 304):
+                base_types = {media_type.split(";")[0].strip().lower(): media_type for media_type in content}
+                base = next(
+                    (t for t in base_types if "json" in t and t not in STREAM_MEDIA_TYPES),
+                    next(iter(base_types)),
+                )
+                content_type = base_types[base]
+                schema = (content[content_type] or {}).get("schema") or {}
+                value = mock_value(spec, schema, options)
+                value = None if value is _MOCK_OMIT else value
+                stream = STREAM_MEDIA_TYPES.get(base)
+                if stream is None and "json" not in base and schema.get("format") == "binary":
+                    stream = "bytes"
+                if stream == "sse":
+                    data = value if isinstance(value, str) else json.dumps(value)
+                    body = b"data: " + data.encode() + b"\n\n"
+                elif stream == "ndjson":
+                    body = json.dumps(value).encode() + b"\n"
+                elif stream == "bytes":
+                    body = bytes(MOCK_STREAM_CHUNK)
+                elif "json" in base or not isinstance(value, str):
+                    body = json.dumps(value).encode()
+                else:
+                    body = value.encode()
+            name = operation.get("operationId") or f"{http_method.upper()} {path}"
+            pattern = re.compile(route_pattern(path))
+            routes.append(
+                (http_method.upper(), path, MockRoute(name, pattern, status, content_type, body, stream))
+            )
+    return routes
+
+
+class MockApp:
+    """
+    ASGI app answering every operation of an OpenAPI spec with a canned response.
+
+    Responses are rendered once from each operation's first 2xx response
+    schema (see `mock_value`), then sent after the configured delay unless
+    an error is injected. Request bodies are read and ignored.
+    `GET /openapi.json` returns the spec (unless the spec has that path) and
+    `GET /__mock__/stats` the requests and injected errors per operation.
+    """
+
+    def __init__(self, spec: Dict[str, Any], options: Optional[MockOptions] = None):
+        options = MockOptions() if options is None else options
+        self.options = options
+        self.random = random.Random(options.seed)
+        self.spec_body = json.dumps(spec).encode()
+        self.literal: Dict[Tuple[str, str], MockRoute] = {}
+        # Templated paths by method and segment count, fewest parameters first.
+        self.templated: Dict[Tuple[str, int], List[MockRoute]] = {}
+        routes = mock_routes(spec, options)
+        for method, path, route in sorted(routes, key=lambda r: r[1].count("{")):
+            if "{" in path:
+                self.templated.setdefault((method, path.count("/")), []).append(route)
+            else:
+                self.literal[(method, path)] = route
+        self.operations = len(routes)
+        self.stats: Dict[str, Dict[str, int]] = {}
+
+    def match(self, method: str, path: str) -> Optional[MockRoute]:
+        route = self.literal.get((method, path))
+        if route is None:
+            for candidate in self.templated.get((method, path.count("/")), ()):
+                if candidate.pattern.fullmatch(path):
+                    return candidate
+        return route
+
+    async def _send(
+        self,
+        send: Callable[..., Any],
+        status: int,
+        content_type: Optional[str],
+        body: bytes,
+        headers: Sequence[Tuple[bytes, bytes]] = (),
+    ) -> None:
+        response_headers = list(headers)
+        if status not in (204, 304):
+            response_headers.append((b"content-length", str(len(body)).encode()))
+        if content_type:
+            response_headers.append((b"content-type", content_type.encode()))
+        await send({"type": "http.response.start", "status": status, "headers": response_headers})
+        await send({"type": "http.response.body", "body": body})
+
+    async def __call__(self, scope: Dict[str, Any], receive: Callable[..., Any], send: Callable[..., Any]) -> None:
+        if scope["type"] == "lifespan":
+            while True:
+                message = await receive()
+                if message["type"] == "lifespan.startup":
+                    await send({"type": "lifespan.startup.complete"})
+                elif message["type"] == "lifespan.shutdown":
+                    await send({"type": "lifespan.shutdown.complete"})
+                    return
+        if scope["type"] != "http":
+            return
+        more_body = True
+        while more_body:
+            message = await receive()
+            if message["type"] == "http.disconnect":
+                return
+            more_body = message.get("more_body", False)
+
+        method, path = scope["method"], scope["path"]
+        route = self.match(method, path)
+        if route is None:
+            if method == "GET" and path == MOCK_STATS_PATH:
+                await self._send(send, 200, "application/json", json.dumps(self.stats).encode())
+            elif method == "GET" and path == "/openapi.json":
+                await self._send(send, 200, "application/json", self.spec_body)
+            else:
+                await self._send(send, 404, "application/json", b'{"detail": "Not Found"}')
+            return
+
+        options = self.options
+        counts = self.stats.setdefault(route.operation, {"requests": 0, "errors": 0})
+        counts["requests"] += 1
+        delay = options.latency + options.jitter * self.random.random()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        if options.error_rate and self.random.random() < options.error_rate:
+            counts["errors"] += 1
+            status = self.random.choice(options.error_statuses)
+            headers = []
+            if options.retry_after is not None and status in (429, 503):
+                headers.append((b"retry-after", f"{options.retry_after:g}".encode()))
+            await self._send(send, status, "application/json", b'{"detail": "injected error"}', headers)
+            return
+        if route.stream is None:
+            await self._send(send, route.status, route.content_type, route.body)
+            return
+        headers = [(b"content-type", (route.content_type or "").encode())]
+        await send({"type": "http.response.start", "status": route.status, "headers": headers})
+        for _ in range(options.stream_items):
+            await send({"type": "http.response.body", "body": route.body, "more_body": True})
+        await send({"type": "http.response.body", "body": b""})
+
+
+def mock_main(argv: List[str]) -> None:
+    """`python sdk_autogen.py mock <spec>`: serves `MockApp` for a spec with uvicorn."""
+    p = argparse.ArgumentParser(
+        prog="sdk_autogen mock",
+        description="Serve schema-valid canned responses for every operation in an OpenAPI spec.",
+    )
+    p.add_argument("spec", help="OpenAPI JSON file or URL")
+    p.add_argument("--host", default="127.0.0.1", help="interface to listen on")
+    p.add_argument("--port", type=int, default=8000, help="port to listen on")
+    p.add_argument("--latency-ms", type=float, default=0.0, help="delay before every response")
+    p.add_argument("--jitter-ms", type=float, default=0.0, help="up to this much extra delay, uniformly")
+    p.add_argument(
+        "--error-rate", type=float, default=0.0, help="fraction of requests answered with an injected error"
+    )
+    p.add_argument(
+        "--error-status",
+        type=int,
+        action="append",
+        default=None,
+        help="status of injected errors; repeat for a random choice (default: 500 and 503)",
+    )
+    p.add_argument(
+        "--retry-after", type=float, default=None, help="Retry-After seconds on injected 429/503 responses"
+    )
+    p.add_argument("--array-items", type=int, default=3, help="items per array and map in responses")
+    p.add_argument("--string-length", type=int, default=8, help="characters per free-form string")
+    p.add_argument("--stream-items", type=int, default=10, help="events, lines or 1 KiB chunks per stream")
+    p.add_argument("--seed", type=int, default=None, help="seed for delays and injected errors")
+    args = p.parse_args(argv)
+    try:
+        import uvicorn
+    except ImportError:
+        p.error("the mock server needs uvicorn (pip install uvicorn)")
+
+    options = MockOptions(
+        latency=args.latency_ms / 1000,
+        jitter=args.jitter_ms / 1000,
+        error_rate=args.error_rate,
+        error_statuses=tuple(args.error_status or MockOptions._field_defaults["error_statuses"]),
+        retry_after=args.retry_after,
+        array_items=args.array_items,
+        string_length=args.string_length,
+        stream_items=args.stream_items,
+        seed=args.seed,
+    )
+    app = MockApp(json.loads(read_spec_source(args.spec)), options)
+    print(f"Mocking {app.operations} operations from {args.spec} on http://{args.host}:{args.port}")
+    uvicorn.run(app, host=args.host, port=args.port, log_level="warning", access_log=False)
+
+
+def add_profile_arguments(p: argparse.ArgumentParser) -> None:
+    p.add_argument(
+        "--profile",
+        metavar="TRACE_JSON",
+        default=None,
+        help="record per-stage and per-endpoint time and memory into a Chrome trace "
+        "(also opens in speedscope) and print the slowest endpoints; scans in one process",
+    )
+    p.add_argument(
+        "--profile-top", type=int, default=10, help="endpoints listed in the --profile summary"
+    )
+    p.add_argument(
+        "--profile-no-memory",
+        action="store_true",
+        help="skip tracemalloc under --profile (faster, no memory deltas)",
+    )
+
+
+def generate_main(argv: List[str]) -> None:
+    """`python -m sdk_autogen generate <spec>`: the standalone script, in one process."""
+    p = argparse.ArgumentParser(
+        prog="sdk_autogen generate",
+        description="Generate the client package, SDK wrapper and usage example from an OpenAPI spec.",
+    )
+    p.add_argument("spec", help="OpenAPI JSON file or URL")
+    p.add_argument("--output-dir", default=".", help="directory for all generated files")
+    p.add_argument(
+        "--package", default="openai_sdk_client_output", help="name of the client package"
+    )
+    p.add_argument(
+        "--output", default="generated_openai_sdk.py", help="file name of the SDK wrapper"
+    )
+    p.add_argument("--class-name", default="GeneratedClient", help="wrapper class name")
+    p.add_argument(
+        "--force", action="store_true", help="regenerate even when the spec is unchanged"
+    )
+    p.add_argument(
+        "--no-format",
+        action="store_true",
+        help="skip openapi-python-client's autoflake/isort/black hooks (much faster)",
+    )
+    p.add_argument(
+        "--install-missing",
+        action="store_true",
+        help="pip install missing requirements instead of failing",
+    )
+    p.add_argument("--static", action="store_true", help="scan endpoint sources with ast")
+    p.add_argument("--lazy", action="store_true", help="lazy wrapper plus .pyi stub")
+    p.add_argument("--instrument", action="store_true", help="emit instrumentation hooks")
+    p.add_argument("--fast-json", action="store_true", help="add *_fast methods")
+    p.add_argument(
+        "--production",
+        action="store_true",
+        help="no smoke test or unused imports in the wrapper; byte-compile everything",
+    )
+    p.add_argument(
+        "--load-test", action="store_true", help="also write an asyncio load-test script"
+    )
+    add_feature_arguments(p)
+    add_profile_arguments(p)
+    args = p.parse_args(argv)
+
+    missing = missing_requirements()
+    if missing and args.install_missing:
+        print(f"Installing {', '.join(missing)}...")
+        subprocess.run([sys.executable, "-m", "pip", "install", *missing], check=True)
+        importlib.invalidate_caches()
+        missing = missing_requirements()
+    if missing:
+        p.error(f"missing requirements: {' '.join(missing)} (or pass --install-missing)")
+
+    print(f"Generating SDK from {args.spec}...")
+    started = time.perf_counter()
+    with profiling(args.profile, not args.profile_no_memory, args.profile_top):
+        generated = generate_from_spec(
+            args.spec,
+            Path(args.output_dir),
+            args.package,
+            args.output,
+            args.class_name,
+            force=args.force,
+            format_code=not args.no_format,
+            static=args.static,
+            # Worker processes would take their spans with them.
+            jobs=1 if args.profile else None,
+            lazy=args.lazy,
+            instrument=args.instrument,
+            fast_json=args.fast_json,
+            production=args.production,
+            load_test=args.load_test,
+            features=selected_features(args),
+        )
+    if generated:
+        print(f"✅  Generation complete in {time.perf_counter() - started:.2f}s")
+    else:
+        print("✅  OpenAPI spec unchanged since last generation; nothing to do (--force to regenerate).")
+
+
+def main() -> None:
+    if sys.argv[1:2] == ["generate"]:
+        generate_main(sys.argv[2:])
+        return
+    if sys.argv[1:2] == ["mock"]:
+        mock_main(sys.argv[2:])
+        return
+    p = argparse.ArgumentParser(description="Generate an SDK wrapper.")
+    p.add_argument(
+        "--package", help="root package name of the generated client"
+    )
+    p.add_argument(
+        "--output", help="target .py file for the SDK wrapper"
+    )
+    p.add_argument("--class-name", default="WraperClient", help="wrapper class name")
+    p.add_argument(
+        "--static",
+        action="store_true",
+        help="parse endpoint sources instead of importing them (same output)",
+    )
+    p.add_argument(
+        "--jobs",
+        type=int,
+        default=None,
+        help="worker processes for --static scanning or --batch (default: CPU count)",
+    )
+    p.add_argument(
+        "--lazy",
+        action="store_true",
+        help="import endpoints/models on first use and also write a .pyi stub",
+    )
+    p.add_argument(
+        "--instrument",
+        action="store_true",
+        help="emit per-call latency/retry/error hooks and optional metrics",
+    )
+    p.add_argument(
+        "--fast-json",
+        action="store_true",
+        help="add *_fast methods decoding with orjson/msgspec into lightweight views",
+    )
+    p.add_argument(
+        "--production",
+        action="store_true",
+        help="drop the smoke test (written to <output>_smoke.py) and unused imports, "
+        "and byte-compile the wrapper and client package",
+    )
+    p.add_argument(
+        "--import-report",
+        action="store_true",
+        help="print size, compile and import time of the default vs. production wrapper",
+    )
+    p.add_argument(
+        "--load-test",
+        action="store_true",
+        help="also write <output>_loadtest.py, an asyncio load test of every operation",
+    )
+    p.add_argument(
+        "--verbose",
+        action="store_true",
+        help="print scan statistics (annotation cache hits/misses)",
+    )
+    p.add_argument(
+        "--manifest",
+        default=None,
+        help="JSON manifest for incremental regeneration (reuses unchanged operations)",
+    )
+    p.add_argument(
+        "--spec",
+        default=None,
+        help="OpenAPI spec (JSON) the package was generated from; enables "
+        "*_stream methods for streaming responses, and with --manifest an "
+        "unchanged spec and outputs make the run a no-op",
+    )
+    p.add_argument(
+        "--batch",
+        default=None,
+        help="JSON manifest of specs (files or URLs) to generate in parallel, "
+        "each into its own directory under --output-dir",
+    )
+    p.add_argument(
+        "--output-dir", default=".", help="root directory for --batch output"
+    )
+    p.add_argument(
+        "--no-format",
+        action="store_true",
+        help="with --batch, skip openapi-python-client's autoflake/isort/black hooks",
+    )
+    add_feature_arguments(p)
+    add_profile_arguments(p)
+    args = p.parse_args()
+    features = selected_features(args)
+
+    if args.batch and args.profile:
+        p.error("--profile records a single generation, not --batch")
+    if args.batch:
+        entries = load_batch_manifest(Path(args.batch))
+        print(f"Generating {len(entries)} SDKs into '{args.output_dir}'...")
+        results = run_batch(
+            entries,
+            args.output_dir,
+            jobs=args.jobs,
+            format_code=not args.no_format,
+            static=args.static,
+            lazy=args.lazy,
+            instrument=args.instrument,
+            fast_json=args.fast_json,
+            production=args.production,
+            load_test=args.load_test,
+            features=features,
+        )
+        print(format_batch_summary(results))
+        if any(result.status == "failed" for result in results):
+            sys.exit(1)
+        return
+    if not args.package or not args.output:
+        p.error("--package and --output are required (or use --batch)")
+
+    with profiling(args.profile, not args.profile_no_memory, args.profile_top):
+        generate_wrapper_file(
+            args.package,
+            args.output,
+            args.class_name,
+            static=args.static,
+            # Worker processes would take their spans with them.
+            jobs=1 if args.profile else args.jobs,
+            lazy=args.lazy,
+            instrument=args.instrument,
+            fast_json=args.fast_json,
+            verbose=args.verbose,
+            manifest_path=args.manifest,
+            spec_path=args.spec,
+            production=args.production,
+            report=args.import_report,
+            load_test=args.load_test,
+            features=features,
+        )
 
 
 if __name__ == "__main__":
@@ -1,11 +1,170 @@
 import argparse
-from typing import Union
+import asyncio
+import hashlib
+import json
+import zlib
+from typing import Any, Callable, Dict, List, Optional, Union
+from urllib.parse import unquote
 
-from fastapi import FastAPI
+from fastapi import FastAPI, File, Form, HTTPException, Request, Response, UploadFile
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 
 app = FastAPI(title="Hello World API", version="1.0.0", openapi_version="3.0.3")
 
+MAX_BATCH_SIZE = 1000
+# Responses smaller than this are sent uncompressed.
+MIN_COMPRESS_SIZE = 1024
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+
+def gzip_compress(data: bytes) -> bytes:
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+    return compressor.compress(data) + compressor.flush()
+
+
+def decoder(encoding: str) -> Optional[Callable[[bytes], bytes]]:
+    """A function decoding a whole `encoding` body, or None if it is not supported."""
+    if encoding in ("gzip", "x-gzip"):
+        return lambda data: zlib.decompress(data, 16 + zlib.MAX_WBITS)
+    if encoding == "deflate":
+        return zlib.decompress
+    if encoding == "br" and brotli is not None:
+        return brotli.decompress
+    if encoding == "zstd" and zstandard is not None:
+        return lambda data: zstandard.ZstdDecompressor().decompressobj().decompress(data)
+    if encoding == "identity":
+        return lambda data: data
+    return None
+
+
+# Response encodings, most preferred first, with their compressors.
+ENCODERS: Dict[str, Callable[[bytes], bytes]] = {}
+if zstandard is not None:
+    ENCODERS["zstd"] = zstandard.ZstdCompressor(level=3).compress
+if brotli is not None:
+    ENCODERS["br"] = lambda data: brotli.compress(data, quality=4)
+ENCODERS["gzip"] = gzip_compress
+
+
+def negotiate(accept_encoding: str) -> Optional[str]:
+    """The preferred encoding in `ENCODERS` that `accept_encoding` allows, or None."""
+    accepted = {}
+    for part in accept_encoding.split(","):
+        name, _, params = part.strip().partition(";")
+        quality = 1.0
+        if params.strip().startswith("q="):
+            try:
+                quality = float(params.strip()[2:])
+            except ValueError:
+                continue
+        accepted[name.strip().lower()] = quality
+    for encoding in ENCODERS:
+        if accepted.get(encoding, accepted.get("*", 0.0)) > 0:
+            return encoding
+    return None
+
+
+class CompressionMiddleware:
+    """
+    Decodes gzip/deflate/br/zstd request bodies and compresses responses.
+
+    A request body with any other Content-Encoding is answered with 415.
+    Responses of at least `MIN_COMPRESS_SIZE` bytes are compressed with the
+    best encoding the client accepts; streamed responses (more than one body
+    message, e.g. server-sent events) are passed through untouched.
+    """
+
+    def __init__(self, app: Any):
+        self.app = app
+
+    async def __call__(self, scope: Dict[str, Any], receive: Callable, send: Callable) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        headers = {name.decode("latin-1"): value.decode("latin-1") for name, value in scope["headers"]}
+        content_encoding = headers.get("content-encoding", "").strip().lower()
+        if content_encoding:
+            decode = decoder(content_encoding)
+            if decode is None:
+                response = Response(f"unsupported Content-Encoding {content_encoding!r}", 415)
+                await response(scope, receive, send)
+                return
+            chunks = []
+            while True:
+                message = await receive()
+                if message["type"] != "http.request":
+                    return
+                chunks.append(message.get("body", b""))
+                if not message.get("more_body", False):
+                    break
+            try:
+                body = decode(b"".join(chunks))
+            except Exception:
+                await Response("request body could not be decoded", 400)(scope, receive, send)
+                return
+            scope = dict(scope)
+            scope["headers"] = [
+                (name, value)
+                for name, value in scope["headers"]
+                if name not in (b"content-encoding", b"content-length")
+            ] + [(b"content-length", str(len(body)).encode())]
+            pending = [{"type": "http.request", "body": body, "more_body": False}]
+
+            async def receive_decoded() -> Dict[str, Any]:
+                return pending.pop() if pending else await receive()
+
+            receive = receive_decoded
+
+        encoding = negotiate(headers.get("accept-encoding", ""))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+        start: Dict[str, Any] = {}
+        streaming = False
+
+        async def send_compressed(message: Dict[str, Any]) -> None:
+            nonlocal streaming
+            if message["type"] == "http.response.start":
+                start.update(message)
+                return
+            if message["type"] != "http.response.body" or streaming:
+                await send(message)
+                return
+            body = message.get("body", b"")
+            if message.get("more_body", False):
+                # A streamed response: send it as it comes.
+                streaming = True
+                await send(start)
+                await send(message)
+                return
+            response_headers = list(start.get("headers", []))
+            already_encoded = any(name == b"content-encoding" for name, _ in response_headers)
+            if len(body) >= MIN_COMPRESS_SIZE and not already_encoded:
+                body = ENCODERS[encoding](body)
+                response_headers = [
+                    (name, value) for name, value in response_headers if name != b"content-length"
+                ] + [
+                    (b"content-encoding", encoding.encode()),
+                    (b"content-length", str(len(body)).encode()),
+                    (b"vary", b"Accept-Encoding"),
+                ]
+            await send({**start, "headers": response_headers})
+            await send({"type": "http.response.body", "body": body, "more_body": False})
+
+        await self.app(scope, receive, send_compressed)
+
+
+app.add_middleware(CompressionMiddleware)
+
 
 class HealthResponse(BaseModel):
     status: str
@@ -24,6 +183,33 @@ class GreetingRequest(BaseModel):
     include_timestamp: Union[bool, None] = True
 
 
+class GreetingPage(BaseModel):
+    items: list[GreetingResponse]
+    total: int
+
+
+class GreetingFeed(BaseModel):
+    items: list[GreetingResponse]
+    next_cursor: Union[str, None] = None
+
+
+class ImportReceipt(BaseModel):
+    imported: int
+
+
+class ArtifactReceipt(BaseModel):
+    name: str
+    filename: str
+    size: int
+    sha256: str
+
+
+def numbered_greeting(index: int) -> GreetingResponse:
+    return GreetingResponse(
+        message=f"Hello #{index}!", user_name=f"user{index}", timestamp="", personalized=False
+    )
+
+
 @app.get("/", operation_id="root_get")
 async def root() -> dict[str, str]:
     return {"message": "Hello World!"}
@@ -49,6 +235,144 @@ async def create_greeting(user_name: str, request: GreetingRequest) -> GreetingR
     )
 
 
+@app.get(
+    "/greeting/{user_name}/stream",
+    operation_id="stream_greetings",
+    response_class=StreamingResponse,
+    responses={200: {"content": {"text/event-stream": {"schema": {"type": "string"}}}}},
+)
+async def stream_greetings(user_name: str, count: int = 5, interval: float = 0.0):
+    """Stream `count` greetings as server-sent events."""
+
+    async def events():
+        for index in range(count):
+            payload = json.dumps({"index": index, "message": f"Hello, {user_name}!"})
+            yield f"id: {index}\nevent: greeting\ndata: {payload}\n\n"
+            if interval:
+                await asyncio.sleep(interval)
+
+    return StreamingResponse(events(), media_type="text/event-stream")
+
+
+@app.get("/greetings", operation_id="list_greetings")
+async def list_greetings(offset: int = 0, limit: int = 10, count: int = 95) -> GreetingPage:
+    """A page of `count` numbered greetings (offset pagination)."""
+    items = [numbered_greeting(i) for i in range(offset, min(offset + limit, count))]
+    return GreetingPage(items=items, total=count)
+
+
+@app.get("/greetings/feed", operation_id="greeting_feed")
+async def greeting_feed(cursor: Union[str, None] = None, limit: int = 10, count: int = 95) -> GreetingFeed:
+    """The same greetings with cursor pagination; `next_cursor` is null on the last page."""
+    start = int(cursor or 0)
+    end = min(start + limit, count)
+    return GreetingFeed(
+        items=[numbered_greeting(i) for i in range(start, end)],
+        next_cursor=str(end) if end < count else None,
+    )
+
+
+@app.post("/greetings/import", operation_id="import_greetings")
+async def import_greetings(greetings: List[GreetingResponse]) -> ImportReceipt:
+    """Accept a bulk JSON body of greetings (a large request body, e.g. for compression)."""
+    return ImportReceipt(imported=len(greetings))
+
+
+@app.post("/artifacts", operation_id="upload_artifact")
+async def upload_artifact(name: str = Form(...), file: UploadFile = File(...)) -> ArtifactReceipt:
+    """Accept a multipart upload and report its size and SHA-256."""
+    digest, size = hashlib.sha256(), 0
+    while chunk := await file.read(1024 * 1024):
+        digest.update(chunk)
+        size += len(chunk)
+    return ArtifactReceipt(name=name, filename=file.filename or "", size=size, sha256=digest.hexdigest())
+
+
+def valid_batch_item(item: Any) -> bool:
+    """Whether a batched request has string `id`, `method` and `url`, and string header values if any."""
+    if not isinstance(item, dict) or not all(isinstance(item.get(field), str) for field in ("id", "method", "url")):
+        return False
+    headers = item.get("headers")
+    return headers is None or (
+        isinstance(headers, dict) and all(isinstance(value, str) for value in headers.values())
+    )
+
+
+async def dispatch(item: Dict[str, Any]) -> Dict[str, Any]:
+    """Runs one batched request through this app in-process and returns its response entry."""
+    path, _, query = item["url"].partition("?")
+    body = b"" if item.get("body") is None else json.dumps(item["body"]).encode()
+    headers = [(name.lower().encode(), value.encode()) for name, value in (item.get("headers") or {}).items()]
+    if body:
+        headers.append((b"content-length", str(len(body)).encode()))
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": item["method"].upper(),
+        "scheme": "http",
+        "path": unquote(path),
+        "raw_path": path.encode(),
+        "query_string": query.encode(),
+        "root_path": "",
+        "headers": headers,
+        "client": None,
+        "server": None,
+    }
+    requests = [{"type": "http.request", "body": body, "more_body": False}]
+    status, response_headers, chunks = 500, {}, []
+
+    async def receive() -> Dict[str, Any]:
+        if requests:
+            return requests.pop()
+        await asyncio.Future()  # no disconnect until the response is complete
+        return {"type": "http.disconnect"}
+
+    async def send(message: Dict[str, Any]) -> None:
+        nonlocal status
+        if message["type"] == "http.response.start":
+            status = message["status"]
+            for raw_name, raw_value in message.get("headers", []):
+                name, value = raw_name.decode(), raw_value.decode()
+                # Repeated headers are folded into one comma-separated value.
+                response_headers[name] = f"{response_headers[name]}, {value}" if name in response_headers else value
+        elif message["type"] == "http.response.body":
+            chunks.append(message.get("body", b""))
+
+    await app(scope, receive, send)
+    content = b"".join(chunks)
+    response_headers.pop("content-length", None)
+    if "json" in response_headers.get("content-type", ""):
+        response_body: Any = json.loads(content) if content else None
+    else:
+        response_body = content.decode("utf-8", "replace")
+    return {"id": item["id"], "status": status, "headers": response_headers, "body": response_body}
+
+
+@app.post("/batch", include_in_schema=False)
+async def batch(request: Request) -> Response:
+    """
+    Runs `{"requests": [{"id", "method", "url", "headers"?, "body"?}]}` concurrently.
+
+    Answers `{"responses": [{"id", "status", "headers", "body"}]}`; JSON
+    bodies are inlined on both sides, and repeated response headers are
+    joined with ", ". This is the endpoint the SDK's
+    `auto_batch=AutoBatch(...)` option sends bulk requests to.
+    """
+    try:
+        items: List[Dict[str, Any]] = (await request.json())["requests"]
+    except (ValueError, KeyError, TypeError):
+        raise HTTPException(400, 'expected {"requests": [...]}') from None
+    if not isinstance(items, list) or not all(valid_batch_item(item) for item in items):
+        raise HTTPException(400, 'each request must be an object with string "id", "method" and "url"')
+    if len(items) > MAX_BATCH_SIZE:
+        raise HTTPException(413, f"at most {MAX_BATCH_SIZE} requests per batch")
+    if any(item["url"].partition("?")[0].rstrip("/") == "/batch" for item in items):
+        raise HTTPException(400, "batches cannot be nested")
+    responses = await asyncio.gather(*(dispatch(item) for item in items))
+    return Response(json.dumps({"responses": responses}), media_type="application/json")
+
+
 if __name__ == "__main__":
     import uvicorn
 
@@ -14,6 +14,11 @@ CLASS_NAME="GeneratedClient"
 OUTPUT_FILE="generated_openai_sdk.py"
 TEMP_DIR="openai_sdk_temp_$$"
 SDK_AUTOGEN_FILE="sdk_autogen_temp.py"
+SPEC_FILE="openapi.json"
+MANIFEST_FILE="generated_openai_sdk.manifest.json"
+FORCE="${FORCE:-0}"  # FORCE=1 regenerates even when the spec is unchanged
+SDK_AUTOGEN_REF="${SDK_AUTOGEN_REF:-main}"  # branch, tag or commit of sdk_autogen.py to download
+SDK_AUTOGEN="${SDK_AUTOGEN:-}"  # path to a local sdk_autogen.py to use instead of downloading one
 
 # Validate input
 if [ -z "$JSON_URL" ]; then
@@ -23,6 +28,11 @@ if [ -z "$JSON_URL" ]; then
     exit 1
 fi
 
+# Resolve a local sdk_autogen.py before changing into the temporary directory
+if [ -n "$SDK_AUTOGEN" ]; then
+    SDK_AUTOGEN="$(cd "$(dirname "$SDK_AUTOGEN")" && pwd)/$(basename "$SDK_AUTOGEN")"
+fi
+
 echo "Starting OpenAI SDK generation from: $JSON_URL"
 
 # Create temporary directory
@@ -39,6 +49,18 @@ cleanup() {
 # Set trap to cleanup on script exit
 trap cleanup EXIT
 
+# Download a URL to a file with wget or curl
+fetch() {
+    if command -v wget &> /dev/null; then
+        wget -q -O "$2" "$1"
+    elif command -v curl &> /dev/null; then
+        curl -s -f -L -o "$2" "$1"
+    else
+        echo "Error: Neither wget nor curl is available for downloading"
+        exit 1
+    fi
+}
+
 # ========================
 # CHECK DEPENDENCIES
 # ========================
@@ -50,53 +72,78 @@ if ! command -v python3 &> /dev/null; then
     exit 1
 fi
 
-# Check if pip is available
-if ! command -v pip3 &> /dev/null && ! command -v pip &> /dev/null; then
-    echo "Error: pip is required but not installed"
+# ========================
+# SKIP IF THE SPEC IS UNCHANGED
+# ========================
+fetch "$JSON_URL" "$SPEC_FILE" || {
+    echo "Error: Failed to download OpenAPI spec from $JSON_URL"
     exit 1
-fi
+}
 
-# Use pip3 if available, otherwise pip
-PIP_CMD="pip3"
-if ! command -v pip3 &> /dev/null; then
-    PIP_CMD="pip"
+if [ "$FORCE" != "1" ] && [ -f "../$OUTPUT_FILE" ] && [ -d "../$CLIENT_OUTPUT_DIR" ] && [ -f "../$MANIFEST_FILE" ]; then
+    if python3 - "$SPEC_FILE" "../$MANIFEST_FILE" << 'EOF'
+import hashlib, json, sys
+spec_sha256 = hashlib.sha256(open(sys.argv[1], "rb").read()).hexdigest()
+try:
+    recorded = json.load(open(sys.argv[2])).get("spec_sha256")
+except ValueError:
+    recorded = None
+sys.exit(0 if recorded == spec_sha256 else 1)
+EOF
+    then
+        echo "✅ OpenAPI spec unchanged since last generation; nothing to do (FORCE=1 to regenerate)."
+        exit 0
+    fi
 fi
 
-# Install required packages
-echo "Installing required packages..."
-$PIP_CMD install --user openapi-python-client requests 2>/dev/null || {
-    echo "Warning: Could not install packages with --user flag, trying without..."
-    $PIP_CMD install openapi-python-client requests || {
-        echo "Error: Failed to install required packages"
-        echo "Please ensure you have pip and proper permissions to install packages"
+# Install required packages only when they are missing
+if ! python3 -c "import openapi_python_client" 2>/dev/null; then
+    # Check if pip is available
+    if ! command -v pip3 &> /dev/null && ! command -v pip &> /dev/null; then
+        echo "Error: pip is required but not installed"
         exit 1
+    fi
+
+    # Use pip3 if available, otherwise pip
+    PIP_CMD="pip3"
+    if ! command -v pip3 &> /dev/null; then
+        PIP_CMD="pip"
+    fi
+
+    echo "Installing required packages..."
+    $PIP_CMD install --user openapi-python-client requests 2>/dev/null || {
+        echo "Warning: Could not install packages with --user flag, trying without..."
+        $PIP_CMD install openapi-python-client requests || {
+            echo "Error: Failed to install required packages"
+            echo "Please ensure you have pip and proper permissions to install packages"
+            exit 1
+        }
     }
-}
+fi
 
 # ========================
 # DOWNLOAD SDK AUTOGEN SCRIPT
 # ========================
-FILE_REMOTE="https://github.com/anhvth/openai_sdk_autogen/blob/1964383620129fad3c9c40dbf932859f6ed4ef72/sdk_autogen.py"
+if [ -n "$SDK_AUTOGEN" ]; then
+    echo "Using local SDK autogen script: $SDK_AUTOGEN"
+    cp "$SDK_AUTOGEN" "$SDK_AUTOGEN_FILE" || {
+        echo "Error: Failed to copy SDK autogen script from $SDK_AUTOGEN"
+        exit 1
+    }
+else
+    # The generate command and its manifest (the no-op check above) need a recent revision
+    FILE_REMOTE="https://github.com/anhvth/openai_sdk_autogen/blob/$SDK_AUTOGEN_REF/sdk_autogen.py"
 
-echo "Downloading SDK autogen script from: $FILE_REMOTE"
+    echo "Downloading SDK autogen script from: $FILE_REMOTE"
 
-# Convert GitHub blob URL to raw URL
-RAW_URL=$(echo "$FILE_REMOTE" | sed 's|github.com|raw.githubusercontent.com|' | sed 's|/blob||')
+    # Convert GitHub blob URL to raw URL
+    RAW_URL=$(echo "$FILE_REMOTE" | sed 's|github.com|raw.githubusercontent.com|' | sed 's|/blob||')
 
-# Download the SDK autogen script
-if command -v wget &> /dev/null; then
-    wget -q -O "$SDK_AUTOGEN_FILE" "$RAW_URL" || {
-        echo "Error: Failed to download SDK autogen script with wget"
-        exit 1
-    }
-elif command -v curl &> /dev/null; then
-    curl -s -L -o "$SDK_AUTOGEN_FILE" "$RAW_URL" || {
-        echo "Error: Failed to download SDK autogen script with curl"
+    # Download the SDK autogen script
+    fetch "$RAW_URL" "$SDK_AUTOGEN_FILE" || {
+        echo "Error: Failed to download SDK autogen script"
         exit 1
     }
-else
-    echo "Error: Neither wget nor curl is available for downloading"
-    exit 1
 fi
 
 # Verify the file was downloaded successfully
@@ -108,87 +155,29 @@ fi
 echo "SDK autogen script downloaded successfully"
 
 # ========================
-# GENERATE CLIENT
+# GENERATE CLIENT, SDK WRAPPER AND USAGE EXAMPLE
 # ========================
-echo "Generating OpenAPI client from $JSON_URL..."
-
-# Clean up previous output
-rm -rf "$CLIENT_OUTPUT_DIR" 2>/dev/null || true
-
-# Generate client using openapi-python-client
-python3 -m openapi_python_client generate \
-    --url "$JSON_URL" \
-    --meta=none \
-    --output-path "$CLIENT_OUTPUT_DIR" \
-    --overwrite || {
-    echo "Error: Failed to generate OpenAPI client from $JSON_URL"
-    echo "Please ensure the URL is accessible and returns valid OpenAPI JSON"
-    exit 1
-}
+echo "Generating OpenAPI client and SDK wrapper from $JSON_URL..."
 
-echo "OpenAPI client generated successfully"
-
-# ========================
-# GENERATE SDK WRAPPER
-# ========================
-echo "Generating SDK wrapper..."
+# `generate` writes everything next to the manifest and reuses unchanged operations
+FORCE_ARGS=""
+if [ "$FORCE" = "1" ]; then
+    FORCE_ARGS="--force"
+fi
 
-python3 "$SDK_AUTOGEN_FILE" \
+python3 "$SDK_AUTOGEN_FILE" generate "$JSON_URL" \
+    --output-dir .. \
     --package "$CLIENT_OUTPUT_DIR" \
     --output "$OUTPUT_FILE" \
-    --class-name "$CLASS_NAME" || {
-    echo "Error: Failed to generate SDK wrapper"
-    exit 1
-}
-
-# ========================
-# MOVE OUTPUT TO PARENT
-# ========================
-echo "Moving generated files to parent directory..."
-
-# Move the generated SDK to parent directory
-mv "$OUTPUT_FILE" "../$OUTPUT_FILE" || {
-    echo "Error: Failed to move output file"
+    --class-name "$CLASS_NAME" $FORCE_ARGS || {
+    echo "Error: Failed to generate the SDK from $JSON_URL"
+    echo "Please ensure the URL is accessible and returns valid OpenAPI JSON"
     exit 1
 }
 
-# Optionally move the client directory as well
-if [ -d "$CLIENT_OUTPUT_DIR" ]; then
-    mv "$CLIENT_OUTPUT_DIR" "../$CLIENT_OUTPUT_DIR"
-fi
-
-# ========================
-# CREATE USAGE EXAMPLE
-# ========================
-
 # Extract base URL from JSON_URL (remove /openapi.json or similar endpoints)
 BASE_URL=$(echo "$JSON_URL" | sed 's|/openapi\.json.*$||' | sed 's|/docs.*$||' | sed 's|/redoc.*$||')
 
-cat > "../example_usage.py" << EOF
-#!/usr/bin/env python3
-"""
-Example usage of the generated SDK.
-Generated from: $JSON_URL
-"""
-
-from generated_openai_sdk import $CLASS_NAME
-
-# Initialize the client (using keyword arguments)
-client = $CLASS_NAME(
-    base_url="$BASE_URL"  # Extracted from your OpenAPI JSON URL
-)
-
-# Example usage (adjust based on your API)
-try:
-    # List available methods
-    result = client.health_check()
-    print(f"Health check result: {result}")
-    
-except Exception as e:
-    print(f"Error using SDK: {e}")
-    print("Make sure your API server is running and accessible!")
-EOF
-
 python3 -c "
 print()
 print('✅ Generation complete!')
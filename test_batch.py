@@ -0,0 +1,45 @@
+import asyncio
+
+import httpx
+import pytest
+
+
+@pytest.mark.parametrize(
+    "body",
+    [
+        {"requests": [{}]},
+        {"requests": "x"},
+        {"requests": [{"id": 1, "method": "GET", "url": "/health"}]},
+        {"requests": [{"id": "1", "method": "GET", "url": "/health", "headers": ["x"]}]},
+        {"requests": [{"id": "1", "method": "GET", "url": "/health", "headers": {"x-n": 1}}]},
+        ["requests"],
+        {},
+    ],
+)
+def test_malformed_batch_is_rejected(body, example_server_url):
+    response = httpx.post(f"{example_server_url}/batch", json=body)
+
+    assert response.status_code == 400
+
+
+def test_batch_runs_each_request(example_server_url):
+    body = {"requests": [{"id": "a", "method": "GET", "url": "/health"}, {"id": "b", "method": "GET", "url": "/nope"}]}
+    response = httpx.post(f"{example_server_url}/batch", json=body)
+
+    assert response.status_code == 200
+    assert [(r["id"], r["status"]) for r in response.json()["responses"]] == [("a", 200), ("b", 404)]
+
+
+def test_dispatch_joins_repeated_headers(monkeypatch):
+    import example_server
+
+    async def app(scope, receive, send):
+        headers = [(b"content-type", b"text/plain"), (b"vary", b"Accept"), (b"vary", b"Accept-Encoding")]
+        await send({"type": "http.response.start", "status": 200, "headers": headers})
+        await send({"type": "http.response.body", "body": b"ok"})
+
+    monkeypatch.setattr(example_server, "app", app)
+    entry = asyncio.run(example_server.dispatch({"id": "1", "method": "GET", "url": "/"}))
+
+    assert entry["headers"] == {"content-type": "text/plain", "vary": "Accept, Accept-Encoding"}
+    assert entry["body"] == "ok"
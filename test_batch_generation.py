@@ -0,0 +1,41 @@
+import json
+import subprocess
+import sys
+
+from conftest import REPO_ROOT
+from specs import synthesize_spec
+
+
+def run_batch_cli(manifest, output_dir):
+    command = [
+        sys.executable, str(REPO_ROOT / "sdk_autogen.py"),
+        "--batch", str(manifest), "--output-dir", str(output_dir), "--jobs", "2", "--no-format",
+    ]
+    result = subprocess.run(command, capture_output=True, text=True, timeout=600)
+    statuses = {}
+    for line in result.stdout.splitlines():
+        status, _, name = line.strip().partition(" ")
+        if status in ("generated", "unchanged", "failed"):
+            statuses[name.strip()] = status
+    return result, statuses
+
+
+def test_batch_isolates_a_failing_spec(tmp_path):
+    (tmp_path / "good.json").write_text(json.dumps(synthesize_spec(4)))
+    (tmp_path / "bad.json").write_text('{"openapi": "3.0.3", "paths": ')
+    manifest = tmp_path / "services.json"
+    manifest.write_text(json.dumps({"specs": [{"name": "good", "spec": "good.json"}, {"name": "bad", "spec": "bad.json"}]}))
+    output_dir = tmp_path / "sdks"
+
+    first, first_statuses = run_batch_cli(manifest, output_dir)
+    wrapper = output_dir / "good" / "good_sdk.py"
+    written = wrapper.read_bytes()
+    second, second_statuses = run_batch_cli(manifest, output_dir)
+
+    assert first.returncode == 1 and second.returncode == 1
+    assert first_statuses == {"good": "generated", "bad": "failed"}
+    assert second_statuses == {"good": "unchanged", "bad": "failed"}
+    assert "1 ok, 1 failed" in first.stdout and "❌  bad:" in first.stdout
+    assert (output_dir / "good" / "good_client" / "__init__.py").is_file()
+    assert "class GoodClient" in written.decode() and wrapper.read_bytes() == written
+    assert not (output_dir / "bad" / "bad_sdk.py").exists()
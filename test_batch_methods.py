@@ -0,0 +1,84 @@
+import asyncio
+
+import pytest
+
+
+def probe(example_sdk):
+    class Probe(example_sdk._BatchMixin):
+        """Records how many `work_async` calls overlap."""
+
+        def __init__(self):
+            self.running = self.peak = 0
+
+        async def work_async(self, value, delay=0.0):
+            self.running += 1
+            self.peak = max(self.peak, self.running)
+            try:
+                await asyncio.sleep(delay)
+                if value < 0:
+                    raise ValueError(value)
+                return value * 2
+            finally:
+                self.running -= 1
+
+        def work(self, value):
+            return value
+
+    return Probe()
+
+
+def test_batch_keeps_input_order_and_limits_concurrency(example_sdk):
+    target = probe(example_sdk)
+    calls = [{"value": i, "delay": (7 - i % 7) / 1000} for i in range(40)]
+
+    results = asyncio.run(target.batch("work", calls, concurrency=5))
+
+    assert [(r.index, r.result) for r in results] == [(i, i * 2) for i in range(40)]
+    assert target.peak == 5
+
+
+def test_batch_reports_errors_per_item(example_sdk):
+    target = probe(example_sdk)
+
+    results = asyncio.run(target.batch("work_async", [{"value": 1}, {"value": -1}, {"value": 3}]))
+
+    assert [r.ok for r in results] == [True, False, True]
+    assert isinstance(results[1].error, ValueError) and results[1].result is None
+    assert results[2].result == 6
+
+
+def test_batch_stream_yields_in_completion_order(example_sdk):
+    target = probe(example_sdk)
+    calls = [{"value": 0, "delay": 0.05}, {"value": 1, "delay": 0.0}]
+
+    async def run():
+        return [r.index async for r in target.batch_stream("work", calls, concurrency=2)]
+
+    assert asyncio.run(run()) == [1, 0]
+
+
+def test_batch_rejects_bad_arguments(example_sdk):
+    target = probe(example_sdk)
+
+    def calls():
+        yield {"value": 1}
+        raise RuntimeError("calls failed")
+
+    with pytest.raises(ValueError):
+        asyncio.run(target.batch("work", [], concurrency=0))
+    with pytest.raises(AttributeError):
+        asyncio.run(target.batch("missing", []))
+    with pytest.raises(RuntimeError, match="calls failed"):
+        asyncio.run(target.batch("work", calls()))
+
+
+def test_batch_against_the_server(example_sdk, example_server_url):
+    async def run():
+        async with example_sdk.ExampleClient(example_server_url, share_pool=False) as client:
+            body = example_sdk.GreetingRequest(greeting_type="hi", include_timestamp=False)
+            calls = [{"user_name": f"u{i}", "json_body": body} for i in range(12)]
+            return await client.batch("create_greeting", calls, concurrency=4)
+
+    results = asyncio.run(run())
+
+    assert [r.result.message for r in results] == [f"Hi, u{i}!" for i in range(12)]
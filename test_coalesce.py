@@ -0,0 +1,26 @@
+import asyncio
+
+
+def test_concurrent_identical_gets_share_one_request(example_sdk, example_server_url):
+    async def run():
+        async with example_sdk.ExampleClient(example_server_url, share_pool=False, coalesce=True) as client:
+            results = await asyncio.gather(*(client.health_check_async() for _ in range(20)))
+            return results, client.coalesce_stats
+
+    results, stats = asyncio.run(run())
+
+    assert [result.status for result in results] == ["healthy"] * 20
+    assert stats == {"health_check": {"upstream": 1, "collapsed": 19}}
+
+
+def test_waiters_raise_their_own_copy_of_the_error(example_sdk):
+    async def run():
+        async with example_sdk.ExampleClient("http://127.0.0.1:1", share_pool=False, coalesce=True) as client:
+            return await asyncio.gather(*(client.health_check_async() for _ in range(5)), return_exceptions=True)
+
+    errors = asyncio.run(run())
+
+    (leader,) = [error for error in errors if not any(error.__cause__ is other for other in errors)]
+    waiters = [error for error in errors if error is not leader]
+    assert len({id(error) for error in waiters}) == 4
+    assert all(type(error) is type(leader) and error.__cause__ is leader for error in waiters)
@@ -0,0 +1,56 @@
+import gzip
+import json
+
+import httpx
+
+
+def greetings(count):
+    return [{"message": f"Hello #{i}!", "user_name": f"user{i}", "timestamp": "", "personalized": False} for i in range(count)]
+
+
+def test_unknown_request_encoding_is_415(example_server_url):
+    body = json.dumps(greetings(3)).encode()
+    response = httpx.post(
+        f"{example_server_url}/greetings/import",
+        content=body,
+        headers={"content-type": "application/json", "content-encoding": "compress"},
+    )
+
+    assert response.status_code == 415
+
+
+def test_gzip_request_bodies_are_decoded(example_server_url):
+    headers = {"content-type": "application/json", "content-encoding": "gzip"}
+    body = json.dumps(greetings(50)).encode()
+
+    ok = httpx.post(f"{example_server_url}/greetings/import", content=gzip.compress(body), headers=headers)
+    corrupt = httpx.post(f"{example_server_url}/greetings/import", content=body, headers=headers)
+
+    assert ok.status_code == 200 and ok.json() == {"imported": 50}
+    assert corrupt.status_code == 400
+
+
+def test_responses_are_compressed_above_the_threshold(example_server_url):
+    headers = {"accept-encoding": "gzip"}
+
+    large = httpx.get(f"{example_server_url}/greetings", params={"limit": 50}, headers=headers)
+    small = httpx.get(f"{example_server_url}/health", headers=headers)
+    stream = httpx.get(f"{example_server_url}/greeting/ada/stream", params={"count": 200}, headers=headers)
+
+    assert large.headers["content-encoding"] == "gzip" and len(large.json()["items"]) == 50
+    assert "content-encoding" not in small.headers
+    assert "content-encoding" not in stream.headers and stream.text.count("event: greeting") == 200
+
+
+def test_client_compresses_both_ways(example_sdk, example_server_url):
+    body = [example_sdk.GreetingResponse.from_dict(item) for item in greetings(200)]
+    with example_sdk.ExampleClient(
+        example_server_url, share_pool=False, compression=example_sdk.Compression(accept=("gzip",))
+    ) as client:
+        receipt = client.import_greetings(json_body=body)
+        page = client.list_greetings(limit=50)
+        stats = client.compression_stats
+
+    assert receipt.imported == 200 and len(page.items) == 50
+    assert stats["requests_compressed"] == 1 and stats["request_wire_bytes"] < stats["request_bytes"]
+    assert stats["responses_encoded"] >= 1
@@ -0,0 +1,71 @@
+import copy
+import importlib
+import json
+import pickle
+import sys
+
+import attrs
+import pytest
+
+from sdk_autogen import generate_client_package, render_wrapper
+
+PROPERTIES = ["HTTPStatus", "XMLHttpRequest", "userName", "created-at", "class", "id", "_etag", "plain"]
+SPEC = {
+    "openapi": "3.0.2",
+    "info": {"title": "Names", "version": "1.0"},
+    "paths": {
+        "/record": {
+            "get": {
+                "operationId": "get_record",
+                "responses": {
+                    "200": {
+                        "description": "OK",
+                        "content": {"application/json": {"schema": {"$ref": "#/components/schemas/Record"}}},
+                    }
+                },
+            }
+        }
+    },
+    "components": {
+        "schemas": {
+            "Record": {
+                "type": "object",
+                "properties": {name: {"type": "string"} for name in PROPERTIES},
+            }
+        }
+    },
+}
+
+
+@pytest.fixture(scope="module")
+def names_sdk(tmp_path_factory):
+    """A fast-JSON wrapper for one model whose property names exercise snake_case conversion."""
+    work_dir = tmp_path_factory.mktemp("names")
+    spec_path = work_dir / "openapi.json"
+    spec_path.write_text(json.dumps(SPEC))
+    generate_client_package(spec_path, work_dir, "names_client", format_code=False)
+    sys.path.insert(0, str(work_dir))
+    (work_dir / "names_sdk.py").write_text(render_wrapper("names_client", "NamesClient", spec=SPEC, fast_json=True))
+    importlib.invalidate_caches()
+    return importlib.import_module("names_sdk")
+
+
+def test_model_view_attributes_match_model_attributes(names_sdk):
+    record = {name: f"value of {name}" for name in PROPERTIES}
+    view = names_sdk.ModelView(record)
+
+    model = names_sdk.Record.from_dict(record)
+    attributes = [field.name for field in attrs.fields(names_sdk.Record) if field.name != "additional_properties"]
+    assert "http_status" in attributes and "xml_http_request" in attributes
+    assert names_sdk._ATTRIBUTE_KEYS["http_status"] == ("HTTPStatus",)
+    for attribute in attributes:
+        assert getattr(view, attribute) == getattr(model, attribute)
+
+
+def test_model_view_copies_and_pickles(names_sdk):
+    view = names_sdk.ModelView({"userName": "Ann", "tags": ["a"]})
+
+    assert copy.copy(view) == view
+    assert copy.deepcopy(view) == view
+    assert pickle.loads(pickle.dumps(view)) == view
+    assert not hasattr(view, "__missing_dunder__")
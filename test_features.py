@@ -0,0 +1,31 @@
+import importlib
+
+import pytest
+
+from sdk_autogen import RUNTIME_FEATURES, render_stub, render_wrapper
+
+
+def test_default_wrapper_has_no_runtime_features(synthetic_package):
+    source = render_wrapper(synthetic_package, "Client")
+    full = render_wrapper(synthetic_package, "Client", features=list(RUNTIME_FEATURES))
+
+    for feature in RUNTIME_FEATURES.values():
+        assert feature.template.format() not in source
+        assert feature.template.format() in full
+
+
+@pytest.mark.parametrize("feature", list(RUNTIME_FEATURES))
+def test_each_feature_builds_on_its_own(feature, synthetic_package, tmp_path, monkeypatch):
+    module = f"features_{feature}_sdk"
+    (tmp_path / f"{module}.py").write_text(render_wrapper(synthetic_package, "Client", features=[feature]))
+    (tmp_path / f"{module}.pyi").write_text(render_stub(synthetic_package, "Client", features=[feature]))
+    compile((tmp_path / f"{module}.pyi").read_text(), f"{module}.pyi", "exec")
+    monkeypatch.syspath_prepend(str(tmp_path))
+    sdk = importlib.import_module(module)
+    with sdk.Client("http://127.0.0.1:1", share_pool=False):
+        pass
+
+
+def test_unknown_feature_is_rejected(synthetic_package):
+    with pytest.raises(ValueError, match="unknown runtime features: caching"):
+        render_wrapper(synthetic_package, "Client", features=["caching"])
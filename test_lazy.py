@@ -0,0 +1,66 @@
+import ast
+import json
+import subprocess
+import sys
+
+from conftest import _generate
+from sdk_autogen import render_stub, render_wrapper
+from specs import synthesize_spec
+
+PROBE = """
+import json, sys
+sys.path.insert(0, {work_dir!r})
+
+def loaded():
+    endpoints = [name for name in sys.modules if name.startswith("lazy_client.api.") and name.count(".") == 3]
+    return sorted(endpoints + [name for name in sys.modules if name == "lazy_client.models"])
+
+import lazy_sdk
+report = {{"after_import": loaded()}}
+client = lazy_sdk.LazyClient("http://127.0.0.1:1")
+client.group0
+report["after_namespace"] = loaded()
+lazy_sdk._ep_group0_get_op0
+lazy_sdk.Chain0Level0
+report["after_access"] = loaded()
+report["api"] = {{
+    name: sorted(member for member in vars(cls) if not member.startswith("_"))
+    for name, cls in vars(lazy_sdk).items()
+    if isinstance(cls, type) and cls.__module__ == "lazy_sdk" and name.endswith(("Client", "Namespace"))
+}}
+print(json.dumps(report))
+"""
+
+
+def stub_api(source: str) -> dict:
+    api = {}
+    for node in ast.parse(source).body:
+        if isinstance(node, ast.ClassDef) and node.name.endswith(("Client", "Namespace")):
+            members = set()
+            for child in node.body:
+                if isinstance(child, (ast.FunctionDef, ast.AsyncFunctionDef)):
+                    members.add(child.name)
+                elif isinstance(child, ast.AnnAssign) and isinstance(child.target, ast.Name):
+                    members.add(child.target.id)
+            api[node.name] = sorted(member for member in members if not member.startswith("_"))
+    return api
+
+
+def test_lazy_wrapper_imports_on_first_use(tmp_path):
+    package = _generate(synthesize_spec(6, depth=2, ops_per_tag=3), tmp_path, "lazy_client")
+    (tmp_path / "lazy_sdk.py").write_text(render_wrapper(package, "LazyClient", lazy=True))
+    stub = render_stub(package, "LazyClient")
+
+    code = PROBE.format(work_dir=str(tmp_path))
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, timeout=120)
+    assert result.returncode == 0, result.stderr
+    report = json.loads(result.stdout.splitlines()[-1])
+
+    assert report["after_import"] == []
+    assert report["after_namespace"] == []
+    assert report["after_access"] == ["lazy_client.api.group0.get_op0", "lazy_client.models"]
+    # `base_url` is an instance attribute, so only the stub declares it on the class.
+    stubbed = stub_api(stub)
+    stubbed["LazyClient"].remove("base_url")
+    assert sorted(stubbed) == ["LazyClient", "_Group0Namespace", "_Group1Namespace"]
+    assert stubbed == {name: report["api"][name] for name in stubbed}
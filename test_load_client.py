@@ -0,0 +1,41 @@
+import json
+import subprocess
+import sys
+
+from conftest import REPO_ROOT
+from specs import synthesize_spec
+
+LOAD = """
+import json, sys
+sys.path.insert(0, {repo!r})
+from sdk_autogen import load_client
+
+sdk = load_client({spec!r}, cache_dir={cache!r}, features=["cache"])
+with sdk.GeneratedClient("http://127.0.0.1:1", cache=True) as client:
+    members = sorted(name for name in dir(client) if not name.startswith("_"))
+    print(json.dumps({{"module": sdk.__name__, "file": sdk.__file__, "members": members}}))
+"""
+
+
+def load_in_fresh_process(spec_path, cache_dir) -> dict:
+    code = LOAD.format(repo=str(REPO_ROOT), spec=str(spec_path), cache=str(cache_dir))
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, timeout=300)
+    assert result.returncode == 0, result.stdout + result.stderr
+    return json.loads(result.stdout.splitlines()[-1])
+
+
+def test_cached_client_loads_in_a_fresh_process(tmp_path):
+    spec_path = tmp_path / "openapi.json"
+    spec_path.write_text(json.dumps(synthesize_spec(4)))
+    cache_dir = tmp_path / "cache"
+
+    built = load_in_fresh_process(spec_path, cache_dir)
+    wrapper = cache_dir / built["module"] / f"{built['module']}.py"
+    built_at = wrapper.stat().st_mtime_ns
+    loaded = load_in_fresh_process(spec_path, cache_dir)
+
+    assert loaded == built
+    assert "cache_stats" in loaded["members"] and "group0" in loaded["members"]
+    assert wrapper.stat().st_mtime_ns == built_at
+    assert not list(cache_dir.glob(".tmp-*"))
+    assert loaded["file"] == str(wrapper)
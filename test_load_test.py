@@ -0,0 +1,48 @@
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+from sdk_autogen import generate_wrapper_file
+
+
+def run_load_test(example_sdk, work_dir, *args):
+    spec_path = Path(example_sdk.__file__).parent / "openapi.json"
+    generate_wrapper_file("example_client", str(work_dir / "lt_sdk.py"), "LtClient", spec_path=str(spec_path), load_test=True)
+    report_path = work_dir / "report.json"
+    result = subprocess.run(
+        [sys.executable, "lt_sdk_loadtest.py", *args, "--json", str(report_path)],
+        cwd=work_dir,
+        env={"PYTHONPATH": str(Path(example_sdk.__file__).parent), "PATH": ""},
+        capture_output=True,
+        text=True,
+        timeout=120,
+    )
+    assert result.returncode == 0, result.stderr
+    return result.stdout, json.loads(report_path.read_text())
+
+
+def test_load_test_calls_every_operation(example_sdk, example_server_url, tmp_path):
+    stdout, report = run_load_test(example_sdk, tmp_path, "--base-url", example_server_url, "--users", "3", "--duration", "1")
+
+    operations = {entry["operation"]: entry for entry in report["operations"]}
+    assert {"create_greeting", "health_check", "list_greetings", "upload_artifact"} <= set(operations)
+    assert report["skipped"] == {}
+    total = operations.pop("total")
+    assert total["calls"] == sum(entry["calls"] for entry in operations.values()) > 0
+    assert total["statuses"] == {"200": total["calls"]} and total["error_rate"] == 0.0
+    assert 0 < total["p50_ms"] <= total["p99_ms"] <= total["max_ms"]
+    assert stdout.splitlines()[-1].startswith("total")
+
+
+def test_load_test_rate_and_filters(example_sdk, example_server_url, tmp_path):
+    _, report = run_load_test(
+        example_sdk, tmp_path,
+        "--base-url", example_server_url, "--users", "4", "--duration", "1", "--rps", "40", "--read-only",
+        "--operations", "health_check,list_greetings,create_greeting",
+    )
+
+    operations = {entry["operation"]: entry for entry in report["operations"]}
+    assert set(operations) == {"health_check", "list_greetings", "total"}
+    # A shared schedule of 40 calls/s over one second.
+    assert 20 <= operations["total"]["calls"] <= 45
@@ -0,0 +1,49 @@
+import functools
+import json
+import os
+import subprocess
+import threading
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+
+from conftest import REPO_ROOT
+from specs import synthesize_spec
+
+
+def run_generator(url: str, cwd, **env: str) -> str:
+    result = subprocess.run(
+        ["bash", str(REPO_ROOT / "standalone_generator.sh"), url],
+        cwd=cwd,
+        env={**os.environ, "SDK_AUTOGEN": str(REPO_ROOT / "sdk_autogen.py"), **env},
+        capture_output=True,
+        text=True,
+        timeout=300,
+    )
+    assert result.returncode == 0, result.stdout + result.stderr
+    return result.stdout
+
+
+def test_standalone_generator_is_a_noop_for_an_unchanged_spec(tmp_path):
+    www, out = tmp_path / "www", tmp_path / "out"
+    www.mkdir()
+    out.mkdir()
+    (www / "openapi.json").write_text(json.dumps(synthesize_spec(4)))
+    handler = functools.partial(SimpleHTTPRequestHandler, directory=str(www))
+    server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_address[1]}/openapi.json"
+    try:
+        first = run_generator(url, out)
+        assert "Generation complete" in first
+        wrapper = out / "generated_openai_sdk.py"
+        manifest = out / "generated_openai_sdk.manifest.json"
+        written = wrapper.stat().st_mtime_ns, manifest.stat().st_mtime_ns
+
+        second = run_generator(url, out)
+        assert "nothing to do" in second
+        assert "Generation complete" not in second
+        assert (wrapper.stat().st_mtime_ns, manifest.stat().st_mtime_ns) == written
+
+        assert "Generation complete" in run_generator(url, out, FORCE="1")
+    finally:
+        server.shutdown()
+        server.server_close()
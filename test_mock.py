@@ -0,0 +1,50 @@
+import asyncio
+
+import httpx
+import pytest
+
+from sdk_autogen import MockApp, MockOptions
+from specs import synthesize_spec
+
+SPEC = synthesize_spec(4)
+
+
+def request_many(options, requests=1000):
+    app = MockApp(SPEC, options)
+
+    async def run():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://mock") as client:
+            responses = [await client.get("/group0/op0/abc") for _ in range(requests)]
+            stats = (await client.get("/__mock__/stats")).json()
+        return responses, stats
+
+    return asyncio.run(run())
+
+
+def test_error_rate_is_honoured():
+    options = MockOptions(error_rate=0.2, error_statuses=(429, 500, 503), retry_after=0, seed=3)
+    responses, stats = request_many(options)
+
+    errors = [r for r in responses if r.status_code != 200]
+    assert 150 <= len(errors) <= 250
+    assert {r.status_code for r in errors} == {429, 500, 503}
+    assert all(r.headers.get("retry-after") == "0" for r in errors if r.status_code in (429, 503))
+    assert all("retry-after" not in r.headers for r in errors if r.status_code == 500)
+    assert list(stats.values()) == [{"requests": 1000, "errors": len(errors)}]
+
+
+def test_same_seed_injects_the_same_errors():
+    options = MockOptions(error_rate=0.3, seed=11)
+
+    first = [r.status_code for r in request_many(options, 200)[0]]
+    second = [r.status_code for r in request_many(options, 200)[0]]
+
+    assert first == second and set(first) == {200, 500, 503}
+
+
+@pytest.mark.parametrize("rate, expected", [(0.0, {200}), (1.0, {503})])
+def test_error_rate_bounds(rate, expected):
+    responses, _ = request_many(MockOptions(error_rate=rate, error_statuses=(503,)), 50)
+
+    assert {r.status_code for r in responses} == expected
@@ -0,0 +1,81 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+
+def collect(aiterator):
+    async def run():
+        return [item async for item in aiterator]
+
+    return asyncio.run(run())
+
+
+@pytest.mark.parametrize("prefetch", [0, 1, 4])
+def test_iter_list_greetings_reads_every_page(prefetch, example_sdk, example_server_url):
+    with example_sdk.ExampleClient(example_server_url, share_pool=False) as client:
+        items = list(client.iter_list_greetings(limit=7, count=30, prefetch=prefetch))
+
+    assert [item.user_name for item in items] == [f"user{i}" for i in range(30)]
+
+
+def test_iter_greeting_feed_follows_cursors(example_sdk, example_server_url):
+    with example_sdk.ExampleClient(example_server_url, share_pool=False) as client:
+        items = list(client.iter_greeting_feed(limit=8, count=20))
+
+    assert [item.user_name for item in items] == [f"user{i}" for i in range(20)]
+
+
+@pytest.mark.parametrize("prefetch", [0, 3])
+def test_aiter_methods_read_every_page(prefetch, example_sdk, example_server_url):
+    async def run():
+        async with example_sdk.ExampleClient(example_server_url, share_pool=False) as client:
+            offset = [item async for item in client.aiter_list_greetings(limit=6, count=25, prefetch=prefetch)]
+            feed = [item async for item in client.aiter_greeting_feed(limit=6, count=25, prefetch=prefetch)]
+            return offset, feed
+
+    offset, feed = asyncio.run(run())
+
+    expected = [f"user{i}" for i in range(25)]
+    assert [item.user_name for item in offset] == expected
+    assert [item.user_name for item in feed] == expected
+
+
+def test_stream_greetings_stream_yields_events(example_sdk, example_server_url):
+    with example_sdk.ExampleClient(example_server_url, share_pool=False) as client:
+        events = list(client.stream_greetings_stream(user_name="ada", count=3))
+
+    assert [(event.event, event.id) for event in events] == [("greeting", str(i)) for i in range(3)]
+    assert [event.json()["index"] for event in events] == [0, 1, 2]
+
+
+@pytest.mark.parametrize("prefetch", [0, 2])
+def test_capped_page_without_total_does_not_end_listing(prefetch, example_sdk):
+    # The server caps `limit=10` at 4 items a page and sends no total.
+    rows = list(range(11))
+    requests = []
+
+    def fetch(offset, limit):
+        requests.append(offset)
+        page = rows[offset : offset + min(limit, 4)]
+        return SimpleNamespace(status_code=200, parsed=page, content=b"")
+
+    pager = example_sdk._Pager("offset", "offset", "limit", None, None, None)
+    items = list(example_sdk._iter_pages(fetch, {"offset": 0, "limit": 10}, pager, prefetch))
+
+    assert items == rows
+    assert requests == [0, 4, 8]
+
+
+def test_short_first_page_without_total_checks_for_more(example_sdk):
+    requests = []
+
+    async def fetch(offset, limit):
+        requests.append(offset)
+        return SimpleNamespace(status_code=200, parsed=list(range(offset, 3))[:limit], content=b"")
+
+    pager = example_sdk._Pager("offset", "offset", "limit", None, None, None)
+    items = collect(example_sdk._aiter_pages(fetch, {"offset": 0, "limit": 10}, pager, 1))
+
+    assert items == [0, 1, 2]
+    assert requests == [0, 3]
@@ -0,0 +1,30 @@
+import asyncio
+
+
+def test_shared_pool_survives_repeated_asyncio_run(example_sdk, example_server_url):
+    # A live client keeps the shared pool (and any async client in it) around between runs.
+    keeper = example_sdk.ExampleClient(example_server_url)
+
+    async def call():
+        async with example_sdk.ExampleClient(example_server_url) as client:
+            return await client.health_check_async()
+
+    try:
+        for _ in range(4):
+            assert asyncio.run(call()).status == "healthy"
+    finally:
+        keeper.close()
+
+
+def test_sync_close_closes_async_clients(example_sdk, example_server_url):
+    client = example_sdk.ExampleClient(example_server_url, share_pool=False)
+    pool = client._transport
+    loop = asyncio.new_event_loop()
+    try:
+        assert loop.run_until_complete(client.health_check_async()).status == "healthy"
+        (async_client,) = pool.async_http_clients.values()
+        client.close()
+        assert pool.http_client.is_closed
+        assert async_client.is_closed
+    finally:
+        loop.close()
@@ -0,0 +1,65 @@
+import ast
+import importlib
+import re
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+from sdk_autogen import RUNTIME_FEATURES, generate_wrapper_file
+
+
+def unused_imports(source: str) -> list:
+    """Imported names that appear nowhere else in `source`; star imports are kept on purpose."""
+    tree = ast.parse(source)
+    imports = [node for node in tree.body if isinstance(node, (ast.Import, ast.ImportFrom))]
+    lines = source.splitlines()
+    for node in imports:
+        for number in range(node.lineno - 1, node.end_lineno):
+            lines[number] = ""
+    rest = "\n".join(lines)
+    names = [
+        (alias.asname or alias.name).split(".")[0]
+        for node in imports
+        if not (isinstance(node, ast.ImportFrom) and node.module == "__future__")
+        for alias in node.names
+        if alias.name != "*"
+    ]
+    return [name for name in names if not re.search(rf"\b{re.escape(name)}\b", rest)]
+
+
+@pytest.mark.parametrize("features", [[], list(RUNTIME_FEATURES)])
+def test_production_wrapper_drops_smoke_test_and_unused_imports(features, example_sdk, tmp_path):
+    spec_path = Path(example_sdk.__file__).parent / "openapi.json"
+    output = tmp_path / "prod_sdk.py"
+    generate_wrapper_file(
+        "example_client", str(output), "ProdClient", spec_path=str(spec_path), production=True, features=features
+    )
+    source = output.read_text()
+
+    assert 'if __name__ == "__main__"' not in source
+    assert source.count("from __future__ import annotations") == 1
+    assert unused_imports(source) == []
+    smoke = tmp_path / "prod_sdk_smoke.py"
+    assert "from prod_sdk import ProdClient" in smoke.read_text()
+    assert list((tmp_path / "__pycache__").glob("prod_sdk.*.pyc"))
+
+
+def test_smoke_module_runs(synthetic_package, tmp_path):
+    package_root = Path(importlib.import_module(synthetic_package).__file__).parent.parent
+    generate_wrapper_file(synthetic_package, str(tmp_path / "prod_sdk.py"), "ProdClient", production=True)
+
+    result = subprocess.run(
+        [sys.executable, "prod_sdk_smoke.py"],
+        cwd=tmp_path,
+        env={"PYTHONPATH": str(package_root), "PATH": ""},
+        capture_output=True,
+        text=True,
+        timeout=120,
+    )
+
+    assert result.returncode == 0, result.stderr
+    assert "--- SDK Test for ProdClient" in result.stdout
+    assert "--- Testing Namespace: group0 ---" in result.stdout
+    assert "Attempting: get_op0" in result.stdout
@@ -0,0 +1,47 @@
+import importlib
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+from conftest import REPO_ROOT
+
+
+def profile(package, tmp_path, *args):
+    package_root = Path(importlib.import_module(package).__file__).parent.parent
+    trace_path = tmp_path / "trace.json"
+    command = [
+        sys.executable, str(REPO_ROOT / "sdk_autogen.py"),
+        "--package", package, "--output", str(tmp_path / "sdk.py"), "--profile", str(trace_path), *args,
+    ]
+    result = subprocess.run(
+        command, capture_output=True, text=True, timeout=300, env={"PYTHONPATH": str(package_root), "PATH": ""}
+    )
+    assert result.returncode == 0, result.stdout + result.stderr
+    return result.stdout, json.loads(trace_path.read_text())
+
+
+@pytest.mark.parametrize("memory", [True, False])
+def test_profile_writes_a_chrome_trace(memory, synthetic_package, tmp_path):
+    stdout, trace = profile(synthetic_package, tmp_path, *([] if memory else ["--profile-no-memory"]))
+
+    events = trace["traceEvents"]
+    assert trace["displayTimeUnit"] == "ms"
+    assert events[0] == {"name": "process_name", "ph": "M", "pid": 1, "tid": 1, "args": {"name": "sdk_autogen"}}
+    spans = [event for event in events if event["ph"] == "X"]
+    (total,) = [span for span in spans if span["name"] == "total"]
+    for span in spans:
+        assert span["pid"] == span["tid"] == 1 and span["cat"] in ("stage", "endpoint")
+        assert total["ts"] <= span["ts"] and span["dur"] >= 0
+        assert span["ts"] + span["dur"] <= total["ts"] + total["dur"] + 0.001  # float rounding, in µs
+        assert isinstance(span["args"]["memory_delta_bytes"], int)
+    stages = {span["name"] for span in spans if span["cat"] == "stage"}
+    assert {"walk_packages", "total"} <= stages
+    endpoints = {span["args"]["endpoint"] for span in spans if span["cat"] == "endpoint"}
+    assert f"{synthetic_package}.api.group0.get_op0" in endpoints
+    counters = [event for event in events if event["ph"] == "C"]
+    assert bool(counters) == memory
+    assert all(event["args"]["bytes"] >= 0 for event in counters)
+    assert "Slowest" in stdout and "Wrote profile" in stdout
@@ -0,0 +1,36 @@
+import asyncio
+
+import httpx
+
+
+def test_circuit_recovers_after_cancelled_trial(example_sdk):
+    # A server that fails until `healthy` is set, and hangs while `hang` is set.
+    state = {"healthy": False, "hang": False}
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        if state["hang"]:
+            await asyncio.sleep(3600)
+        return httpx.Response(200 if state["healthy"] else 503, json={"status": "healthy", "service": "x"})
+
+    breaker = example_sdk.CircuitBreaker(failure_threshold=2, reset_timeout=0.05)
+    resilience = example_sdk._Resilience("http://test", None, None, breaker)
+    transport = example_sdk._AsyncResilientTransport(httpx.MockTransport(handler), resilience)
+
+    async def run() -> None:
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            for _ in range(2):
+                assert (await client.get("/health")).status_code == 503
+            assert resilience.stats()["health_check"]["circuit"] == "open"
+
+            await asyncio.sleep(0.06)
+            state["hang"] = True
+            trial = asyncio.ensure_future(client.get("/health"))
+            await asyncio.sleep(0.01)
+            trial.cancel()
+            await asyncio.gather(trial, return_exceptions=True)
+
+            state.update(hang=False, healthy=True)
+            assert (await client.get("/health")).status_code == 200
+            assert resilience.stats()["health_check"]["circuit"] == "closed"
+
+    asyncio.run(run())
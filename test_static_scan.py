@@ -0,0 +1,57 @@
+import importlib
+
+import sdk_autogen
+from conftest import _generate
+from sdk_autogen import collect_namespaces_static, render_wrapper, scan_endpoints
+
+LIST_SPEC = {
+    "openapi": "3.0.3",
+    "info": {"title": "Lists", "version": "1.0"},
+    "paths": {
+        "/items": {
+            "get": {
+                "operationId": "list_items",
+                "responses": {
+                    "200": {
+                        "description": "OK",
+                        "content": {
+                            "application/json": {
+                                "schema": {"type": "array", "items": {"$ref": "#/components/schemas/Item"}}
+                            }
+                        },
+                    }
+                },
+            }
+        }
+    },
+    "components": {"schemas": {"Item": {"type": "object", "properties": {"id": {"type": "integer"}}}}},
+}
+
+
+def test_static_scan_matches_import_scan_without_fallbacks(synthetic_package, monkeypatch):
+    fallbacks = []
+    inspect_endpoint = sdk_autogen.inspect_endpoint
+
+    def recording_inspect_endpoint(module_path, *args):
+        fallbacks.append(module_path)
+        return inspect_endpoint(module_path, *args)
+
+    monkeypatch.setattr(sdk_autogen, "inspect_endpoint", recording_inspect_endpoint)
+    module_paths = sorted(path for paths in collect_namespaces_static(synthetic_package).values() for path in paths)
+    endpoints = scan_endpoints(module_paths, synthetic_package, jobs=1)
+    static = render_wrapper(synthetic_package, "Client", static=True, jobs=1)
+    monkeypatch.undo()
+
+    assert fallbacks == []
+    assert len(endpoints) == 24
+    assert static == render_wrapper(synthetic_package, "Client")
+
+
+def test_list_of_model_annotations_name_the_model(tmp_path, monkeypatch):
+    package = _generate(LIST_SPEC, tmp_path, "lists_client")
+    for static in (False, True):
+        source = render_wrapper(package, "Client", static=static, jobs=1)
+        assert "def list_items(self) -> Optional[list[Item]]:" in source
+    (tmp_path / "lists_sdk.py").write_text(source)
+    monkeypatch.syspath_prepend(str(tmp_path))
+    assert importlib.import_module("lists_sdk").Client.list_items
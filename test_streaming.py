@@ -0,0 +1,64 @@
+import asyncio
+
+import pytest
+
+SSE_BODY = (
+    b": keep-alive\r\n"
+    b"id: 1\r\n"
+    b"event: greeting\r\n"
+    b"data: {\"a\": 1}\r\n"
+    b"\r\n"
+    b"data: first line\n"
+    b"data: second line\n"
+    b"retry: 2500\n"
+    b"\n"
+    b"id: bad\0id\r"
+    b"data:no space\r"
+    b"\r"
+    b"data: never closed"
+)
+
+
+def decode(example_sdk, kind, body, size):
+    decoder = example_sdk._StreamDecoder(kind)
+    items = []
+    for start in range(0, len(body), size):
+        items.extend(decoder.feed(body[start : start + size]))
+    return items + decoder.flush()
+
+
+@pytest.mark.parametrize("size", [1, 2, 3, 7, 1024])
+def test_sse_events_survive_any_chunk_boundary(size, example_sdk):
+    events = decode(example_sdk, "sse", SSE_BODY, size)
+
+    assert [tuple(event) for event in events] == [
+        ("greeting", '{"a": 1}', "1", None),
+        ("message", "first line\nsecond line", "1", 2500),
+        ("message", "no space", "1", None),
+    ]
+    assert events[0].json() == {"a": 1}
+
+
+@pytest.mark.parametrize("size", [1, 5, 1024])
+def test_ndjson_lines_survive_any_chunk_boundary(size, example_sdk):
+    body = b'{"n": 1}\r\n\n{"n": 2}\r{"n": 3}'
+
+    assert decode(example_sdk, "ndjson", body, size) == [{"n": 1}, {"n": 2}, {"n": 3}]
+
+
+def test_overlong_line_is_rejected(example_sdk):
+    decoder = example_sdk._StreamDecoder("ndjson")
+
+    with pytest.raises(ValueError):
+        decoder.feed(b"x" * (example_sdk.STREAM_MAX_LINE_BYTES + 1))
+
+
+def test_stream_async_yields_events_as_they_arrive(example_sdk, example_server_url):
+    async def run():
+        async with example_sdk.ExampleClient(example_server_url, share_pool=False) as client:
+            return [event async for event in client.stream_greetings_stream_async(user_name="ada", count=4, interval=0.01)]
+
+    events = asyncio.run(run())
+
+    assert [event.id for event in events] == ["0", "1", "2", "3"]
+    assert {event.json()["message"] for event in events} == {"Hello, ada!"}
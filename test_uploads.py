@@ -0,0 +1,56 @@
+import asyncio
+import hashlib
+import shutil
+from pathlib import Path
+
+from sdk_autogen import render_wrapper
+
+
+def test_upload_streams_a_file(example_sdk, example_server_url, tmp_path):
+    data = bytes(range(256)) * 12_000  # spans several upload chunks
+    path = tmp_path / "artifact.bin"
+    path.write_bytes(data)
+    progress = []
+
+    with example_sdk.ExampleClient(example_server_url, share_pool=False) as client:
+        response = client.upload_artifact_upload(
+            files={"file": path}, data={"name": "nightly"}, progress=lambda sent, total: progress.append((sent, total))
+        )
+
+    receipt = response.parsed
+    assert response.status_code == 200
+    assert (receipt.name, receipt.filename, receipt.size) == ("nightly", "artifact.bin", len(data))
+    assert receipt.sha256 == hashlib.sha256(data).hexdigest()
+    assert progress[-1][0] == progress[-1][1]
+
+
+def test_upload_async_sends_an_async_iterable(example_sdk, example_server_url):
+    chunks = [b"a" * 70_000, b"b" * 5, b"c" * 1_000]
+
+    async def source():
+        for chunk in chunks:
+            yield chunk
+
+    async def run():
+        async with example_sdk.ExampleClient(example_server_url, share_pool=False) as client:
+            return await client.upload_artifact_upload_async(
+                files={"file": ("log.txt", source(), "text/plain")}, data={"name": "logs"}
+            )
+
+    receipt = asyncio.run(run()).parsed
+
+    assert (receipt.filename, receipt.size) == ("log.txt", sum(map(len, chunks)))
+    assert receipt.sha256 == hashlib.sha256(b"".join(chunks)).hexdigest()
+
+
+def test_no_upload_methods_without_build_response(example_sdk, tmp_path, monkeypatch):
+    package_dir = tmp_path / "bare_client"
+    shutil.copytree(Path(example_sdk.__file__).parent / "example_client", package_dir)
+    module = package_dir / "api" / "default" / "upload_artifact.py"
+    module.write_text(module.read_text().replace("def _build_response(", "def _parse_all("))
+    monkeypatch.syspath_prepend(str(tmp_path))
+
+    wrapper = render_wrapper("bare_client", "BareClient", features=["raw_methods"])
+
+    assert "def upload_artifact_raw(" in wrapper
+    assert "_upload(" not in wrapper